@@ -0,0 +1,47 @@
+'''
+    bench_codec
+    -----------
+
+    Compare the installed JSON codecs on block and trace responses.
+
+    Run from the repository root:
+        python bench/bench_codec.py
+'''
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures
+from ethrpc.codec import CODECS
+
+PAYLOAD = [{
+    "jsonrpc": "2.0",
+    "method": "eth_getBlockByNumber",
+    "params": [hex(i), True],
+    "id": i,
+} for i in range(100)]
+
+
+def bench(name, value, number):
+    '''Print encode and decode timings for each codec.'''
+
+    encoded = CODECS['json'].dumps(value)
+    print('{} ({:.1f} MB)'.format(name, len(encoded) / 1e6))
+    for codec in CODECS.values():
+        dumps = timeit.timeit(lambda: codec.dumps(value), number=number) / number
+        loads = timeit.timeit(lambda: codec.loads(encoded), number=number) / number
+        print('    {:<10} dumps {:8.2f} ms    loads {:8.2f} ms'.format(codec.name, dumps * 1e3, loads * 1e3))
+
+
+def main():
+    bench('batch payload', PAYLOAD, 1000)
+    bench('block, 200 transactions', fixtures.response(fixtures.block(5000000)), 50)
+    bench('debug_traceTransaction, 20000 steps', fixtures.response(fixtures.debug_trace()), 5)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+'''
+    bench_columnar
+    --------------
+
+    Compare columnar decoding with per-object decoding, for fee and gas
+    statistics over a range of blocks with full transactions, decoding
+    either every column or only the columns used.
+
+    Requires `pip install numpy`. Run from the repository root:
+        python bench/bench_columnar.py
+'''
+
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures
+import ethrpc
+from ethrpc.decode import DECODERS
+
+BLOCKS = 200
+REPEAT = 5
+
+
+def select(spec, names):
+    '''Columns of a spec by name.'''
+
+    return tuple(i for i in spec if i.name in names)
+
+
+# All columns, and only the columns used by the statistics.
+SPECS = [
+    ('columns', ethrpc.BLOCK_COLUMNS, ethrpc.TRANSACTION_COLUMNS),
+    ('selected', select(ethrpc.BLOCK_COLUMNS, ['gas_used']),
+     select(ethrpc.TRANSACTION_COLUMNS, ['gas', 'gas_price', 'value'])),
+]
+
+
+def python_stats(blocks):
+    '''Gas and fee statistics over decoded objects.'''
+
+    gas_used = sum(i['gasUsed'] for i in blocks) / len(blocks)
+    transactions = [j for i in blocks for j in i['transactions']]
+    fees = sum(i['gas'] * i['gasPrice'] for i in transactions)
+    value = sum(i['value'] for i in transactions)
+    return gas_used, fees, value
+
+
+def numpy_stats(blocks, transactions):
+    '''Gas and fee statistics over columns.'''
+
+    gas_used = blocks['gas_used'].mean()
+    fees = (transactions['gas'] * ethrpc.uint256_to_float(transactions['gas_price'])).sum()
+    value = ethrpc.uint256_to_float(transactions['value']).sum()
+    return gas_used, fees, value
+
+
+def timed(f, *args):
+    '''Best time of `REPEAT` calls, in milliseconds.'''
+
+    best = None
+    for _ in range(REPEAT):
+        start = time.time()
+        result = f(*args)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best * 1e3
+
+
+def main():
+    blocks = [fixtures.block(5000000 + i) for i in range(BLOCKS)]
+    count = sum(len(i['transactions']) for i in blocks)
+    print('{} blocks, {} transactions'.format(BLOCKS, count))
+
+    decode = lambda: [DECODERS['eth_get_block_by_number'](i) for i in copy.deepcopy(blocks)]
+    decoded, _ = timed(decode)
+    copied, copy_time = timed(copy.deepcopy, blocks)
+    _, decode_time = timed(decode)
+    _, python_time = timed(python_stats, decoded)
+    print('    {:<10} decode {:8.1f} ms    stats {:8.2f} ms'.format(
+        'objects', decode_time - copy_time, python_time))
+
+    for name, block_spec, transaction_spec in SPECS:
+        columns = lambda: (ethrpc.block_columns(blocks, block_spec),
+                           ethrpc.transaction_columns(blocks, transaction_spec))
+        (block_columns, transaction_columns), columns_time = timed(columns)
+        _, numpy_time = timed(numpy_stats, block_columns, transaction_columns)
+        print('    {:<10} decode {:8.1f} ms    stats {:8.2f} ms'.format(
+            name, columns_time, numpy_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+'''
+    bench_transport
+    ---------------
+
+    Compare the HTTP/1.1 and HTTP/2 transports against local test
+    servers, reporting throughput and the number of connections opened.
+    Each request is answered after a fixed delay, simulating the node.
+    HTTP/2 trades throughput for connections: over 5 runs, the pooled
+    `AsyncioClient` served about 1400-2800 req/s on 64 connections, and
+    `AsyncioHTTP2Client` about 350-650 req/s on a single connection.
+
+    Requires `pip install httpx[http2]`. Run from the repository root:
+        python bench/bench_transport.py
+'''
+
+import asyncio
+import concurrent.futures
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ethrpc
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+import h2.stream
+from aiohttp import web
+
+REQUESTS = 2000
+CONCURRENCY = 64
+DELAY = 0.005
+
+# Stream states in which the server may still send.
+OPEN = (h2.stream.StreamState.OPEN, h2.stream.StreamState.HALF_CLOSED_REMOTE)
+
+
+def respond(body):
+    '''JSON-RPC response body for a request body.'''
+
+    payload = json.loads(body)
+    items = payload if isinstance(payload, list) else [payload]
+    results = [{'jsonrpc': '2.0', 'id': i['id'], 'result': '0x64'} for i in items]
+    return json.dumps(results if isinstance(payload, list) else results[0]).encode('utf-8')
+
+
+class H2Protocol(asyncio.Protocol):
+    '''
+    Minimal h2c server, with prior knowledge. Response bodies are sent
+    within the flow-control windows, resuming on window updates, and
+    responses to streams the client reset are dropped.
+    '''
+
+    def __init__(self, peers):
+        self.peers = peers
+        self.connection = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        self.transport = None
+        self.bodies = {}
+        self.pending = {}
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.peers.add(transport.get_extra_info('peername'))
+        self.connection.initiate_connection()
+        self.flush()
+
+    def connection_lost(self, exc):
+        self.transport = None
+        self.bodies.clear()
+        self.pending.clear()
+
+    def data_received(self, data):
+        try:
+            events = self.connection.receive_data(data)
+        except h2.exceptions.ProtocolError:
+            self.flush()
+            self.transport.close()
+            return
+        for event in events:
+            if isinstance(event, h2.events.RequestReceived):
+                self.bodies[event.stream_id] = b''
+            elif isinstance(event, h2.events.DataReceived):
+                if event.stream_id in self.bodies:
+                    self.bodies[event.stream_id] += event.data
+                self.connection.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+            elif isinstance(event, h2.events.StreamEnded):
+                body = respond(self.bodies.pop(event.stream_id))
+                asyncio.get_event_loop().call_later(DELAY, self.respond, event.stream_id, body)
+            elif isinstance(event, h2.events.StreamReset):
+                self.bodies.pop(event.stream_id, None)
+                self.pending.pop(event.stream_id, None)
+            elif isinstance(event, h2.events.WindowUpdated):
+                # stream 0 updates the connection window, shared by all streams
+                streams = list(self.pending) if event.stream_id == 0 else [event.stream_id]
+                for stream_id in streams:
+                    self.send(stream_id)
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                self.transport.close()
+                return
+        self.flush()
+
+    def respond(self, stream_id, body):
+        '''Send the headers and queue the body, if the stream is still open.'''
+
+        if self.transport is None or self.closed(stream_id):
+            return
+        headers = [(':status', '200'), ('content-type', 'application/json'),
+                   ('content-length', str(len(body)))]
+        self.connection.send_headers(stream_id, headers)
+        self.pending[stream_id] = body
+        self.send(stream_id)
+        self.flush()
+
+    def send(self, stream_id):
+        '''Send as much of the queued body as the windows allow.'''
+
+        body = self.pending.get(stream_id)
+        if body is None:
+            return
+        if self.closed(stream_id):
+            del self.pending[stream_id]
+            return
+        while body:
+            size = min(self.connection.local_flow_control_window(stream_id),
+                       self.connection.max_outbound_frame_size, len(body))
+            if size <= 0:
+                self.pending[stream_id] = body
+                return
+            self.connection.send_data(stream_id, body[:size])
+            body = body[size:]
+        del self.pending[stream_id]
+        self.connection.end_stream(stream_id)
+
+    def closed(self, stream_id):
+        '''Check if the stream can no longer be sent on.'''
+
+        stream = self.connection.streams.get(stream_id)
+        return stream is None or stream.closed or stream.state_machine.state not in OPEN
+
+    def flush(self):
+        if self.transport is not None:
+            self.transport.write(self.connection.data_to_send())
+
+
+class Servers(object):
+    '''HTTP/1.1 and h2c servers, on an event loop in a background thread.'''
+
+    def __init__(self):
+        self.http1_peers = set()
+        self.http2_peers = set()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.http1, self.http2 = asyncio.run_coroutine_threadsafe(self.start(), self.loop).result()
+
+    async def handle(self, request):
+        self.http1_peers.add(request.transport.get_extra_info('peername'))
+        body = await request.read()
+        await asyncio.sleep(DELAY)
+        return web.Response(body=respond(body), content_type='application/json')
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post('/', self.handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        http1 = site._server.sockets[0].getsockname()[1]
+        server = await self.loop.create_server(lambda: H2Protocol(self.http2_peers), '127.0.0.1', 0)
+        http2 = server.sockets[0].getsockname()[1]
+        return 'http://127.0.0.1:{}/'.format(http1), 'http://127.0.0.1:{}/'.format(http2)
+
+    def reset(self):
+        self.http1_peers.clear()
+        self.http2_peers.clear()
+
+
+def bench_threads(client):
+    '''Send requests from a thread pool.'''
+
+    with concurrent.futures.ThreadPoolExecutor(CONCURRENCY) as executor:
+        list(executor.map(lambda _: client.eth_block_number(), range(REQUESTS)))
+
+
+def bench_asyncio(client):
+    '''Send concurrent requests from tasks.'''
+
+    async def run():
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def call():
+            async with semaphore:
+                await client.eth_block_number()
+
+        async with client:
+            await asyncio.gather(*[call() for _ in range(REQUESTS)])
+
+    asyncio.run(run())
+
+
+def report(name, servers, peers, f, client):
+    '''Print throughput and connection count for a transport.'''
+
+    servers.reset()
+    start = time.time()
+    f(client)
+    elapsed = time.time() - start
+    print('    {:<24} {:8.0f} req/s    {:4d} connections'.format(
+        name, REQUESTS / elapsed, len(getattr(servers, peers))))
+
+
+def main():
+    servers = Servers()
+    print('{} requests, {} concurrent, {:.0f} ms latency'.format(REQUESTS, CONCURRENCY, DELAY * 1e3))
+    report('Client', servers, 'http1_peers', bench_threads,
+           ethrpc.Client(servers.http1, decode=True, pool_maxsize=CONCURRENCY))
+    report('HTTP2Client', servers, 'http2_peers', bench_threads,
+           ethrpc.HTTP2Client(servers.http2, decode=True, prior_knowledge=True))
+    report('AsyncioClient', servers, 'http1_peers', bench_asyncio,
+           ethrpc.AsyncioClient(servers.http1, decode=True))
+    report('AsyncioHTTP2Client', servers, 'http2_peers', bench_asyncio,
+           ethrpc.AsyncioHTTP2Client(servers.http2, decode=True, prior_knowledge=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+'''
+    fixtures
+    --------
+
+    Synthetic, realistically shaped JSON-RPC responses for benchmarks.
+    Values are random, but the structure and field sizes match mainnet
+    blocks, receipts and traces.
+'''
+
+import binascii
+import os
+import random
+
+
+def data(n):
+    '''Random hex data of `n` bytes.'''
+
+    return '0x' + binascii.hexlify(os.urandom(n)).decode('ascii')
+
+
+def quantity(upper):
+    '''Random hex quantity below `upper`.'''
+
+    return hex(random.randrange(upper))
+
+
+def transaction(number, block_hash, index):
+    '''Full transaction object.'''
+
+    return {
+        "blockHash": block_hash,
+        "blockNumber": hex(number),
+        "from": data(20),
+        "gas": quantity(1 << 22),
+        "gasPrice": quantity(1 << 36),
+        "hash": data(32),
+        "input": data(random.choice([0, 4, 68, 132, 1024])),
+        "nonce": quantity(1 << 16),
+        "to": data(20),
+        "transactionIndex": hex(index),
+        "value": quantity(1 << 70),
+        "v": "0x25",
+        "r": data(32),
+        "s": data(32),
+    }
+
+
+def block(number, transactions=200):
+    '''Block object with full transactions.'''
+
+    block_hash = data(32)
+    return {
+        "difficulty": quantity(1 << 60),
+        "extraData": data(32),
+        "gasLimit": "0x7a121d",
+        "gasUsed": quantity(0x7a121d),
+        "hash": block_hash,
+        "logsBloom": data(256),
+        "miner": data(20),
+        "mixHash": data(32),
+        "nonce": data(8),
+        "number": hex(number),
+        "parentHash": data(32),
+        "receiptsRoot": data(32),
+        "sha3Uncles": data(32),
+        "size": quantity(1 << 16),
+        "stateRoot": data(32),
+        "timestamp": hex(1520000000 + number * 15),
+        "totalDifficulty": quantity(1 << 80),
+        "transactions": [transaction(number, block_hash, i) for i in range(transactions)],
+        "transactionsRoot": data(32),
+        "uncles": [],
+    }
+
+
+def struct_log(pc):
+    '''Geth struct log for a single opcode.'''
+
+    return {
+        "pc": pc,
+        "op": random.choice(["PUSH1", "MSTORE", "CALLDATALOAD", "SLOAD", "JUMPI"]),
+        "gas": random.randrange(1 << 20),
+        "gasCost": random.randrange(1 << 10),
+        "depth": 1,
+        "stack": [data(32)[2:] for _ in range(random.randrange(8))],
+        "memory": [data(32)[2:] for _ in range(random.randrange(4))],
+        "storage": {},
+    }
+
+
+def debug_trace(steps=20000):
+    '''Result of `debug_traceTransaction` with the default tracer.'''
+
+    return {
+        "gas": steps * 3,
+        "failed": False,
+        "returnValue": "",
+        "structLogs": [struct_log(i) for i in range(steps)],
+    }
+
+
+def response(result, id_=1):
+    '''Wrap result in a JSON-RPC response object.'''
+
+    return {"jsonrpc": "2.0", "id": id_, "result": result}
@@ -12,9 +12,36 @@ __author__ = "QChain Inc."
 __email__ = "alex@qchain.co"
 __maintainer__ = "Alex Huszagh"
 
+from .batch import *
+from .cache import *
+from .codec import *
 from .core import *
+from .decode import *
+from .filters import *
+from .fanout import *
+from .follow import *
+from .logs import *
+from .models import *
+from .ratelimit import *
+from .retry import *
+from .stream import *
 from .client import *
+from .ipc import *
+from .pool import *
 try:
     from .asyncio import *
+    from .websocket import *
+except:
+    pass
+try:
+    from .http2 import *
+except:
+    pass
+try:
+    from .asyncio_http2 import *
+except:
+    pass
+try:
+    from .columnar import *
 except:
     pass
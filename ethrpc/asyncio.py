@@ -15,12 +15,42 @@ __all__ = [
     'loop',
     'run',
     'map',
+    'amap',
+    'multiplex',
+    'limit',
+    'retry',
+    'AbstractAsyncioClient',
+    'AsyncioBatch',
+    'AsyncioChainFollower',
     'AsyncioClient',
+    'AsyncioFilterManager',
+    'AsyncioIPCClient',
+    'AsyncioPooledClient',
 ]
 
 import aiohttp
 import asyncio
-from .core import AbstractClient, LOCALHOST_HTTP_ENDPOINT
+import collections
+import functools
+import itertools
+from .batch import Batch
+from .cache import request_key
+from .core import (AbstractClient, DEFAULT_IPC_PATH, DEFAULT_PREFETCH,
+                   IDEMPOTENT_METHODS, JSON_HEADERS, LOCALHOST_HTTP_ENDPOINT)
+from .decode import RPCError, decode_result, unwrap
+from .filters import FilterManager
+from .follow import FILTER, SUBSCRIPTION, ChainFollower, header
+from .ipc import JSONStream, READ_SIZE
+from .logs import DEFAULT_LOGS_CONCURRENCY, DEFAULT_LOGS_WINDOW, LogWindow
+from .models import quantity
+from .pool import DEFAULT_MAX_LAG, DEFAULT_PROBE_INTERVAL, PooledClient
+from .retry import monotonic
+from .stream import STREAM_CHUNK_SIZE, StreamParser
+
+DEFAULT_CONCURRENCY = 100
+DEFAULT_CONNECTOR_LIMIT = 100
+DEFAULT_DNS_CACHE_TTL = 10
+DEFAULT_KEEPALIVE_TIMEOUT = 15
 
 
 def loop():
@@ -41,35 +71,1275 @@ def run(future):
 
 def map(futures):
     """
-    Asynchronously map list of futures.
+    Asynchronously map list of futures. For large inputs, use `amap`,
+    which creates the coroutines lazily.
     :return: Return value of all futures, or raise exception.
     """
     return run(asyncio.gather(*futures))
 
 
-class AsyncioClient(AbstractClient):
+class Flight(object):
+    """
+    Request shared by identical coalesced calls, and the number of
+    callers awaiting it.
+    """
+
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, coroutine):
+        """
+        Initialize flight.
+
+        :param coroutine: coroutine making the request.
+        """
+        self.task = asyncio.ensure_future(coroutine)
+        self.waiters = 0
+
+
+async def amap(func, iterable, concurrency=DEFAULT_CONCURRENCY, ordered=True,
+               max_pending=None, timeout=None, return_exceptions=False):
+    """
+    Call a coroutine function on each item of an iterable, with at most
+    `concurrency` calls running. Items are taken lazily, and at most
+    `max_pending` calls are outstanding, including completed calls not
+    yet yielded, so memory is bounded for arbitrarily long inputs.
+    Closing or cancelling the generator cancels the outstanding calls.
+
+        >>> async for block in amap(client.eth_get_block_by_number, range(10**6)):
+        ...     print(block['hash'])
+
+    :param func: coroutine function of a single item.
+    :param iterable: items, as an iterable or asynchronous iterable.
+    :param concurrency: maximum running calls.
+    :param ordered: yield results in input order, otherwise in
+        completion order.
+    :param max_pending: (optional) maximum outstanding calls, defaults
+        to twice `concurrency`.
+    :param timeout: (optional) seconds for each call, after which it is
+        cancelled and fails with `asyncio.TimeoutError`.
+    :param return_exceptions: yield exceptions raised by calls in place
+        of their results, otherwise raise the first exception to
+        complete, without waiting for the calls before it, and cancel
+        the outstanding calls.
+    :return: asynchronous generator over the results
+    """
+    if max_pending is None:
+        max_pending = 2 * concurrency
+    if concurrency < 1 or max_pending < 1:
+        raise ValueError("Concurrency and maximum pending calls must be positive.")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(item):
+        async with semaphore:
+            if timeout is None:
+                return await func(item)
+            return await asyncio.wait_for(func(item), timeout)
+
+    pending = collections.deque() if ordered else set()
+    add = pending.append if ordered else pending.add
+    try:
+        async for item in aiter_items(iterable):
+            add(asyncio.ensure_future(call(item)))
+            while len(pending) >= max_pending:
+                for result in await next_results(pending, ordered, return_exceptions):
+                    yield result
+        while pending:
+            for result in await next_results(pending, ordered, return_exceptions):
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def aiter_items(iterable):
+    """
+    Iterate over an iterable or asynchronous iterable.
+    :return: asynchronous generator over the items
+    """
+    if hasattr(iterable, '__aiter__'):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
+
+
+async def next_results(pending, ordered, return_exceptions):
+    """
+    Wait for the next results. Unless `return_exceptions` is set, raise
+    the exception of any failed task, without waiting for the tasks
+    before it.
+
+    :param pending: deque of tasks in input order if `ordered`,
+        otherwise a set of tasks.
+    :param ordered: wait for the oldest task.
+    :param return_exceptions: return exceptions in place of results.
+    :return: coroutine to a list of results, removed from the pending
+        tasks.
+    """
+    while True:
+        done = [i for i in pending if i.done()]
+        if not return_exceptions:
+            for task in done:
+                if task.cancelled() or task.exception() is not None:
+                    task.result()
+        if ordered and pending[0].done():
+            done = [pending.popleft()]
+            break
+        elif not ordered and done:
+            pending.difference_update(done)
+            break
+        waiting = [i for i in pending if not i.done()]
+        await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+    return [task_result(task, return_exceptions) for task in done]
+
+
+def task_result(task, return_exceptions):
+    """
+    Get the result of a completed task.
+
+    :param task: completed task.
+    :param return_exceptions: return the exception in place of raising it.
+    """
+    if not return_exceptions:
+        return task.result()
+    elif task.cancelled():
+        return asyncio.CancelledError()
+    return task.exception() or task.result()
+
+
+async def multiplex(client, payload, send):
+    """
+    Send payload over a multiplexed connection, and wait for the
+    responses to be resolved by request id.
+
+    :param client: client tracking the in-flight futures.
+    :param payload: JSON payload, or list of payloads for a batch.
+    :param send: coroutine function to send the payload.
+    :return: JSON response object, or list of response objects.
+    """
+    batch = isinstance(payload, list)
+    futures = []
+    for item in (payload if batch else [payload]):
+        future = loop().create_future()
+        client.register_future(item['id'], future)
+        futures.append(future)
+
+    try:
+        await send(payload)
+        bodies = await asyncio.gather(*futures)
+    except:
+        for item in (payload if batch else [payload]):
+            client.inflight.pop(item['id'], None)
+        raise
+    return bodies if batch else bodies[0]
+
+
+async def limit(limiter, client, send, payload, semaphore=None):
+    """
+    Send a payload once its tokens are available from a `RateLimiter`,
+    and adjust the rates from the result.
+
+    :param limiter: rate limiter.
+    :param client: client sending the payload.
+    :param send: coroutine function to send the payload.
+    :param payload: JSON payload, or list of payloads for a batch.
+    :param semaphore: (optional) semaphore acquired once the tokens are
+        available, so time queued for it is not counted as latency.
+    :return: response object
+    """
+    await asyncio.sleep(limiter.reserve(client, payload))
+    if semaphore is None:
+        return await measure(limiter, client, send, payload)
+    async with semaphore:
+        return await measure(limiter, client, send, payload)
+
+
+async def measure(limiter, client, send, payload):
+    """
+    Send a payload, and adjust the rates of a `RateLimiter` from the
+    result and the time taken.
+
+    :param limiter: rate limiter.
+    :param client: client sending the payload.
+    :param send: coroutine function to send the payload.
+    :param payload: JSON payload, or list of payloads for a batch.
+    :return: response object
+    """
+    start = monotonic()
+    try:
+        response = await send(payload)
+    except Exception as error:
+        limiter.update(client, payload, monotonic() - start, error=error)
+        raise
+    limiter.update(client, payload, monotonic() - start, response)
+    return response
+
+
+async def retry(policy, send, payload):
+    """
+    Send a payload, retrying transport errors and failed responses
+    under a `RetryPolicy`. Each attempt is cancelled at the deadline.
+
+    :param policy: retry policy.
+    :param send: coroutine function to send the payload once.
+    :param payload: JSON payload, or list of payloads for a batch.
+    :return: response object, the last failed response if no attempts
+        succeeded, or raise the last transport error.
+    """
+    expires = policy.expires()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            if expires is None:
+                response = await send(payload)
+            else:
+                response = await asyncio.wait_for(send(payload), max(expires - monotonic(), 0))
+        except policy.errors:
+            delay = policy.next_delay(attempt, expires)
+            if delay is None:
+                raise
+        else:
+            if not policy.failed(response):
+                return response
+            delay = policy.next_delay(attempt, expires, response)
+            if delay is None:
+                return response
+            release = getattr(response, 'release', None)
+            if release is not None:
+                release()
+        await asyncio.sleep(delay)
+
+
+def client_timeout(timeout):
+    """
+    Convert a timeout to an `aiohttp.ClientTimeout`.
+
+    :param timeout: seconds to wait for a response, a `(connect, read)`
+        tuple, an `aiohttp.ClientTimeout`, or None.
+    """
+    if timeout is None or isinstance(timeout, aiohttp.ClientTimeout):
+        return timeout
+    elif isinstance(timeout, tuple):
+        connect, read = timeout
+        return aiohttp.ClientTimeout(total=None, sock_connect=connect, sock_read=read)
+    return aiohttp.ClientTimeout(total=timeout)
+
+
+class AsyncioBatch(Batch):
+    """
+    Asynchronous JSON-RPC batch, executed when leaving the asynchronous
+    context manager or by awaiting `execute`. Chunks are sent
+    concurrently.
+
+        >>> async with client.batch() as batch:
+        ...     blocks = [batch.eth_get_block_by_number(i) for i in range(10)]
+        >>> blocks[0].result()
+    """
+
+    def __enter__(self):
+        raise TypeError("Use `async with` for asynchronous batches.")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            await self.execute()
+
+    async def execute_chunk(self, chunk):
+        """
+        Send a single chunk of calls.
+
+        :param chunk: list of deferred results.
+        """
+        response = await self.client.call(self.payload(chunk))
+        self.resolve(chunk, await self.client.parse(response))
+
+    async def execute(self):
+        """
+        Send all pending calls, one request per chunk.
+        :return: list of deferred results, in call order.
+        """
+        chunks = self.chunks()
+        await asyncio.gather(*[self.execute_chunk(i) for i in chunks])
+        return [call for chunk in chunks for call in chunk]
+
+
+class AbstractAsyncioClient(AbstractClient):
+    """
+    Abstract base class for the asynchronous clients, where `call`,
+    `parse`, and each API method return coroutines.
+    """
+
+    batch_type = AsyncioBatch
+
+    async def parse(self, response):
+        """
+        Parse the JSON body from a response returned by `call`.
+        :return: coroutine to the parsed JSON body
+        """
+        return self.codec.loads(await self.content(response))
+
+    async def content(self, response):
+        """
+        Get the raw JSON body from a response returned by `call`.
+        :return: coroutine to the JSON response body
+        """
+        return await response.read()
+
+    async def call_stream(self, payload):
+        """
+        Make calls to the API with a JSON payload, buffering the response.
+        Overridden by clients whose transport supports streaming responses.
+        :return: asynchronous generator over chunks of the response body
+        """
+        yield await self.content(await self.call(payload))
+
+    async def request(self, method, params):
+        """
+        Call the JSON RPC with a JSON payload for a single method.
+        :return: coroutine to the response object, or the decoded
+            result if `decode` is set.
+
+        :param method: RPC method name.
+        :param params: Parameter list for method call.
+        """
+        if self.decode:
+            return await self.fetch(method, params)
+        return await self.call(self.payload(method, params))
+
+    async def fetch(self, method, params):
+        """
+        Call the JSON RPC for a single method, regardless of `decode`.
+        :return: coroutine to the result of the response, decoded if
+            `decode` is set, or raise `RPCError`.
+
+        :param method: RPC method name.
+        :param params: Parameter list for method call.
+        """
+        if self.coalesce and self.python_name(method) in IDEMPOTENT_METHODS:
+            return await self.coalesced(method, params)
+        return self.unwrap(method, await self.response_body(method, params))
+
+    async def coalesced(self, method, params):
+        """
+        Fetch the result for a call, sharing the request with identical
+        calls from other tasks while it is in flight.
+        :return: coroutine to the result of the response
+
+        :param method: RPC method name.
+        :param params: Parameter list for method call.
+        """
+        key = request_key(method, params)
+        flight = self.flights.get(key)
+        if flight is None:
+            # the request runs in its own task, so no caller owns it
+            flight = self.flights[key] = Flight(self.unwrapped(method, params))
+            flight.task.add_done_callback(functools.partial(self.land, key, flight))
+
+        flight.waiters += 1
+        try:
+            # shield the shared request from cancellation of this caller
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # the last caller left, so nobody needs the result
+                self.land(key, flight)
+                flight.task.cancel()
+
+    async def unwrapped(self, method, params):
+        """
+        Fetch the result for a call, without coalescing.
+        :return: coroutine to the result of the response
+        """
+        return self.unwrap(method, await self.response_body(method, params))
+
+    def land(self, key, flight, task=None):
+        """
+        Stop sharing a request, once it completes or is cancelled.
+
+        :param key: request key.
+        :param flight: `Flight` for the request.
+        :param task: (optional) completed task.
+        """
+        if self.flights.get(key) is flight:
+            del self.flights[key]
+
+    async def response_body(self, method, params):
+        """
+        Call the JSON RPC for a single method, and parse the response
+        body, using the cache if set.
+        :return: coroutine to the JSON response object
+
+        :param method: RPC method name.
+        :param params: Parameter list for method call.
+        """
+        name = self.python_name(method)
+        cache = self.cache
+        if cache is None or not cache.cacheable(name):
+            return await self.parse(await self.call(self.payload(method, params)))
+
+        key = cache.key(method, params)
+        value = cache.get(key)
+        if value is not None:
+            return self.codec.loads(value)
+        body = await self.parse(await self.call(self.payload(method, params)))
+        transaction = cache.transaction(name, params, body)
+        receipt = None
+        if transaction is not None:
+            receipt = (await self.response_body('eth_getTransactionReceipt', [transaction])).get('result')
+        policy = cache.policy(name, params, body, receipt)
+        if policy is not None:
+            ttl, block = policy
+            if block is None or block <= await self.confirmed_block():
+                cache.set(key, self.codec.dumps(body), ttl)
+        return body
+
+    async def confirmed_block(self):
+        """
+        Get the latest block with enough confirmations to be cached.
+        :return: coroutine to the block number
+        """
+        head = quantity(await self.fetch('eth_blockNumber', []))
+        return head - self.cache.confirmations
+
+    async def iter_method(self, name, args, prefetch=DEFAULT_PREFETCH,
+                          executor=None, record=None):
+        """
+        Call a method with each set of arguments, iterating over the
+        results in order. Up to `prefetch` calls are made concurrently,
+        and a new call is only made once the consumer takes a result.
+
+        With an `executor`, such as a `ProcessPoolExecutor`, the raw
+        response bodies are parsed and decoded by the executor, so the
+        event loop only handles I/O. The client's cache and coalescing
+        are not used. Responses from transports which parse on receipt,
+        such as WebSockets, are decoded on the event loop.
+        :return: asynchronous generator over the results
+
+        :param name: Python or JSON-RPC API method name.
+        :param args: iterable of argument tuples, one per call.
+        :param prefetch: maximum number of calls made at a time.
+        :param executor: (optional) executor to parse and decode responses.
+        :param record: (optional) picklable function converting each
+            result to a compact record, called by the executor if set.
+        """
+        name = self.python_name(name)
+        method = self.rpc_name(name)
+        decode = self.worker_decode(name)
+
+        async def fetch(params):
+            if executor is None:
+                result = await self.fetch(method, params)
+                return result if record is None else record(result)
+            response = await self.call(self.payload(method, params))
+            if isinstance(response, dict):
+                # transports which parse on receipt, such as WebSockets,
+                # would only serialize the body for the executor
+                return unwrap(name, response, self.decode, record)
+            data = await self.content(response)
+            f = functools.partial(decode_result, name, data, self.codec.name, decode, record)
+            return await loop().run_in_executor(executor, f)
+
+        def request(args):
+            return asyncio.ensure_future(fetch(self.params(name, *args)))
+
+        args = iter(args)
+        pending = collections.deque(request(i) for i in itertools.islice(args, prefetch))
+        try:
+            while pending:
+                result = await pending.popleft()
+                pending.extend(request(i) for i in itertools.islice(args, 1))
+                yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_logs_range(self, from_block, to_block, address=None,
+                             topics=None, window=DEFAULT_LOGS_WINDOW,
+                             concurrency=DEFAULT_LOGS_CONCURRENCY):
+        """
+        Iterate over the logs matching a filter over a range of blocks,
+        in block order. Up to `concurrency` sub-ranges are queried
+        concurrently. Sub-ranges which fail for returning too many
+        results or timing out are bisected, and the window grows while
+        results are sparse.
+        :return: asynchronous generator over the logs
+
+        :param from_block: first block number.
+        :param to_block: last block number (inclusive).
+        :param address: (optional) contract address or list of addresses.
+        :param topics: (optional) list of `DATA` topics.
+        :param window: initial number of blocks per query.
+        :param concurrency: maximum number of sub-ranges queried at a time,
+            with at most twice as many fetched ahead of the logs yielded.
+        """
+        def request(log_range):
+            params = self.params('eth_get_logs', log_range.start, log_range.end, address, topics)
+            log_range.future = asyncio.ensure_future(self.fetch('eth_getLogs', params))
+            return log_range.future
+
+        planner = LogWindow(from_block, to_block, window, max_ranges=2 * concurrency)
+        pending = {}
+        try:
+            while not planner.done():
+                for log_range in planner.pending(concurrency - len(pending)):
+                    pending[request(log_range)] = log_range
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    log_range = pending.pop(task)
+                    if task.exception() is None:
+                        planner.complete(log_range, task.result())
+                    else:
+                        planner.fail(log_range, task.exception())
+                for log in planner.consume():
+                    yield log
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def stream_request(self, method, params, path):
+        """
+        Call the JSON RPC, and parse the response incrementally.
+        :return: asynchronous generator over the values at path within
+            the result.
+
+        :param method: RPC method name.
+        :param params: Parameter list for method call.
+        :param path: sequence of object keys, array indexes, or '*'.
+        """
+        parser = StreamParser(path)
+        async for chunk in self.call_stream(self.payload(method, params)):
+            parser.feed(chunk)
+            for item in parser.items():
+                yield item
+        parser.close()
+        for item in parser.items():
+            yield item
+
+    def map(self, method, iterable, concurrency=DEFAULT_CONCURRENCY, ordered=True,
+            max_pending=None, timeout=None, return_exceptions=False):
+        """
+        Call an API method with each argument from concurrent tasks,
+        using `amap`.
+        :return: asynchronous generator over the results, in input order
+            if `ordered`.
+
+        :param method: Python or JSON-RPC API method name, or a coroutine
+            function of a single argument.
+        :param iterable: arguments, as an iterable or asynchronous iterable.
+        :param concurrency: maximum running calls.
+        :param ordered: yield results in input order, otherwise in
+            completion order.
+        :param max_pending: (optional) maximum outstanding calls,
+            defaults to twice `concurrency`.
+        :param timeout: (optional) seconds for each call.
+        :param return_exceptions: yield exceptions in place of results.
+        """
+        if isinstance(method, str):
+            method = getattr(self, self.python_name(method))
+        return amap(method, iterable, concurrency, ordered, max_pending, timeout, return_exceptions)
+
+    def imap_unordered(self, method, iterable, concurrency=DEFAULT_CONCURRENCY,
+                       max_pending=None, timeout=None, return_exceptions=False):
+        """
+        Call an API method with each argument from concurrent tasks.
+        :return: asynchronous generator over the results, in completion
+            order.
+
+        :param method: Python or JSON-RPC API method name, or a coroutine
+            function of a single argument.
+        :param iterable: arguments, as an iterable or asynchronous iterable.
+        :param concurrency: maximum running calls.
+        :param max_pending: (optional) maximum outstanding calls,
+            defaults to twice `concurrency`.
+        :param timeout: (optional) seconds for each call.
+        :param return_exceptions: yield exceptions in place of results.
+        """
+        return self.map(method, iterable, concurrency, False, max_pending, timeout, return_exceptions)
+
+
+class AsyncioClient(AbstractAsyncioClient):
     """
     Asynchronous variant of the main API client.
-    Uses a session for connection pooling.
+    Uses a session for connection pooling, opened on the first call,
+    and closed by `close` or when leaving the asynchronous context
+    manager.
+
+        >>> async with AsyncioClient('http://node:8545', limit_per_host=50) as client:
+        ...     await client.eth_block_number()
     """
 
     def __init__(self, endpoint = LOCALHOST_HTTP_ENDPOINT,
-                 max_concurrency = 100):
+                 max_concurrency = 100, connector = None,
+                 limit = DEFAULT_CONNECTOR_LIMIT, limit_per_host = 0,
+                 keepalive_timeout = DEFAULT_KEEPALIVE_TIMEOUT,
+                 use_dns_cache = True, ttl_dns_cache = DEFAULT_DNS_CACHE_TTL,
+                 timeout = None, **kwds):
         """
         Initialize client.
         :param endpoint: address of the Ethereum RPC.
+        :param max_concurrency: maximum number of concurrent requests.
+        :param connector: (optional) `aiohttp.BaseConnector` shared with
+            other clients, which is not closed with the client. Overrides
+            the connector options below.
+        :param limit: maximum open connections, or 0 for no limit.
+        :param limit_per_host: maximum open connections to the endpoint,
+            or 0 for no limit.
+        :param keepalive_timeout: seconds to keep idle connections open.
+        :param use_dns_cache: cache resolved host addresses.
+        :param ttl_dns_cache: seconds to cache resolved host addresses,
+            or None to cache them forever.
+        :param timeout: (optional) seconds to wait for a response, a
+            `(connect, read)` tuple, or an `aiohttp.ClientTimeout`.
+        :param kwds: optional arguments for `AbstractClient`, such as `decode`.
         """
-        super(AsyncioClient, self).__init__(endpoint)
-        self.session = aiohttp.ClientSession(loop=loop())
+        super(AsyncioClient, self).__init__(endpoint, **kwds)
+        self.connector = connector
+        self.connector_options = {
+            'limit': limit,
+            'limit_per_host': limit_per_host,
+            'keepalive_timeout': keepalive_timeout,
+            'use_dns_cache': use_dns_cache,
+            'ttl_dns_cache': ttl_dns_cache,
+        }
+        self.timeout = client_timeout(timeout)
+        self.session = None
         self.semaphore = asyncio.Semaphore(max_concurrency)
 
-    def __del__(self):
-        self.session.close()
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def connect(self):
+        """
+        Open the session, if it is not already open.
+        """
+        if self.session is not None and not self.session.closed:
+            return
+        connector = self.connector
+        if connector is None:
+            connector = aiohttp.TCPConnector(**self.connector_options)
+        kwds = {} if self.timeout is None else {'timeout': self.timeout}
+        self.session = aiohttp.ClientSession(connector=connector,
+                                             connector_owner=self.connector is None, **kwds)
+
+    async def close(self):
+        """
+        Close the session, and its connector unless it is shared.
+        """
+        session, self.session = self.session, None
+        if session is not None:
+            await session.close()
 
     async def call(self, payload):
         """
-        Make calls to the API via the HTTP POST method and JSON payload.
+        Make calls to the API via the HTTP POST method and JSON payload,
+        retrying failures if the retry policy allows.
+        :return: coroutine to the response object
+        """
+        if self.retry is not None and self.retry.retryable(self, payload):
+            return await retry(self.retry, self.send, payload)
+        return await self.send(payload)
+
+    async def send(self, payload):
+        """
+        Send a JSON payload once, waiting for the rate limiter if set.
+        :return: coroutine to the response object
+        """
+        if self.limiter is None:
+            async with self.semaphore:
+                return await self.post(payload)
+        return await limit(self.limiter, self, self.post, payload, self.semaphore)
+
+    async def post(self, payload):
+        """
+        Send a JSON payload in a single HTTP POST request. Called by
+        `send` with the concurrency semaphore held.
         :return: coroutine to the response object
         """
+        data = self.codec.dumps(payload)
+        await self.connect()
+        return await self.session.post(self.endpoint, data=data, headers=JSON_HEADERS)
+
+    async def call_stream(self, payload):
+        """
+        Make calls to the API via the HTTP POST method and JSON payload,
+        without buffering the response body.
+        :return: asynchronous generator over chunks of the response body
+        """
+        await self.connect()
         async with self.semaphore:
-            return await self.session.post(self.endpoint, json=payload)
+            data = self.codec.dumps(payload)
+            async with self.session.post(self.endpoint, data=data, headers=JSON_HEADERS) as response:
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    yield chunk
+
+
+class AsyncioIPCClient(AbstractAsyncioClient):
+    """
+    Asynchronous client using a Unix domain socket to a co-located node.
+    Concurrent requests share the connection, and responses are matched
+    to requests by id. Each method returns a coroutine to the JSON
+    response object.
+    """
+
+    def __init__(self, endpoint = DEFAULT_IPC_PATH, **kwds):
+        """
+        Initialize client. The connection is opened on the first call.
+        :param endpoint: path to the node's IPC socket.
+        :param kwds: optional arguments for `AbstractClient`, such as `decode`.
+        """
+        super(AsyncioIPCClient, self).__init__(endpoint, **kwds)
+        self.writer = None
+        self.reader = None
+        self.__lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def connect(self):
+        """
+        Open the socket, if it is not already open.
+        """
+        async with self.__lock:
+            if self.writer is None or self.writer.is_closing():
+                reader, self.writer = await asyncio.open_unix_connection(self.endpoint)
+                self.reader = asyncio.ensure_future(self.__read(reader))
+
+    async def close(self):
+        """
+        Close the socket, failing in-flight requests.
+        """
+        if self.writer is not None:
+            self.writer.close()
+        if self.reader is not None:
+            self.reader.cancel()
+            await asyncio.gather(self.reader, return_exceptions=True)
+
+    async def call(self, payload):
+        """
+        Make calls to the API over the socket, retrying failures if the
+        retry policy allows. The connection is reopened after it closes.
+        :return: coroutine to the JSON response object, or list of
+            response objects for a batch payload.
+        """
+        if self.retry is not None and self.retry.retryable(self, payload):
+            return await retry(self.retry, self.send, payload)
+        return await self.send(payload)
+
+    async def send(self, payload):
+        """
+        Send a JSON payload once, waiting for the rate limiter if set.
+        :return: coroutine to the JSON response object
+        """
+        if self.limiter is None:
+            return await self.exchange(payload)
+        return await limit(self.limiter, self, self.exchange, payload)
+
+    async def exchange(self, payload):
+        """
+        Send a JSON payload over the socket, and wait for the response.
+        :return: coroutine to the JSON response object, or list of
+            response objects for a batch payload.
+        """
+        await self.connect()
+        return await multiplex(self, payload, self.__send)
+
+    async def parse(self, response):
+        """
+        Responses are parsed when received.
+        :return: coroutine to the JSON response object
+        """
+        return response
+
+    async def content(self, response):
+        """
+        Serialize a response, which is parsed when received.
+        :return: coroutine to the JSON response body
+        """
+        return self.codec.dumps(response)
+
+    # PRIVATE
+
+    async def __send(self, payload):
+        """
+        Write payload to the socket.
+        """
+        self.writer.write(self.codec.dumps(payload) + b'\n')
+        await self.writer.drain()
+
+    async def __read(self, reader):
+        """
+        Read responses from the socket until it closes.
+        """
+        stream = JSONStream(self.codec.loads)
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    break
+                for value in stream.feed(data):
+                    values = value if isinstance(value, list) else [value]
+                    for item in values:
+                        self.resolve_future(item)
+        finally:
+            self.fail_futures(ConnectionError("IPC connection closed."))
+
+
+class AsyncioChainFollower(ChainFollower):
+    """
+    Asynchronous follower of the chain head, yielding `ChainEvent`s.
+    New heads are received from a `newHeads` subscription for clients
+    supporting subscriptions, and otherwise polled from a block filter,
+    or from `eth_blockNumber` if the node does not support filters.
+
+        >>> async for event in AsyncioChainFollower(client):
+        ...     print(event.type, event.block['number'])
+    """
+
+    def __init__(self, *args, **kwds):
+        """
+        Initialize follower.
+
+        :param args: positional arguments for `ChainFollower`.
+        :param kwds: keyword arguments for `ChainFollower`.
+        """
+        super(AsyncioChainFollower, self).__init__(*args, **kwds)
+        self.subscription = None
+
+    def __iter__(self):
+        raise TypeError("Use `async for` for asynchronous followers.")
+
+    def __aiter__(self):
+        return self.events()
+
+    def __enter__(self):
+        raise TypeError("Use `async with` for asynchronous followers.")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def events(self):
+        """
+        Yield events for the canonical chain, indefinitely.
+        :return: asynchronous generator over the events
+        """
+        try:
+            # subscribe before fetching the head, so no new heads are missed
+            subscribed = await self.subscribe()
+            if not subscribed:
+                await self.install()
+            for event in await self.update(await self.block_by_number('latest')):
+                yield event
+            if subscribed:
+                async for head in self.subscription:
+                    block = await self.block_by_hash(header(head)[1])
+                    for event in await self.update(block):
+                        yield event
+            while True:
+                for event in await self.poll():
+                    yield event
+                await asyncio.sleep(self.interval)
+        finally:
+            await self.close()
+
+    async def subscribe(self):
+        """
+        Subscribe to new heads, if supported by the client and node.
+        :return: coroutine to if the subscription was created
+        """
+        if not hasattr(self.client, 'subscribe'):
+            return False
+        try:
+            self.subscription = await self.client.subscribe('eth_subscribe', 'newHeads')
+        except RPCError:
+            return False
+        self.mode = SUBSCRIPTION
+        return True
+
+    async def poll(self):
+        """
+        Poll the node for new heads once.
+        :return: coroutine to the list of events
+        """
+        if self.mode in (None, SUBSCRIPTION):
+            await self.install()
+        if self.mode == FILTER:
+            try:
+                hashes = await self.client.fetch('eth_getFilterChanges', self.changes_params())
+            except RPCError:
+                # filter expired, reinstall or fall back to the block number
+                await self.install()
+                return await self.update(await self.block_by_number('latest'))
+            events = []
+            for hash_ in hashes[-1:]:
+                events.extend(await self.update(await self.block_by_hash(hash_)))
+            return events
+
+        number = quantity(await self.client.fetch('eth_blockNumber', []))
+        if self.tracker.behind(number):
+            return await self.update(await self.block_by_number(number))
+        return []
+
+    async def update(self, block):
+        """
+        Apply a new head, fetching parents back to the buffered chain.
+        :return: coroutine to the list of events
+
+        :param block: new head block, or None if not yet available.
+        """
+        if block is None:
+            return []
+        chain = [block]
+        parent = self.tracker.missing(block)
+        while parent is not None:
+            chain.insert(0, await self.block_by_hash(parent))
+            parent = self.tracker.missing(chain[0])
+        return self.tracker.apply(chain)
+
+    async def install(self):
+        """
+        Install a block filter, falling back to polling the block number
+        if the node does not support filters.
+        """
+        try:
+            self.installed(await self.client.fetch('eth_newBlockFilter', []))
+        except RPCError:
+            self.installed(None)
+
+    async def close(self):
+        """
+        Cancel the subscription, and uninstall the block filter, if any.
+        """
+        subscription, self.subscription = self.subscription, None
+        if subscription is not None:
+            try:
+                await subscription.unsubscribe()
+            except (ConnectionError, RPCError):
+                pass
+        params = self.uninstall_params()
+        if params is not None:
+            try:
+                await self.client.fetch('eth_uninstallFilter', params)
+            except RPCError:
+                pass
+
+    async def block_by_hash(self, hash_):
+        """
+        Fetch a block by hash.
+        :return: coroutine to the block
+
+        :param hash_: block hash.
+        """
+        return await self.client.fetch('eth_getBlockByHash', self.hash_params(hash_))
+
+    async def block_by_number(self, number):
+        """
+        Fetch a block by number or tag.
+        :return: coroutine to the block
+
+        :param number: block number or tag.
+        """
+        return await self.client.fetch('eth_getBlockByNumber', self.number_params(number))
+
+
+class AsyncioFilterManager(FilterManager):
+    """
+    Asynchronous manager for filters, polling all filters with one batch
+    request per tick.
+
+        >>> async with AsyncioFilterManager(client) as manager:
+        ...     transfers = await manager.new_filter(address=token, topics=[TRANSFER])
+        ...     while True:
+        ...         for log in (await manager.poll())[transfers].changes:
+        ...             print(log['transactionHash'])
+        ...         await asyncio.sleep(1)
+    """
+
+    def __enter__(self):
+        raise TypeError("Use `async with` for asynchronous filter managers.")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def add(self, filter_):
+        """
+        Install and manage a filter.
+        :return: coroutine to `filter_`
+
+        :param filter_: `ManagedFilter`.
+        """
+        results = {}
+        await self.reinstall([filter_], results)
+        return self.added(filter_, results)
+
+    async def poll(self):
+        """
+        Poll all filters, reinstalling expired filters.
+        :return: coroutine to the dict of `FilterResult` by filter
+        """
+        filters = list(self.filters)
+        if not filters:
+            return {}
+        batch = self.batch(len(filters) + 1)
+        head, calls = self.poll_calls(batch, filters)
+        await batch.execute()
+        results, expired = self.resolve(batch, head, filters, calls)
+        if expired:
+            try:
+                await self.reinstall(expired, results)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                self.failed(expired, error, results)
+        return results
+
+    async def reinstall(self, filters, results):
+        """
+        Install filters, and fill the logs missed by log filters since
+        their last poll.
+
+        :param filters: list of filters.
+        :param results: dict of `FilterResult` by filter, updated in-place.
+        """
+        batch = self.batch(len(filters) + 1)
+        head, calls = self.install_calls(batch, filters)
+        await batch.execute()
+        gaps = self.installed(batch, head, filters, calls, results)
+        if gaps:
+            batch = self.batch(len(gaps))
+            calls = self.fill_calls(batch, gaps)
+            await batch.execute()
+            self.filled(batch, gaps, calls, results)
+
+    async def remove(self, filter_):
+        """
+        Uninstall a filter, and stop managing it.
+
+        :param filter_: `ManagedFilter`.
+        """
+        self.filters.remove(filter_)
+        await self.uninstall([filter_])
+
+    async def close(self):
+        """
+        Uninstall all filters.
+        """
+        filters, self.filters = self.filters, []
+        await self.uninstall(filters)
+
+    async def uninstall(self, filters):
+        """
+        Uninstall filters, ignoring filters which already expired.
+
+        :param filters: list of filters.
+        """
+        if not filters:
+            return
+        batch = self.batch(len(filters))
+        self.uninstall_calls(batch, filters)
+        await batch.execute()
+
+
+class AsyncioPooledClient(PooledClient, AbstractAsyncioClient):
+    """
+    Asynchronous client balancing requests over multiple nodes.
+
+        >>> async with AsyncioPooledClient(['http://node1:8545', 'http://node2:8545']) as client:
+        ...     await client.eth_block_number()
+    """
+
+    def __init__(self, endpoints, client_type=AsyncioClient, max_lag=DEFAULT_MAX_LAG,
+                 probe_interval=DEFAULT_PROBE_INTERVAL, hedge=None, **kwds):
+        """
+        Initialize client.
+
+        :param endpoints: addresses of the Ethereum RPCs, or clients.
+        :param client_type: client class for each address.
+        :param max_lag: maximum blocks a node may lag behind the highest
+            head before it is ejected.
+        :param probe_interval: seconds between health probes, or None
+            to only probe on calls to `probe`.
+        :param hedge: (optional) latency quantile, such as 0.95, after
+            which a call to an idempotent method is duplicated to a
+            second node, taking whichever response arrives first.
+        :param kwds: optional arguments for `AbstractClient`, such as `decode`.
+        """
+        super(AsyncioPooledClient, self).__init__(endpoints, client_type, max_lag,
+                                                  probe_interval, hedge, **kwds)
+        # hedges are tasks, rather than worker threads
+        self.executor = None
+        self.prober = None
+
+    def __enter__(self):
+        raise TypeError("Use `async with` for asynchronous pooled clients.")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def call(self, payload):
+        """
+        Make calls to the API on the selected node, retrying failures on
+        the next selected node if the retry policy allows.
+        :return: coroutine to the response object
+        """
+        if self.probe_interval is not None and self.prober is None:
+            self.prober = asyncio.ensure_future(self.__probe_loop())
+        if self.retry is not None and self.retry.retryable(self, payload):
+            return await retry(self.retry, self.send, payload)
+        return await self.send(payload)
+
+    async def send(self, payload):
+        """
+        Send a JSON payload once, hedged if enabled. The slower of two
+        hedged requests is cancelled.
+        :return: coroutine to the response object
+        """
+        delay = self.hedge_delay(payload)
+        if delay is None:
+            return await self.send_node(self.pool.acquire(), payload)
+
+        node = self.pool.acquire()
+        pending = {asyncio.ensure_future(self.send_node(node, payload))}
+        error = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                hedge = self.pool.acquire(exclude=node)
+                pending.add(asyncio.ensure_future(self.send_node(hedge, payload)))
+            while True:
+                for future in done:
+                    if future.exception() is None:
+                        return future.result()
+                    error = error or future.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def send_node(self, node, payload):
+        """
+        Send a JSON payload to a node acquired from the pool, waiting
+        for the rate limiter of the node if set.
+        :return: coroutine to the response object
+
+        :param node: pool node returned by `pool.acquire`.
+        :param payload: JSON payload, or list of payloads for a batch.
+        """
+        start = monotonic()
+        try:
+            if node.limiter is None:
+                response = await node.client.call(payload)
+            else:
+                response = await limit(node.limiter, self, node.client.call, payload)
+        except asyncio.CancelledError:
+            self.pool.release(node)
+            raise
+        except Exception as error:
+            self.pool.release(node, monotonic() - start, error)
+            raise
+        self.pool.release(node, monotonic() - start)
+        return self.serve(node, response)
+
+    async def call_stream(self, payload):
+        """
+        Make calls to the API on the selected node, without buffering
+        the response body.
+        :return: asynchronous generator over chunks of the response body
+        """
+        node = self.pool.acquire()
+        start = monotonic()
+        error = None
+        try:
+            async for chunk in node.client.call_stream(payload):
+                yield chunk
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            self.pool.release(node, monotonic() - start, error)
+
+    async def parse(self, response):
+        """
+        Parse the JSON body from a response returned by `call`, with the
+        client which returned it.
+        :return: coroutine to the JSON response object
+        """
+        client = self.served_by(response)
+        return response if client is None else await client.parse(response)
+
+    async def content(self, response):
+        """
+        Get the raw JSON body from a response returned by `call`, with
+        the client which returned it.
+        :return: coroutine to the JSON response body
+        """
+        client = self.served_by(response)
+        return self.codec.dumps(response) if client is None else await client.content(response)
+
+    async def probe(self):
+        """
+        Probe the health and head of every node concurrently.
+        """
+        await asyncio.gather(*[self.probe_node(i) for i in self.nodes])
+
+    async def probe_node(self, node):
+        """
+        Probe the health and head of a single node.
+
+        :param node: pool node.
+        """
+        batch = node.client.batch()
+        calls = self.pool.probe_calls(batch)
+        start = monotonic()
+        try:
+            await batch.execute()
+        except Exception as error:
+            self.pool.update(node, batch, calls, monotonic() - start, error)
+        else:
+            self.pool.update(node, batch, calls, monotonic() - start)
+
+    async def close(self):
+        """
+        Stop the health probes, and close the clients created for
+        addresses.
+        """
+        prober, self.prober = self.prober, None
+        if prober is not None:
+            prober.cancel()
+            await asyncio.gather(prober, return_exceptions=True)
+        await asyncio.gather(*[i.close() for i in self.owned])
+
+    # PRIVATE
+
+    async def __probe_loop(self):
+        """
+        Probe nodes every `probe_interval` seconds, until closed.
+        """
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            await self.probe()
@@ -0,0 +1,119 @@
+'''
+    asyncio_http2
+    -------------
+
+    Module for the asynchronous HTTP/2 Ethereum RPC client, using
+    `httpx`. Requires `pip install httpx[http2]` and `aiohttp`, for
+    the asynchronous client base class.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'AsyncioHTTP2Client',
+]
+
+import httpx
+from .asyncio import AbstractAsyncioClient, limit, retry
+from .core import JSON_HEADERS, LOCALHOST_HTTP_ENDPOINT
+from .http2 import DEFAULT_HTTP2_CONNECTIONS, http2_options
+from .stream import STREAM_CHUNK_SIZE
+
+
+class AsyncioHTTP2Client(AbstractAsyncioClient):
+    """
+    Asynchronous client using HTTP/2. Concurrent tasks are multiplexed
+    over at most `max_connections` connections. Each method returns a
+    coroutine to the `httpx.Response` object.
+
+        >>> async with AsyncioHTTP2Client('https://node:8545') as client:
+        ...     await client.eth_block_number()
+    """
+
+    def __init__(self, endpoint = LOCALHOST_HTTP_ENDPOINT,
+                 max_connections = DEFAULT_HTTP2_CONNECTIONS,
+                 prior_knowledge = False, timeout = None, transport = None,
+                 **kwds):
+        """
+        Initialize client.
+        :param endpoint: address of the Ethereum RPC.
+        :param max_connections: maximum connections to the endpoint.
+        :param prior_knowledge: speak HTTP/2 without negotiation (h2c).
+        :param timeout: (optional) seconds to wait for a response, a
+            `(connect, read)` tuple, or an `httpx.Timeout`.
+        :param transport: (optional) `httpx` transport, for testing.
+        :param kwds: optional arguments for `AbstractClient`, such as `decode`.
+        """
+        super(AsyncioHTTP2Client, self).__init__(endpoint, **kwds)
+        options = http2_options(max_connections, prior_knowledge, timeout, transport)
+        self.session = httpx.AsyncClient(**options)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def call(self, payload):
+        """
+        Make calls to the API via the HTTP POST method and JSON payload,
+        retrying failures if the retry policy allows.
+        :return: coroutine to the `httpx.Response` object
+        """
+        if self.retry is not None and self.retry.retryable(self, payload):
+            return await retry(self.retry, self.send, payload)
+        return await self.send(payload)
+
+    async def send(self, payload):
+        """
+        Send a JSON payload once, waiting for the rate limiter if set.
+        :return: coroutine to the `httpx.Response` object
+        """
+        if self.limiter is None:
+            return await self.post(payload)
+        return await limit(self.limiter, self, self.post, payload)
+
+    async def post(self, payload):
+        """
+        Send a JSON payload in a single HTTP POST request.
+        :return: coroutine to the `httpx.Response` object
+        """
+        data = self.codec.dumps(payload)
+        return await self.session.post(self.endpoint, content=data, headers=JSON_HEADERS)
+
+    async def parse(self, response):
+        """
+        Parse the JSON body from a response returned by `call`, which is
+        read before `call` returns.
+        :return: coroutine to the parsed JSON body
+        """
+        return self.codec.loads(response.content)
+
+    async def content(self, response):
+        """
+        Get the raw JSON body from a response returned by `call`, which
+        is read before `call` returns.
+        :return: coroutine to the JSON response body
+        """
+        return response.content
+
+    async def call_stream(self, payload):
+        """
+        Make calls to the API via the HTTP POST method and JSON payload,
+        without buffering the response body.
+        :return: asynchronous generator over chunks of the response body
+        """
+        data = self.codec.dumps(payload)
+        async with self.session.stream('POST', self.endpoint, content=data, headers=JSON_HEADERS) as response:
+            async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                yield chunk
+
+    async def close(self):
+        """
+        Close the connections.
+        """
+        await self.session.aclose()
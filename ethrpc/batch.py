@@ -0,0 +1,227 @@
+'''
+    batch
+    -----
+
+    Module for JSON-RPC 2.0 batch requests.
+
+    A batch records calls made through the same method names as the
+    client, and sends them as one or more JSON arrays, matching each
+    response back to its call by request id.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'Batch',
+    'BatchResult',
+]
+
+
+class BatchResult(object):
+    """
+    Deferred result for a single call within a batch.
+    """
+
+    __slots__ = ('id', 'method', 'params', '_value', '_exception', '_done')
+
+    def __init__(self, id_, method, params):
+        """
+        Initialize result.
+
+        :param id_: request id for the call.
+        :param method: JSON-RPC method name.
+        :param params: parameter list for the call.
+        """
+        self.id = id_
+        self.method = method
+        self.params = params
+        self._value = None
+        self._exception = None
+        self._done = False
+
+    def done(self):
+        """
+        Get if the batch containing the call has been executed.
+        """
+        return self._done
+
+    def result(self):
+        """
+        Get the response body for the call.
+        :return: JSON response object (or decoded result if the client
+            decodes results), or raise exception.
+        """
+        if not self._done:
+            raise RuntimeError("Batch has not been executed.")
+        if self._exception is not None:
+            raise self._exception
+        return self._value
+
+    def set_result(self, value):
+        """
+        Set the response body for the call.
+
+        :param value: JSON response object.
+        """
+        self._value = value
+        self._done = True
+
+    def set_exception(self, exception):
+        """
+        Set an exception raised when retrieving the result.
+
+        :param exception: exception instance.
+        """
+        self._exception = exception
+        self._done = True
+
+
+class Batch(object):
+    """
+    Synchronous JSON-RPC batch, executed when leaving the context
+    manager or by calling `execute`.
+
+        >>> with client.batch() as batch:
+        ...     blocks = [batch.eth_get_block_by_number(i) for i in range(10)]
+        >>> blocks[0].result()
+    """
+
+    def __init__(self, client, max_batch_size):
+        """
+        Initialize batch.
+
+        :param client: client used to send the batch.
+        :param max_batch_size: maximum calls per request.
+        """
+        if max_batch_size < 1:
+            raise ValueError("Batch size must be positive.")
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.calls = []
+
+    def __len__(self):
+        return len(self.calls)
+
+    def __getattr__(self, name):
+        if name.startswith('_') or not self.client.has_method(name):
+            raise AttributeError(name)
+        method = self.client.rpc_name(name)
+        client = self.client
+
+        def f(*args, **kwds):
+            return self.add(method, client.params(name, *args, **kwds))
+
+        f.__name__ = name
+        return f
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.execute()
+
+    def add(self, method, params):
+        """
+        Add call to batch.
+
+        :param method: JSON-RPC method name.
+        :param params: parameter list for the call.
+        :return: deferred result for the call.
+        """
+        call = BatchResult(self.client.next_id(), method, params)
+        self.calls.append(call)
+        return call
+
+    def chunks(self):
+        """
+        Split pending calls into groups no larger than `max_batch_size`,
+        and clear the pending calls.
+        :return: list of lists of deferred results.
+        """
+        calls = self.calls
+        self.calls = []
+        size = self.max_batch_size
+        return [calls[i:i+size] for i in range(0, len(calls), size)]
+
+    def payload(self, chunk):
+        """
+        Get the JSON payload for a group of calls.
+
+        :param chunk: list of deferred results.
+        """
+        return [{
+            "jsonrpc": "2.0",
+            "method": call.method,
+            "params": call.params,
+            "id": call.id
+        } for call in chunk]
+
+    def resolve(self, chunk, body):
+        """
+        Match response bodies to calls by request id.
+
+        :param chunk: list of deferred results.
+        :param body: parsed JSON response for the chunk.
+        """
+        # A server that rejects the whole batch responds with a
+        # single error object, rather than an array.
+        if isinstance(body, dict):
+            for call in chunk:
+                self.set_body(call, body)
+            return
+
+        responses = {i.get('id'): i for i in body}
+        for call in chunk:
+            try:
+                response = responses[call.id]
+            except KeyError:
+                message = "No response for batch request id {}.".format(call.id)
+                call.set_exception(ValueError(message))
+            else:
+                self.set_body(call, response)
+
+    def set_body(self, call, body):
+        """
+        Set the response body for a call, decoded if the client
+        decodes results.
+
+        :param call: deferred result.
+        :param body: JSON response object.
+        """
+        if not self.client.decode:
+            call.set_result(body)
+            return
+        try:
+            call.set_result(self.client.unwrap(call.method, body))
+        except Exception as error:
+            call.set_exception(error)
+
+    def unwrap(self, call):
+        """
+        Get the result of an executed call, regardless of whether the
+        client decodes results.
+        :return: result, or raise `RPCError`.
+
+        :param call: deferred result.
+        """
+        value = call.result()
+        if self.client.decode:
+            return value
+        return self.client.unwrap(call.method, value)
+
+    def execute(self):
+        """
+        Send all pending calls, one request per chunk.
+        :return: list of deferred results, in call order.
+        """
+        results = []
+        for chunk in self.chunks():
+            response = self.client.call(self.payload(chunk))
+            self.resolve(chunk, self.client.parse(response))
+            results.extend(chunk)
+        return results
@@ -0,0 +1,459 @@
+'''
+    cache
+    -----
+
+    Response caching for pure and immutable API methods.
+
+    Each method has a cache policy: responses for immutable data, such
+    as blocks by hash, are cached permanently, responses which change
+    slowly, such as the gas price, for a short time-to-live, and all
+    other responses are never cached. Responses for methods taking a
+    block number are immutable once the block has enough confirmations.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'CachePolicy',
+    'LRUCache',
+    'ResponseCache',
+    'SQLiteCache',
+    'TieredCache',
+    'CACHE_POLICIES',
+    'DEFAULT_CONFIRMATIONS',
+    'PERMANENT',
+]
+
+import collections
+import json
+import os
+import six
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_COMPRESSION = 6
+DEFAULT_CONFIRMATIONS = 12
+
+monotonic = getattr(time, 'monotonic', time.time)
+
+# Cache policy for a method. `ttl` is the time-to-live in seconds, or
+# None if responses are permanent, `block` is the index of the block
+# parameter, for responses which are only permanent once the block is
+# confirmed, and `transaction` is the index of the transaction hash
+# parameter, for responses which are only permanent once the block of
+# the transaction's receipt is confirmed.
+CachePolicy = collections.namedtuple('CachePolicy', 'ttl block transaction')
+CachePolicy.__new__.__defaults__ = (None,)
+
+PERMANENT = CachePolicy(None, None)
+
+
+def ttl(seconds):
+    '''Create policy caching responses for a number of seconds.'''
+
+    return CachePolicy(seconds, None)
+
+
+def at_block(index):
+    '''Create policy caching responses for confirmed block numbers.'''
+
+    return CachePolicy(None, index)
+
+
+def at_transaction(index):
+    '''Create policy caching responses for confirmed transactions.'''
+
+    return CachePolicy(None, None, index)
+
+
+# Cache policies by Python API method name. Methods not in the table
+# are never cached.
+CACHE_POLICIES = {
+    'debug_trace_block_by_hash': PERMANENT,
+    'debug_trace_block_by_number': at_block(0),
+    'debug_trace_transaction': at_transaction(0),
+    'eth_block_number': ttl(1),
+    'eth_call': at_block(1),
+    'eth_gas_price': ttl(5),
+    'eth_get_balance': at_block(1),
+    'eth_get_block_by_hash': PERMANENT,
+    'eth_get_block_by_number': at_block(0),
+    'eth_get_block_transaction_count_by_hash': PERMANENT,
+    'eth_get_block_transaction_count_by_number': at_block(0),
+    'eth_get_code': at_block(1),
+    'eth_get_storage_at': at_block(2),
+    'eth_get_transaction_by_block_hash_and_index': PERMANENT,
+    'eth_get_transaction_by_block_number_and_index': at_block(0),
+    'eth_get_transaction_by_hash': PERMANENT,
+    'eth_get_transaction_count': at_block(1),
+    'eth_get_transaction_receipt': PERMANENT,
+    'eth_get_uncle_by_block_hash_and_index': PERMANENT,
+    'eth_get_uncle_by_block_number_and_index': at_block(0),
+    'eth_get_uncle_count_by_block_hash': PERMANENT,
+    'eth_get_uncle_count_by_block_number': at_block(0),
+    'net_version': PERMANENT,
+    'parity_get_block_header_by_number': at_block(0),
+    'trace_block': at_block(0),
+    'trace_get': PERMANENT,
+    'trace_transaction': PERMANENT,
+    'web3_sha3': PERMANENT,
+}
+
+
+def request_key(method, params):
+    """
+    Get canonical key for a call, independent of the order of object
+    keys in the parameters.
+
+    :param method: RPC method name.
+    :param params: parameter list for the call.
+    """
+    return json.dumps([method, params], sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def result_block(result):
+    """
+    Get the block number of a transaction, receipt or trace result.
+    :return: block number, None if pending, or False if the result is
+        not tied to a block.
+
+    :param result: raw result.
+    """
+    if isinstance(result, list):
+        result = result[0] if result else None
+    if not isinstance(result, dict) or 'blockNumber' not in result:
+        return False
+    number = result['blockNumber']
+    if number is None:
+        return None
+    return number if isinstance(number, six.integer_types) else int(number, 16)
+
+
+class LRUCache(object):
+    """
+    Thread-safe in-memory cache, evicting the least recently used
+    entries once the number of entries or their size exceeds the bound.
+    """
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE, max_bytes=None):
+        """
+        Initialize cache.
+
+        :param max_size: (optional) maximum number of entries.
+        :param max_bytes: (optional) maximum size of keys and values.
+        """
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Get value for key, or None if missing or expired.
+
+        :param key: cache key.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires <= monotonic():
+                self.__remove(key)
+                return None
+            self.entries.pop(key)
+            self.entries[key] = entry
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Set value for key.
+
+        :param key: cache key.
+        :param value: serialized response body.
+        :param ttl: (optional) time-to-live in seconds, or None.
+        """
+        expires = None if ttl is None else monotonic() + ttl
+        with self.lock:
+            if key in self.entries:
+                self.__remove(key)
+            self.entries[key] = (expires, value)
+            self.bytes += len(key) + len(value)
+            while self.entries and self.__full():
+                self.__remove(next(iter(self.entries)))
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    # PRIVATE
+
+    def __full(self):
+        """
+        Get if the cache exceeds its bounds.
+        """
+        if self.max_size is not None and len(self.entries) > self.max_size:
+            return True
+        return self.max_bytes is not None and self.bytes > self.max_bytes
+
+    def __remove(self, key):
+        """
+        Remove entry, with the lock held.
+        """
+        _, value = self.entries.pop(key)
+        self.bytes -= len(key) + len(value)
+
+
+class SQLiteCache(object):
+    """
+    Persistent cache for permanent responses, stored compressed in an
+    SQLite database, so historical data survives restarts. Responses
+    with a time-to-live are not stored.
+
+        >>> cache = ResponseCache(SQLiteCache('~/.cache/ethrpc.sqlite'))
+    """
+
+    def __init__(self, path, compression=DEFAULT_COMPRESSION):
+        """
+        Initialize cache.
+
+        :param path: path to the database file.
+        :param compression: zlib compression level, from 0 to 9.
+        """
+        self.path = os.path.expanduser(path)
+        self.compression = compression
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses '
+                '(key BLOB PRIMARY KEY, value BLOB NOT NULL) WITHOUT ROWID'
+            )
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get(self, key):
+        """
+        Get value for key, or None if missing.
+
+        :param key: cache key.
+        """
+        with self.lock:
+            row = self.connection.execute('SELECT value FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        return zlib.decompress(row[0])
+
+    def set(self, key, value, ttl=None):
+        """
+        Set value for key, if permanent.
+
+        :param key: cache key.
+        :param value: serialized response body.
+        :param ttl: (optional) time-to-live in seconds, or None.
+        """
+        if ttl is not None:
+            return
+        value = zlib.compress(value, self.compression)
+        with self.lock, self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO responses VALUES (?, ?)', (key, value))
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        with self.lock, self.connection:
+            self.connection.execute('DELETE FROM responses')
+
+    def close(self):
+        """
+        Close the database.
+        """
+        with self.lock:
+            self.connection.close()
+
+
+class TieredCache(object):
+    """
+    Cache checking each store in order, such as an `LRUCache` in front
+    of an `SQLiteCache`, and filling the faster stores on a hit.
+    """
+
+    def __init__(self, *stores):
+        """
+        Initialize cache.
+
+        :param stores: stores, from fastest to slowest.
+        """
+        self.stores = stores
+
+    def get(self, key):
+        """
+        Get value for key, or None if missing from every store.
+
+        :param key: cache key.
+        """
+        for index, store in enumerate(self.stores):
+            value = store.get(key)
+            if value is not None:
+                for faster in self.stores[:index]:
+                    faster.set(key, value)
+                return value
+        return None
+
+    def set(self, key, value, ttl=None):
+        """
+        Set value for key in every store.
+
+        :param key: cache key.
+        :param value: serialized response body.
+        :param ttl: (optional) time-to-live in seconds, or None.
+        """
+        for store in self.stores:
+            store.set(key, value, ttl)
+
+    def clear(self):
+        """
+        Remove all entries from every store.
+        """
+        for store in self.stores:
+            store.clear()
+
+
+class ResponseCache(object):
+    """
+    Cache of response bodies, by method and parameters, following the
+    per-method cache policies.
+
+        >>> client = Client(cache=ResponseCache(LRUCache(max_bytes=2**28)))
+    """
+
+    def __init__(self, store=None, policies=None, confirmations=DEFAULT_CONFIRMATIONS):
+        """
+        Initialize cache.
+
+        :param store: (optional) backend with `get(key)` and
+            `set(key, value, ttl)`, defaults to an `LRUCache`.
+        :param policies: (optional) cache policies by Python API method
+            name, defaults to `CACHE_POLICIES`.
+        :param confirmations: number of confirmations for a block to be
+            considered immutable.
+        """
+        self.store = LRUCache() if store is None else store
+        self.policies = CACHE_POLICIES if policies is None else policies
+        self.confirmations = confirmations
+
+    def cacheable(self, name):
+        """
+        Get if responses for a method may be cached.
+
+        :param name: Python API method name.
+        """
+        return self.policies.get(name) is not None
+
+    def key(self, method, params):
+        """
+        Get canonical cache key for a call.
+
+        :param method: RPC method name.
+        :param params: parameter list for the call.
+        """
+        return request_key(method, params)
+
+    def get(self, key):
+        """
+        Get serialized response body for key, or None.
+
+        :param key: cache key.
+        """
+        return self.store.get(key)
+
+    def set(self, key, value, ttl=None):
+        """
+        Set serialized response body for key.
+
+        :param key: cache key.
+        :param value: serialized response body.
+        :param ttl: (optional) time-to-live in seconds, or None.
+        """
+        self.store.set(key, value, ttl)
+
+    def transaction(self, name, params, body):
+        """
+        Get the transaction whose receipt is required by `policy`, for
+        results which do not include their block number, such as traces.
+        :return: transaction hash, or None.
+
+        :param name: Python API method name.
+        :param params: parameter list for the call.
+        :param body: raw JSON response object.
+        """
+        policy = self.policies.get(name)
+        if policy is None or policy.transaction is None or len(params) <= policy.transaction:
+            return None
+        elif not isinstance(body, dict) or body.get('result') is None:
+            return None
+        return params[policy.transaction]
+
+    def policy(self, name, params, body, receipt=None):
+        """
+        Get how a response may be cached.
+        :return: None if the response may not be cached, otherwise
+            `(ttl, block)`, where `block` is a block number which must
+            be confirmed for the response to be cached, or None.
+
+        :param name: Python API method name.
+        :param params: parameter list for the call.
+        :param body: raw JSON response object.
+        :param receipt: (optional) raw receipt of the transaction from
+            `transaction`, which is pending or unknown if None.
+        """
+        policy = self.policies.get(name)
+        if policy is None or not isinstance(body, dict) or body.get('result') is None:
+            return None
+        elif policy.ttl is not None:
+            return policy.ttl, None
+        elif policy.block is not None:
+            tag = params[policy.block] if len(params) > policy.block else None
+            if tag == 'earliest':
+                return None, None
+            elif isinstance(tag, six.string_types) and tag.startswith('0x'):
+                return None, int(tag, 16)
+            return None
+        elif policy.transaction is not None:
+            # results may change until the transaction's block is confirmed
+            number = result_block(receipt)
+            return None if number is None or number is False else (None, number)
+
+        # transactions, receipts and traces are permanent once confirmed
+        number = result_block(body['result'])
+        if number is None:
+            return None
+        elif number is False:
+            return None, None
+        return None, number
@@ -13,32 +13,156 @@ __email__ = "alex@qchain.co"
 __maintainer__ = "Alex Huszagh"
 __all__ = [
     'Client',
+    'KeepAliveAdapter',
+    'DEFAULT_POOL_CONNECTIONS',
+    'DEFAULT_POOL_MAXSIZE',
 ]
 
 import requests
-from .core import AbstractClient, LOCALHOST_HTTP_ENDPOINT
+import requests.adapters
+import socket
+from urllib3.connection import HTTPConnection
+from .core import AbstractClient, JSON_HEADERS, LOCALHOST_HTTP_ENDPOINT
+from .stream import STREAM_CHUNK_SIZE
+
+DEFAULT_POOL_CONNECTIONS = requests.adapters.DEFAULT_POOLSIZE
+DEFAULT_POOL_MAXSIZE = requests.adapters.DEFAULT_POOLSIZE
+
+
+def keepalive_options(idle, interval=None, count=None):
+    """
+    Get socket options enabling TCP keepalive, skipping the options
+    the platform does not support.
+    :return: list of `(level, option, value)` tuples.
+
+    :param idle: seconds a connection is idle before the first probe.
+    :param interval: (optional) seconds between probes, defaults to `idle`.
+    :param count: (optional) failed probes before the connection is dropped.
+    """
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    tcp = [
+        ('TCP_KEEPIDLE', idle),
+        ('TCP_KEEPALIVE', idle),        # macOS name for TCP_KEEPIDLE
+        ('TCP_KEEPINTVL', idle if interval is None else interval),
+        ('TCP_KEEPCNT', count),
+    ]
+    for name, value in tcp:
+        if value is not None and hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), int(value)))
+    return options
+
+
+class KeepAliveAdapter(requests.adapters.HTTPAdapter):
+    """
+    HTTP adapter adding socket options, such as TCP keepalive, to each
+    pooled connection.
+    """
+
+    def __init__(self, socket_options=None, **kwds):
+        """
+        Initialize adapter.
+
+        :param socket_options: (optional) list of `(level, option, value)`
+            tuples for each connection.
+        :param kwds: optional arguments for `HTTPAdapter`, such as `pool_maxsize`.
+        """
+        self.socket_options = socket_options
+        super(KeepAliveAdapter, self).__init__(**kwds)
+
+    def init_poolmanager(self, *args, **kwds):
+        if self.socket_options is not None:
+            kwds['socket_options'] = HTTPConnection.default_socket_options + self.socket_options
+        super(KeepAliveAdapter, self).init_poolmanager(*args, **kwds)
 
 
 class Client(AbstractClient):
     """
     Synchronous variant of the main API client.
     Uses a session for connection pooling.
+
+    A client may be shared between threads: concurrent calls each take
+    a connection from the pool, or open a new connection if the pool
+    is exhausted (or wait for one, if `pool_block` is set). Set
+    `pool_maxsize` to the number of threads to reuse every connection.
+    Changing the client or session configuration while calls are in
+    flight is not thread-safe.
     """
 
-    def __init__(self, endpoint = LOCALHOST_HTTP_ENDPOINT):
+    def __init__(self, endpoint = LOCALHOST_HTTP_ENDPOINT,
+                 pool_connections = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize = DEFAULT_POOL_MAXSIZE, pool_block = False,
+                 timeout = None, keepalive = None, **kwds):
         """
         Initialize client.
         :param endpoint: address of the Ethereum RPC.
+        :param pool_connections: number of hosts to keep connection pools for.
+        :param pool_maxsize: maximum idle connections kept per host.
+        :param pool_block: wait for a pooled connection when all are in
+            use, rather than opening a connection which is discarded
+            after the request, limiting the connections per host.
+        :param timeout: (optional) seconds to wait for the server, or a
+            `(connect, read)` tuple.
+        :param keepalive: (optional) seconds a connection is idle before
+            TCP keepalive probes are sent, or None to disable TCP keepalive.
+        :param kwds: optional arguments for `AbstractClient`, such as `decode`.
         """
-        super(Client, self).__init__(endpoint)
+        super(Client, self).__init__(endpoint, **kwds)
+        self.timeout = timeout
         self.session = requests.Session()
+        socket_options = None if keepalive is None else keepalive_options(keepalive)
+        adapter = KeepAliveAdapter(socket_options, pool_connections=pool_connections,
+                                   pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def close(self):
+        """
+        Close the session's pooled connections.
+        """
+        self.session.close()
 
     def call(self, payload):
         """
-        Make calls to the API via the HTTP POST method and JSON payload.
+        Make calls to the API via the HTTP POST method and JSON payload,
+        retrying failures if the retry policy allows.
+        :return: response object
+        """
+        if self.retry is not None and self.retry.retryable(self, payload):
+            return self.retry.call(self.send, payload)
+        return self.send(payload)
+
+    def send(self, payload):
+        """
+        Send a JSON payload once, waiting for the rate limiter if set.
         :return: response object
         """
-        return self.session.post(self.endpoint, json=payload)
+        if self.limiter is None:
+            return self.post(payload)
+        return self.limiter.call(self, self.post, payload)
+
+    def post(self, payload):
+        """
+        Send a JSON payload in a single HTTP POST request.
+        :return: response object
+        """
+        data = self.codec.dumps(payload)
+        return self.session.post(self.endpoint, data=data, headers=JSON_HEADERS,
+                                 timeout=self.timeout)
+
+    def call_stream(self, payload):
+        """
+        Make calls to the API via the HTTP POST method and JSON payload,
+        without buffering the response body.
+        :return: generator over chunks of the response body
+        """
+        data = self.codec.dumps(payload)
+        response = self.session.post(self.endpoint, data=data, headers=JSON_HEADERS,
+                                     stream=True, timeout=self.timeout)
+        try:
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                yield chunk
+        finally:
+            response.close()
 
     def __del__(self):
         self.session.close()
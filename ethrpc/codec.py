@@ -0,0 +1,91 @@
+'''
+    codec
+    -----
+
+    JSON codecs for encoding request payloads and decoding responses.
+
+    Large responses, such as traces, spend most of their time in JSON
+    parsing, so the fastest installed library is selected by default:
+    `orjson`, `rapidjson`, `ujson`, and finally the standard library.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'get_codec',
+    'Codec',
+    'CODECS',
+    'DEFAULT_CODEC',
+]
+
+import collections
+import json
+
+# Codec with a name, `dumps` serializing an object to UTF-8 bytes, and
+# `loads` parsing bytes or text.
+Codec = collections.namedtuple('Codec', 'name dumps loads')
+
+
+def json_loads(data):
+    '''Parse JSON bytes or text with the standard library.'''
+
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+CODECS = collections.OrderedDict()
+
+try:
+    import orjson
+    CODECS['orjson'] = Codec('orjson', orjson.dumps, orjson.loads)
+except ImportError:
+    pass
+
+try:
+    import rapidjson
+    CODECS['rapidjson'] = Codec(
+        'rapidjson',
+        lambda obj: rapidjson.dumps(obj).encode('utf-8'),
+        rapidjson.loads
+    )
+except ImportError:
+    pass
+
+try:
+    import ujson
+    CODECS['ujson'] = Codec(
+        'ujson',
+        lambda obj: ujson.dumps(obj).encode('utf-8'),
+        ujson.loads
+    )
+except ImportError:
+    pass
+
+CODECS['json'] = Codec(
+    'json',
+    lambda obj: json.dumps(obj, separators=(',', ':')).encode('utf-8'),
+    json_loads
+)
+
+DEFAULT_CODEC = next(iter(CODECS.values()))
+
+
+def get_codec(codec=None):
+    """
+    Get codec by name, or the fastest installed codec.
+
+    :param codec: (optional) codec name or `Codec` instance.
+    """
+    if codec is None:
+        return DEFAULT_CODEC
+    elif isinstance(codec, Codec):
+        return codec
+    try:
+        return CODECS[codec]
+    except KeyError:
+        raise ValueError("Codec {} is not installed.".format(codec))
@@ -0,0 +1,253 @@
+'''
+    columnar
+    --------
+
+    Columnar decoding of blocks and transactions into NumPy arrays.
+
+    A batch of undecoded results, such as blocks from `iter_blocks` on a
+    client without `decode`, is converted to a structured array with a
+    field per column: `uint64` for quantities such as gas and
+    timestamps, fixed-width bytes for hashes and addresses, and four
+    64-bit limbs for 256-bit quantities such as values and fees. Hex parsing is
+    vectorized over the whole column, so aggregations over a range of
+    blocks avoid converting each field in Python.
+    Requires `pip install numpy`.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'block_columns',
+    'columns',
+    'hex_to_bytes',
+    'hex_to_uint64',
+    'hex_to_uint256',
+    'transaction_columns',
+    'uint256_to_float',
+    'uint256_to_int',
+    'BLOCK_COLUMNS',
+    'Column',
+    'TRANSACTION_COLUMNS',
+]
+
+import collections
+import functools
+import numpy as np
+
+# Column of a structured array, with the field name, the key of the
+# JSON object, the NumPy dtype, and `convert` creating the column from
+# a list of JSON values.
+Column = collections.namedtuple('Column', 'name key dtype convert')
+
+# Value of each ASCII hex digit, and 255 for other characters. Strings
+# are right-aligned with spaces to a fixed width, so the spaces and the
+# '0x' prefix are leading zeros.
+HEX_DIGITS = np.full(256, 255, dtype=np.uint8)
+for index, digit in enumerate(bytearray(b'0123456789abcdef')):
+    HEX_DIGITS[digit] = index
+for index, digit in enumerate(bytearray(b'ABCDEF')):
+    HEX_DIGITS[digit] = index + 10
+HEX_DIGITS[bytearray(b' xX')] = 0
+
+SPACE, ZERO, X = bytearray(b' 0x')
+
+
+def hex_bytes(values, size):
+    """
+    Convert hex strings to fixed-width big-endian bytes, left-padded
+    with zeros, parsing every string at once.
+    :return: `(len(values), size)` array of `uint8`.
+
+    :param values: list of `0x`-prefixed hex strings, None for zero.
+    :param size: number of bytes.
+    """
+    if None in values:
+        values = ['0x0' if i is None else i for i in values]
+    count = len(values)
+    width = 2 * size + 2
+    if count == 0:
+        return np.zeros((0, size), dtype=np.uint8)
+
+    # right-align every string in a single buffer, with one row per value
+    try:
+        text = (('%{}s'.format(width)) * count % tuple(values)).encode('ascii')
+    except UnicodeError:
+        raise ValueError("Invalid hex digit.")
+    chars = np.frombuffer(text, dtype=np.uint8)
+    if chars.size != count * width:
+        raise ValueError("Hex value exceeds {} bytes.".format(size))
+    chars = chars.reshape(count, width)
+
+    # each row is leading spaces, '0x', and the digits, so the only
+    # spaces are leading and there is one 'x' per row
+    rows = np.arange(count)
+    leading = np.minimum((chars != SPACE).argmax(axis=1), width - 2)
+    lower = chars | 0x20
+    valid = (chars[rows, leading] == ZERO) & (lower[rows, leading + 1] == X)
+    if not (valid.all() and np.count_nonzero(chars == SPACE) == leading.sum()
+            and np.count_nonzero(lower == X) == count):
+        raise ValueError("Hex values must start with '0x', use a client without `decode`.")
+
+    digits = np.take(HEX_DIGITS, chars[:, 2:])
+    if (digits == 255).any():
+        raise ValueError("Invalid hex digit.")
+    return (digits[:, 0::2] << 4) | digits[:, 1::2]
+
+
+def hex_to_uint64(values):
+    """
+    Convert hex quantities below 2**64 to integers.
+    :return: `uint64` array.
+
+    :param values: list of `0x`-prefixed hex strings, None for zero.
+    """
+    data = np.ascontiguousarray(hex_bytes(values, 8))
+    return data.view('>u8').astype(np.uint64).reshape(len(values))
+
+
+def hex_to_uint256(values):
+    """
+    Convert hex quantities below 2**256 to 64-bit limbs.
+    :return: `(len(values), 4)` array of `uint64` limbs, least
+        significant first.
+
+    :param values: list of `0x`-prefixed hex strings, None for zero.
+    """
+    data = np.ascontiguousarray(hex_bytes(values, 32))
+    limbs = data.view('>u8').astype(np.uint64)
+    return np.ascontiguousarray(limbs[:, ::-1])
+
+
+def hex_to_bytes(values, size):
+    """
+    Convert hex data to fixed-width bytes, left-padded with zeros.
+    NumPy drops trailing zero bytes when reading single items, so view
+    a contiguous copy as `np.uint8` for the exact bytes.
+    :return: array of `size`-byte strings.
+
+    :param values: list of `0x`-prefixed hex strings, None for zero bytes.
+    :param size: number of bytes.
+    """
+    data = np.ascontiguousarray(hex_bytes(values, size))
+    return data.view('S{}'.format(size)).reshape(len(values))
+
+
+def uint256_to_float(limbs):
+    """
+    Convert 64-bit limbs to approximate floating-point values.
+    :return: `float64` array.
+
+    :param limbs: `(n, 4)` array of `uint64` limbs, least significant first.
+    """
+    scale = np.array([2.0 ** 0, 2.0 ** 64, 2.0 ** 128, 2.0 ** 192])
+    return limbs.astype(np.float64).dot(scale)
+
+
+def uint256_to_int(limbs):
+    """
+    Convert 64-bit limbs to exact Python integers.
+    :return: object array of integers.
+
+    :param limbs: `(n, 4)` array of `uint64` limbs, least significant first.
+    """
+    result = np.empty(len(limbs), dtype=object)
+    for index, row in enumerate(limbs.tolist()):
+        result[index] = row[0] | (row[1] << 64) | (row[2] << 128) | (row[3] << 192)
+    return result
+
+
+def uint64(name, key):
+    '''Create column for a quantity below 2**64.'''
+
+    return Column(name, key, np.uint64, hex_to_uint64)
+
+
+def uint256(name, key):
+    '''Create column for a 256-bit quantity, as 64-bit limbs.'''
+
+    return Column(name, key, (np.uint64, (4,)), hex_to_uint256)
+
+
+def data(name, key, size):
+    '''Create column for fixed-width data, such as a hash or address.'''
+
+    return Column(name, key, 'S{}'.format(size), functools.partial(hex_to_bytes, size=size))
+
+
+BLOCK_COLUMNS = (
+    uint64('number', 'number'),
+    data('hash', 'hash', 32),
+    data('parent_hash', 'parentHash', 32),
+    data('miner', 'miner', 20),
+    uint64('timestamp', 'timestamp'),
+    uint64('size', 'size'),
+    uint64('gas_limit', 'gasLimit'),
+    uint64('gas_used', 'gasUsed'),
+    uint256('base_fee_per_gas', 'baseFeePerGas'),
+    uint256('difficulty', 'difficulty'),
+    uint256('total_difficulty', 'totalDifficulty'),
+)
+
+TRANSACTION_COLUMNS = (
+    uint64('block_number', 'blockNumber'),
+    uint64('transaction_index', 'transactionIndex'),
+    data('hash', 'hash', 32),
+    data('from_', 'from', 20),
+    data('to', 'to', 20),
+    uint64('nonce', 'nonce'),
+    uint64('type', 'type'),
+    uint64('gas', 'gas'),
+    uint256('gas_price', 'gasPrice'),
+    uint256('max_fee_per_gas', 'maxFeePerGas'),
+    uint256('max_priority_fee_per_gas', 'maxPriorityFeePerGas'),
+    uint256('value', 'value'),
+)
+
+
+def columns(objects, spec):
+    """
+    Convert JSON objects to a structured array, converting each column
+    at once. Missing fields, such as `to` for contract creations, are
+    zero.
+    :return: structured array with a field per column.
+
+    :param objects: list of undecoded JSON objects.
+    :param spec: sequence of `Column`.
+    """
+    result = np.zeros(len(objects), dtype=[(i.name, i.dtype) for i in spec])
+    for column in spec:
+        result[column.name] = column.convert([i.get(column.key) for i in objects])
+    return result
+
+
+def block_columns(blocks, spec=BLOCK_COLUMNS):
+    """
+    Convert blocks to a structured array.
+
+        >>> blocks = block_columns(list(client.iter_blocks(15000000, 15009999)))
+        >>> blocks['gas_used'].mean()
+
+    :param blocks: list of undecoded blocks.
+    :param spec: (optional) sequence of `Column`.
+    """
+    return columns(blocks, spec)
+
+
+def transaction_columns(transactions, spec=TRANSACTION_COLUMNS):
+    """
+    Convert transactions to a structured array.
+
+    :param transactions: list of undecoded transactions, or of blocks
+        with full transaction objects, whose transactions are joined.
+    :param spec: (optional) sequence of `Column`.
+    """
+    if transactions and isinstance(transactions[0], dict) and 'transactions' in transactions[0]:
+        transactions = [i for block in transactions for i in block['transactions']]
+    # blocks fetched without full transactions only list hashes
+    if not all(isinstance(i, dict) for i in transactions):
+        raise ValueError("Transactions must be objects, fetch blocks with `full_transactions`.")
+    return columns(transactions, spec)
@@ -23,19 +23,39 @@ __all__ = [
     'DEFAULT_BLOCK',
     'DEFAULT_HOST',
     'DEFAULT_HTTP_PORT',
+    'DEFAULT_IPC_PATH',
+    'DEFAULT_MAX_BATCH_SIZE',
+    'DEFAULT_PREFETCH',
     'DEFAULT_WS_PORT',
+    'IDEMPOTENT_METHODS',
     'LOCALHOST_HTTP_ENDPOINT',
+    'LOCALHOST_WS_ENDPOINT',
     'AbstractClient',
 ]
 
 import abc
 import binascii
+import collections
+import concurrent.futures
 import functools
+import itertools
+import multiprocessing
+import os
 import six
 import textwrap
+import threading
 import warnings
 from bidict import bidict
 from Crypto.Hash import keccak
+from .batch import Batch
+from .cache import request_key
+from .codec import get_codec
+from .decode import (DECODERS, RPCError, decode as decode_response, decode_batch,
+                     unwrap_batch)
+from .fanout import DEFAULT_WORKERS, imap
+from .logs import DEFAULT_LOGS_CONCURRENCY, DEFAULT_LOGS_WINDOW, LogWindow
+from .models import quantity
+from .stream import STREAM_PATHS, iter_stream
 
 # HELPERS
 
@@ -171,9 +191,15 @@ DEFAULT_APIS = 'eth,net,web3'
 DEFAULT_BLOCK = 'latest'
 DEFAULT_CORS = ''
 DEFAULT_HTTP_PORT = 8545
+DEFAULT_MAX_BATCH_SIZE = 100
+DEFAULT_PREFETCH = 100
+DECODE_AHEAD = multiprocessing.cpu_count()
 DEFAULT_WS_PORT = 8546
 DEFAULT_HOST = "localhost"
+JSON_HEADERS = {'Content-Type': 'application/json'}
+DEFAULT_IPC_PATH = os.path.join(os.path.expanduser('~'), '.ethereum', 'geth.ipc')
 LOCALHOST_HTTP_ENDPOINT = 'localhost:8545'
+LOCALHOST_WS_ENDPOINT = 'ws://localhost:8546'
 
 
 def map_position(key, position):
@@ -206,14 +232,44 @@ class AbstractClient():
     """
 
     __method_table = bidict()
+    __params_table = {}
+    batch_type = Batch
+    max_batch_size = DEFAULT_MAX_BATCH_SIZE
 
-    def __init__(self, endpoint):
+    def __init__(self, endpoint, decode=False, codec=None, cache=None,
+                 coalesce=False, retry=None, limiter=None):
         """
         Initialize client.
 
         :param endpoint: address of the Ethereum RPC.
+        :param decode: return decoded results, rather than responses.
+            Either `True` to use `DECODERS`, or a custom table of
+            decoders by Python API method name, such as `MODEL_DECODERS`.
+        :param codec: (optional) JSON codec name or `Codec`, defaulting
+            to the fastest installed codec.
+        :param cache: (optional) `ResponseCache` for results. Since
+            cached responses have no response object, only results are
+            cached: from `fetch`, and from API methods if `decode` is set.
+        :param coalesce: share a single request between identical calls
+            to methods in `IDEMPOTENT_METHODS` made while the request is
+            in flight. Like the cache, only applies to results, and the
+            callers receive the same result object. Without `decode`,
+            API methods return response objects and are not coalesced.
+        :param retry: (optional) `RetryPolicy` for calls to idempotent
+            methods failing with a transport error or HTTP status.
+        :param limiter: (optional) `RateLimiter` for requests.
         """
         self.endpoint = endpoint
+        self.decode = decode
+        self.codec = get_codec(codec)
+        self.cache = cache
+        self.coalesce = coalesce
+        self.retry = retry
+        self.limiter = limiter
+        self.flights = {}
+        self.flights_lock = threading.Lock()
+        self.inflight = {}
+        self.__ids = itertools.count(1)
 
     @abc.abstractmethod
     def call(self, payload):
@@ -225,6 +281,93 @@ class AbstractClient():
         :param payload: POST JSON data.
         """
 
+    def next_id(self):
+        """
+        Get a unique, monotonically increasing request id for the client.
+        Advancing the counter is atomic, so no lock is required.
+        """
+        return next(self.__ids)
+
+    def register_future(self, id_, future):
+        """
+        Track a future awaiting the response for an in-flight request,
+        so responses can be matched out of order.
+
+        :param id_: request id.
+        :param future: future, resolved with the JSON response object.
+        """
+        self.inflight[id_] = future
+
+    def resolve_future(self, body):
+        """
+        Resolve the in-flight future matching a response's request id.
+        :return: if a matching future was found.
+
+        :param body: JSON response object.
+        """
+        future = self.inflight.pop(body.get('id'), None)
+        if future is None:
+            return False
+        if not future.done():
+            future.set_result(body)
+        return True
+
+    def fail_futures(self, exception):
+        """
+        Fail all in-flight futures, for example if the connection closes.
+
+        :param exception: exception to set on each future.
+        """
+        inflight = self.inflight
+        self.inflight = {}
+        for future in inflight.values():
+            if not future.done():
+                future.set_exception(exception)
+
+    def parse(self, response):
+        """
+        Parse the JSON body from a response returned by `call`.
+        Overridden by clients whose transport returns a different
+        response type.
+
+        :param response: response object returned by `call`.
+        """
+        return self.codec.loads(self.content(response))
+
+    def content(self, response):
+        """
+        Get the raw JSON body from a response returned by `call`.
+        Overridden by clients whose transport returns a different
+        response type.
+
+        :param response: response object returned by `call`.
+        """
+        return response.content
+
+    def params(self, name, *args, **kwds):
+        """
+        Get the formatted parameter list for a JSON-RPC call, without
+        making the call.
+
+        :param name: Python or JSON-RPC API method name.
+        :param args: positional arguments for the method.
+        :param kwds: keyword arguments for the method.
+        """
+        impl_method = self.__params_table[self.python_name(name)]
+        return impl_method(self, *args, **kwds)
+
+    def batch(self, max_batch_size=None):
+        """
+        Create a batch to send multiple calls in a single JSON-RPC
+        request. Batches larger than `max_batch_size` are split into
+        multiple requests.
+
+        :param max_batch_size: (optional) maximum calls per request.
+        """
+        if max_batch_size is None:
+            max_batch_size = self.max_batch_size
+        return self.batch_type(self, max_batch_size)
+
     def rpc_name(self, name):
         """
         Get JSON-RPC API method name.
@@ -233,6 +376,15 @@ class AbstractClient():
         """
         return self.__method_table.get(name, name)
 
+    def has_method(self, name):
+        """
+        Get if the name is a Python or JSON-RPC API method name.
+
+        :param name: Python or JSON-RPC API method name.
+        """
+        table = self.__method_table
+        return name in table or name in table.inv
+
     def python_name(self, name):
         """
         Get Python API method name.
@@ -241,32 +393,384 @@ class AbstractClient():
         """
         return self.__method_table.inv.get(name, name)
 
-    # PRIVATE
-
-    def __call(self, method, id_, params):
+    def payload(self, method, params):
         """
-        Implied call to the JSON RPC via a POST with a JSON payload.
+        Get the JSON payload for a single method, with a new request id.
 
-        :param payload: RPC method name.
-        :param id_: Integer method identifier.
+        :param method: RPC method name.
         :param params: Parameter list for method call.
         """
-        payload = {
+        return {
             "jsonrpc": "2.0",
             "method": method,
             "params": params,
-            "id": id_
+            "id": self.next_id()
         }
-        return self.call(payload)
+
+    def request(self, method, params):
+        """
+        Call the JSON RPC with a JSON payload for a single method.
+        All generated API methods dispatch through `request`.
+        :return: response object, or the decoded result if `decode`
+            is set.
+
+        :param method: RPC method name.
+        :param params: Parameter list for method call.
+        """
+        if self.decode:
+            return self.fetch(method, params)
+        return self.call(self.payload(method, params))
+
+    def fetch(self, method, params):
+        """
+        Call the JSON RPC for a single method, regardless of `decode`.
+        :return: result of the response, decoded if `decode` is set,
+            or raise `RPCError`.
+
+        :param method: RPC method name.
+        :param params: Parameter list for method call.
+        """
+        if self.coalesce and self.python_name(method) in IDEMPOTENT_METHODS:
+            return self.coalesced(method, params)
+        return self.unwrap(method, self.response_body(method, params))
+
+    def coalesced(self, method, params):
+        """
+        Fetch the result for a call, sharing the request with identical
+        calls from other threads while it is in flight.
+        :return: result of the response, or raise `RPCError`.
+
+        :param method: RPC method name.
+        :param params: Parameter list for method call.
+        """
+        key = request_key(method, params)
+        with self.flights_lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = concurrent.futures.Future()
+        if not leader:
+            return flight.result()
+
+        try:
+            flight.set_result(self.unwrap(method, self.response_body(method, params)))
+        except Exception as error:
+            flight.set_exception(error)
+        except BaseException:
+            # fail the waiting threads rather than leave them blocked
+            flight.set_exception(RuntimeError("Coalesced request was interrupted."))
+            raise
+        finally:
+            with self.flights_lock:
+                del self.flights[key]
+        return flight.result()
+
+    def response_body(self, method, params):
+        """
+        Call the JSON RPC for a single method, and parse the response
+        body, using the cache if set.
+        :return: JSON response object.
+
+        :param method: RPC method name.
+        :param params: Parameter list for method call.
+        """
+        name = self.python_name(method)
+        cache = self.cache
+        if cache is None or not cache.cacheable(name):
+            return self.parse(self.call(self.payload(method, params)))
+
+        key = cache.key(method, params)
+        value = cache.get(key)
+        if value is not None:
+            return self.codec.loads(value)
+        body = self.parse(self.call(self.payload(method, params)))
+        transaction = cache.transaction(name, params, body)
+        receipt = None
+        if transaction is not None:
+            receipt = self.response_body('eth_getTransactionReceipt', [transaction]).get('result')
+        policy = cache.policy(name, params, body, receipt)
+        if policy is not None:
+            ttl, block = policy
+            if block is None or block <= self.confirmed_block():
+                cache.set(key, self.codec.dumps(body), ttl)
+        return body
+
+    def confirmed_block(self):
+        """
+        Get the latest block with enough confirmations to be cached.
+        """
+        head = quantity(self.fetch('eth_blockNumber', []))
+        return head - self.cache.confirmations
+
+    def iter_method(self, name, args, prefetch=DEFAULT_PREFETCH,
+                    executor=None, record=None):
+        """
+        Call a method with each set of arguments, iterating over the
+        results in order. Calls are requested `prefetch` at a time, in
+        batches, and the next batch is only requested once the consumer
+        has used the previous one.
+
+        With an `executor`, such as a `ProcessPoolExecutor`, the raw
+        response bodies are parsed and decoded by the executor, so
+        CPU-bound decoding scales with cores. Batches are then requested
+        ahead of the consumer while earlier batches are decoded, up to
+        one per CPU. The client's cache and coalescing are not used.
+        Responses from transports which parse on receipt, such as IPC,
+        are decoded in the calling thread.
+
+        :param name: Python or JSON-RPC API method name.
+        :param args: iterable of argument tuples, one per call.
+        :param prefetch: number of calls requested at a time.
+        :param executor: (optional) executor to parse and decode responses.
+        :param record: (optional) picklable function converting each
+            result to a compact record, called by the executor if set.
+        """
+        name = self.python_name(name)
+        method = self.rpc_name(name)
+        decode = self.worker_decode(name)
+        args = iter(args)
+        pending = collections.deque()
+        try:
+            while True:
+                group = list(itertools.islice(args, prefetch))
+                if not group:
+                    break
+                batch = self.batch()
+                calls = [batch.add(method, self.params(name, *i)) for i in group]
+                if executor is None:
+                    batch.execute()
+                    for call in calls:
+                        result = batch.unwrap(call)
+                        yield result if record is None else record(result)
+                    continue
+
+                for chunk in batch.chunks():
+                    response = self.call(batch.payload(chunk))
+                    ids = [i.id for i in chunk]
+                    if isinstance(response, (dict, list)):
+                        # transports which parse on receipt, such as IPC,
+                        # would only serialize the body for the executor
+                        future = concurrent.futures.Future()
+                        future.set_result(unwrap_batch(name, ids, response, self.decode, record))
+                        pending.append(future)
+                        continue
+                    data = self.content(response)
+                    pending.append(executor.submit(decode_batch, name, ids, data,
+                                                   self.codec.name, decode, record))
+                while len(pending) > DECODE_AHEAD:
+                    for result in pending.popleft().result():
+                        if isinstance(result, Exception):
+                            raise result
+                        yield result
+
+            while pending:
+                for result in pending.popleft().result():
+                    if isinstance(result, Exception):
+                        raise result
+                    yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def worker_decode(self, name):
+        """
+        Get the `decode` argument to decode results for a method in
+        another process, with only the decoder for the method from a
+        custom table, which must be picklable.
+
+        :param name: Python API method name.
+        """
+        if not isinstance(self.decode, dict):
+            return self.decode
+        decoder = self.decode.get(name)
+        if decoder is DECODERS.get(name):
+            return True
+        return {name: decoder}
+
+    def iter_blocks(self, start, end, full_transactions=False,
+                    prefetch=DEFAULT_PREFETCH, executor=None, record=None):
+        """
+        Iterate over a range of blocks, in order, using `iter_method`.
+
+        :param start: first block number.
+        :param end: last block number (inclusive).
+        :param full_transactions: return full transaction objects.
+        :param prefetch: number of blocks requested at a time.
+        :param executor: (optional) executor to parse and decode responses.
+        :param record: (optional) picklable function converting each
+            block to a compact record.
+        """
+        args = ((i, full_transactions) for i in range(start, end + 1))
+        return self.iter_method('eth_get_block_by_number', args, prefetch, executor, record)
+
+    def iter_block_traces(self, start, end, prefetch=DEFAULT_PREFETCH,
+                          executor=None, record=None):
+        """
+        Iterate over the traces of a range of blocks, using `trace_block`,
+        yielding the list of traces for each block, in order.
+
+        :param start: first block number.
+        :param end: last block number (inclusive).
+        :param prefetch: number of blocks requested at a time.
+        :param executor: (optional) executor to parse and decode responses.
+        :param record: (optional) picklable function converting the
+            traces of each block to a compact record.
+        """
+        args = ((i,) for i in range(start, end + 1))
+        return self.iter_method('trace_block', args, prefetch, executor, record)
+
+    def get_logs_range(self, from_block, to_block, address=None, topics=None,
+                       window=DEFAULT_LOGS_WINDOW,
+                       concurrency=DEFAULT_LOGS_CONCURRENCY):
+        """
+        Iterate over the logs matching a filter over a range of blocks,
+        in block order. The range is queried `concurrency` sub-ranges at
+        a time, in batches. Sub-ranges which fail for returning too many
+        results or timing out are bisected, and the window grows while
+        results are sparse.
+
+        :param from_block: first block number.
+        :param to_block: last block number (inclusive).
+        :param address: (optional) contract address or list of addresses.
+        :param topics: (optional) list of `DATA` topics.
+        :param window: initial number of blocks per query.
+        :param concurrency: number of sub-ranges queried at a time, with
+            at most twice as many fetched ahead of the logs yielded.
+        """
+        planner = LogWindow(from_block, to_block, window, max_ranges=2 * concurrency)
+        while not planner.done():
+            ranges = planner.pending(concurrency)
+            batch = self.batch()
+            calls = [batch.eth_get_logs(i.start, i.end, address, topics) for i in ranges]
+            try:
+                batch.execute()
+            except Exception as error:
+                for log_range in ranges:
+                    planner.fail(log_range, error)
+                continue
+
+            for log_range, call in zip(ranges, calls):
+                try:
+                    logs = batch.unwrap(call)
+                except Exception as error:
+                    planner.fail(log_range, error)
+                else:
+                    planner.complete(log_range, logs)
+            for log in planner.consume():
+                yield log
+
+    def call_stream(self, payload):
+        """
+        Make calls to the API with a JSON payload, returning an iterator
+        over the chunks of the response body. By default, the response
+        is buffered and yielded as a single chunk. Overridden by clients
+        whose transport supports streaming responses.
+
+        :param payload: POST JSON data.
+        """
+        yield self.content(self.call(payload))
+
+    def stream_request(self, method, params, path):
+        """
+        Call the JSON RPC, and parse the response incrementally.
+        :return: generator over the values at path within the result.
+
+        :param method: RPC method name.
+        :param params: Parameter list for method call.
+        :param path: sequence of object keys, array indexes, or '*'.
+        """
+        return iter_stream(self.call_stream(self.payload(method, params)), path)
+
+    def stream(self, name, *args, **kwds):
+        """
+        Call an API method, yielding elements of the result as they are
+        parsed, for methods in `STREAM_PATHS` with large results.
+        For example, `debug_trace_transaction` yields each struct log.
+
+        :param name: Python or JSON-RPC API method name.
+        :param args: positional arguments for the method.
+        :param kwds: keyword arguments for the method.
+        """
+        path = STREAM_PATHS[self.python_name(name)]
+        params = self.params(name, *args, **kwds)
+        return self.stream_request(self.rpc_name(name), params, path)
+
+    def map(self, method, iterable, workers=DEFAULT_WORKERS, ordered=True,
+            max_pending=None, executor=None):
+        """
+        Call an API method with each argument from a thread pool, sharing
+        the client's connections. The connection pool should hold at
+        least `workers` connections, or calls wait for a connection.
+        :return: generator over the results, in input order if `ordered`.
+
+            >>> blocks = client.map('eth_get_block_by_number', range(100), workers=8)
+
+        :param method: Python or JSON-RPC API method name, or a function
+            of a single argument.
+        :param iterable: arguments, one per call, consumed lazily.
+        :param workers: number of threads.
+        :param ordered: yield results in input order, otherwise in
+            completion order.
+        :param max_pending: (optional) maximum outstanding calls,
+            defaults to twice `workers`.
+        :param executor: (optional) executor shared between calls.
+        """
+        if isinstance(method, six.string_types):
+            method = getattr(self, self.python_name(method))
+        return imap(method, iterable, workers, ordered, max_pending, executor)
+
+    def imap_unordered(self, method, iterable, workers=DEFAULT_WORKERS,
+                       max_pending=None, executor=None):
+        """
+        Call an API method with each argument from a thread pool.
+        :return: generator over the results, in completion order.
+
+        :param method: Python or JSON-RPC API method name, or a function
+            of a single argument.
+        :param iterable: arguments, one per call, consumed lazily.
+        :param workers: number of threads.
+        :param max_pending: (optional) maximum outstanding calls,
+            defaults to twice `workers`.
+        :param executor: (optional) executor shared between calls.
+        """
+        return self.map(method, iterable, workers, False, max_pending, executor)
+
+    def unwrap(self, method, body):
+        """
+        Get the result of a response body, decoded if `decode` is set.
+        :return: result, or raise `RPCError`.
+
+        :param method: Python or JSON-RPC API method name.
+        :param body: JSON response object.
+        """
+        if self.decode:
+            return self.decode_body(method, body)
+        elif 'error' in body:
+            raise RPCError.from_body(body)
+        return body.get('result')
+
+    def decode_body(self, method, body):
+        """
+        Decode the response body for a method, using the per-method
+        decoders in `ethrpc.decode.DECODERS`, or the table set by
+        `decode`.
+        :return: decoded result, or raise `RPCError`.
+
+        :param method: Python or JSON-RPC API method name.
+        :param body: JSON response object.
+        """
+        decoders = self.decode if isinstance(self.decode, dict) else DECODERS
+        return decode_response(self.python_name(method), body, decoders)
+
+    # PRIVATE
 
     @classmethod
-    def __method(cls, python_name, rpc_name, rpc_id):
+    def __method(cls, python_name, rpc_name):
         """
         Wrap JSON-RPC method using decorator-like syntax.
 
         :param python_name: variable name for Python.
         :param rpc_name: 'method' parameter for RPC call.
-        :param rpc_id: 'id' parameter for RPC call.
         """
 
         # store a bidirectional mapping of the Python and RPC names
@@ -275,10 +779,12 @@ class AbstractClient():
 
         # wrap our implied method
         impl_method = getattr(cls, '_{0}__{1}'.format(cls.__name__, python_name))
+        params_table = getattr(cls, '_{0}__params_table'.format(cls.__name__))
+        params_table[python_name] = impl_method
 
         def f(self, *args, **kwds):
             params = impl_method(self, *args, **kwds)
-            return self.__call(rpc_name, rpc_id, params)
+            return self.request(rpc_name, params)
 
         # make the method look native
         f.__name__ = python_name
@@ -954,7 +1460,7 @@ class AbstractClient():
 
     def parity_accounts_info(self, *args, **kwds):
         params = self.__parity_accounts_info(*args, **kwds)
-        return self.__call("parity_accountsInfo", 1, params)
+        return self.request("parity_accountsInfo", params)
 
     def __parity_chain(self):
         """
@@ -2865,249 +3371,308 @@ class AbstractClient():
 
 
 CLIENT_METHODS = [
-    ('web3_client_version', 'web3_clientVersion', 67),
-    ('web3_sha3', 'web3_sha3', 64),
-    ('net_listening', 'net_listening', 67),
-    ('net_peer_count', 'net_peerCount', 74),
-    ('net_version', 'net_version', 67),
-    ('eth_accounts', 'eth_accounts', 1),
-    ('eth_block_number', 'eth_blockNumber', 83),
-    ('eth_call', 'eth_call', 1),
-    ('eth_coinbase', 'eth_coinbase', 64),
-    ('eth_compile_lll', 'eth_compileLLL', 1),
-    ('eth_compile_serpent', 'eth_compileSerpent', 1),
-    ('eth_compile_solidity', 'eth_compileSolidity', 1),
-    ('eth_estimate_gas', 'eth_estimateGas', 1),
-    ('eth_gas_price', 'eth_gasPrice', 73),
-    ('eth_get_balance', 'eth_getBalance', 1),
-    ('eth_get_block_by_hash', 'eth_getBlockByHash', 1),
-    ('eth_get_block_by_number', 'eth_getBlockByNumber', 1),
-    ('eth_get_block_transaction_count_by_hash', 'eth_getBlockTransactionCountByHash', 1),
-    ('eth_get_block_transaction_count_by_number', 'eth_getBlockTransactionCountByNumber', 1),
-    ('eth_get_code', 'eth_getCode', 1),
-    ('eth_get_compilers', 'eth_getCompilers', 1),
-    ('eth_get_filter_changes', 'eth_getFilterChanges', 73),
-    ('eth_get_filter_logs', 'eth_getFilterLogs', 73),
-    ('eth_get_logs', 'eth_getLogs', 73),
-    ('eth_get_storage_at', 'eth_getStorageAt', 1),
-    ('eth_get_transaction_by_block_hash_and_index', 'eth_getTransactionByBlockHashAndIndex', 1),
-    ('eth_get_transaction_by_block_number_and_index', 'eth_getTransactionByBlockNumberAndIndex', 1),
-    ('eth_get_transaction_by_hash', 'eth_getTransactionByHash', 1),
-    ('eth_get_transaction_count', 'eth_getTransactionCount', 1),
-    ('eth_get_transaction_receipt', 'eth_getTransactionReceipt', 1),
-    ('eth_get_uncle_by_block_hash_and_index', 'eth_getUncleByBlockHashAndIndex', 1),
-    ('eth_get_uncle_by_block_number_and_index', 'eth_getUncleByBlockNumberAndIndex', 1),
-    ('eth_get_uncle_count_by_block_hash', 'eth_getUncleCountByBlockHash', 1),
-    ('eth_get_uncle_count_by_block_number', 'eth_getUncleCountByBlockNumber', 1),
-    ('eth_get_work', 'eth_getWork', 73),
-    ('eth_hashrate', 'eth_hashrate', 71),
-    ('eth_mining', 'eth_mining', 71),
-    ('eth_new_block_filter', 'eth_newBlockFilter', 73),
-    ('eth_new_filter', 'eth_newFilter', 73),
-    ('eth_new_pending_transaction_filter', 'eth_newPendingTransactionFilter', 73),
-    ('eth_protocol_version', 'eth_protocolVersion', 67),
-    ('eth_send_raw_transaction', 'eth_sendRawTransaction', 1),
-    ('eth_send_transaction', 'eth_sendTransaction', 1),
-    ('eth_sign', 'eth_sign', 1),
-    ('eth_sign_transaction', 'eth_signTransaction', 1),
-    ('eth_submit_hashrate', 'eth_submitHashrate', 73),
-    ('eth_submit_work', 'eth_submitWork', 73),
-    ('eth_syncing', 'eth_syncing', 1),
-    ('eth_uninstall_filter', 'eth_uninstallFilter', 73),
-    ('eth_subscribe', 'eth_subscribe', 1),
-    ('eth_unsubscribe', 'eth_unsubscribe', 1),
-    ('personal_ec_recover', 'personal_ecRecover', 1),
-    ('personal_import_raw_key', 'personal_importRawKey', 1),
-    ('personal_list_accounts', 'personal_listAccounts', 1),
-    ('personal_lock_account', 'personal_lockAccount', 1),
-    ('personal_new_account', 'personal_newAccount', 1),
-    ('personal_send_transaction', 'personal_sendTransaction', 1),
-    ('personal_sign', 'personal_sign', 1),
-    ('personal_unlock_account', 'personal_unlockAccount', 1),
-    ('parity_accounts_info', 'parity_accountsInfo', 1),
-    ('parity_chain', 'parity_chain', 1),
-    ('parity_chain_status', 'parity_chainStatus', 1),
-    ('parity_change_vault', 'parity_changeVault', 1),
-    ('parity_change_vault_password', 'parity_changeVaultPassword', 1),
-    ('parity_check_request', 'parity_checkRequest', 1),
-    ('parity_cid_v0', 'parity_cidV0', 1),
-    ('parity_close_vault', 'parity_closeVault', 1),
-    ('parity_compose_transaction', 'parity_composeTransaction', 1),
-    ('parity_consensus_capability', 'parity_consensusCapability', 1),
-    ('parity_dapps_url', 'parity_dappsUrl', 1),
-    ('parity_decrypt_message', 'parity_decryptMessage', 1),
-    ('parity_default_account', 'parity_defaultAccount', 1),
-    ('parity_default_extra_data', 'parity_defaultExtraData', 1),
-    ('parity_dev_logs', 'parity_devLogs', 1),
-    ('parity_dev_logs_levels', 'parity_devLogsLevels', 1),
-    ('parity_encrypt_message', 'parity_encryptMessage', 1),
-    ('parity_enode', 'parity_enode', 1),
-    ('parity_extra_data', 'parity_extraData', 1),
-    ('parity_future_transactions', 'parity_futureTransactions', 1),
-    ('parity_gas_ceil_target', 'parity_gasCeilTarget', 1),
-    ('parity_gas_floor_target', 'parity_gasFloorTarget', 1),
-    ('parity_gas_price_histogram', 'parity_gasPriceHistogram', 1),
-    ('parity_generate_secret_phrase', 'parity_generateSecretPhrase', 1),
-    ('parity_get_block_header_by_number', 'parity_getBlockHeaderByNumber', 1),
-    ('parity_get_vault_meta', 'parity_getVaultMeta', 1),
-    ('parity_hardware_accounts_info', 'parity_hardwareAccountsInfo', 1),
-    ('parity_list_accounts', 'parity_listAccounts', 1),
-    ('parity_list_opened_vaults', 'parity_listOpenedVaults', 1),
-    ('parity_list_storage_keys', 'parity_listStorageKeys', 1),
-    ('parity_list_vaults', 'parity_listVaults', 1),
-    ('parity_local_transactions', 'parity_localTransactions', 1),
-    ('parity_min_gas_price', 'parity_minGasPrice', 1),
-    ('parity_mode', 'parity_mode', 1),
-    ('parity_new_vault', 'parity_newVault', 1),
-    ('parity_net_chain', 'parity_netChain', 1),
-    ('parity_net_peers', 'parity_netPeers', 1),
-    ('parity_net_port', 'parity_netPort', 1),
-    ('parity_next_nonce', 'parity_nextNonce', 1),
-    ('parity_node_kind', 'parity_nodeKind', 1),
-    ('parity_node_name', 'parity_nodeName', 1),
-    ('parity_pending_transactions', 'parity_pendingTransactions', 1),
-    ('parity_pending_transactions_stats', 'parity_pendingTransactionsStats', 1),
-    ('parity_phrase_to_address', 'parity_phraseToAddress', 1),
-    ('parity_open_vault', 'parity_openVault', 1),
-    ('parity_post_sign', 'parity_postSign', 1),
-    ('parity_post_transaction', 'parity_postTransaction', 1),
-    ('parity_registry_address', 'parity_registryAddress', 1),
-    ('parity_releases_info', 'parity_releasesInfo', 1),
-    ('parity_remove_transaction', 'parity_removeTransaction', 1),
-    ('parity_rpc_settings', 'parity_rpcSettings', 1),
-    ('parity_set_vault_meta', 'parity_setVaultMeta', 1),
-    ('parity_sign_message', 'parity_signMessage', 1),
-    ('parity_transactions_limit', 'parity_transactionsLimit', 1),
-    ('parity_unsigned_transactions_count', 'parity_unsignedTransactionsCount', 1),
-    ('parity_version_info', 'parity_versionInfo', 1),
-    ('parity_ws_url', 'parity_wsUrl', 1),
-    ('parity_accept_non_reserved_peers', 'parity_acceptNonReservedPeers', 1),
-    ('parity_add_reserved_peer', 'parity_addReservedPeer', 1),
-    ('parity_dapps_list', 'parity_dappsList', 1),
-    ('parity_drop_non_reserved_peers', 'parity_dropNonReservedPeers', 1),
-    ('parity_execute_upgrade', 'parity_executeUpgrade', 1),
-    ('parity_hash_content', 'parity_hashContent', 1),
-    ('parity_remove_reserved_peer', 'parity_removeReservedPeer', 1),
-    ('parity_set_author', 'parity_setAuthor', 1),
-    ('parity_set_chain', 'parity_setChain', 1),
-    ('parity_set_engine_signer', 'parity_setEngineSigner', 1),
-    ('parity_set_extra_data', 'parity_setExtraData', 1),
-    ('parity_set_gas_ceil_target', 'parity_setGasCeilTarget', 1),
-    ('parity_set_gas_floor_target', 'parity_setGasFloorTarget', 1),
-    ('parity_set_max_transaction_gas', 'parity_setMaxTransactionGas', 1),
-    ('parity_set_min_gas_price', 'parity_setMinGasPrice', 1),
-    ('parity_set_mode', 'parity_setMode', 1),
-    ('parity_set_transactions_limit', 'parity_setTransactionsLimit', 1),
-    ('parity_upgrade_ready', 'parity_upgradeReady', 1),
-    ('parity_subscribe', 'parity_subscribe', 1),
-    ('parity_unsubscribe', 'parity_unsubscribe', 1),
-    ('parity_all_accounts_info', 'parity_allAccountsInfo', 1),
-    ('parity_change_password', 'parity_changePassword', 1),
-    ('parity_derive_address_hash', 'parity_deriveAddressHash', 1),
-    ('parity_derive_address_index', 'parity_deriveAddressIndex', 1),
-    ('parity_export_account', 'parity_exportAccount', 1),
-    ('parity_get_dapp_addresses', 'parity_getDappAddresses', 1),
-    ('parity_get_dapp_default_address', 'parity_getDappDefaultAddress', 1),
-    ('parity_get_new_dapps_addresses', 'parity_getNewDappsAddresses', 1),
-    ('parity_get_new_dapps_default_address', 'parity_getNewDappsDefaultAddress', 1),
-    ('parity_import_geth_accounts', 'parity_importGethAccounts', 1),
-    ('parity_kill_account', 'parity_killAccount', 1),
-    ('parity_list_geth_accounts', 'parity_listGethAccounts', 1),
-    ('parity_list_recent_dapps', 'parity_listRecentDapps', 1),
-    ('parity_new_account_from_phrase', 'parity_newAccountFromPhrase', 1),
-    ('parity_new_account_from_secret', 'parity_newAccountFromSecret', 1),
-    ('parity_new_account_from_wallet', 'parity_newAccountFromWallet', 1),
-    ('parity_remove_address', 'parity_removeAddress', 1),
-    ('parity_set_account_meta', 'parity_setAccountMeta', 1),
-    ('parity_set_account_name', 'parity_setAccountName', 1),
-    ('parity_set_dapp_addresses', 'parity_setDappAddresses', 1),
-    ('parity_set_dapp_default_address', 'parity_setDappDefaultAddress', 1),
-    ('parity_set_new_dapps_addresses', 'parity_setNewDappsAddresses', 1),
-    ('parity_set_new_dapps_default_address', 'parity_setNewDappsDefaultAddress', 1),
-    ('parity_test_password', 'parity_testPassword', 1),
-    ('signer_confirm_request', 'signer_confirmRequest', 1),
-    ('signer_confirm_request_raw', 'signer_confirmRequestRaw', 1),
-    ('signer_confirm_request_with_token', 'signer_confirmRequestWithToken', 1),
-    ('signer_generate_authorization_token', 'signer_generateAuthorizationToken', 1),
-    ('signer_generate_web_proxy_access_token', 'signer_generateWebProxyAccessToken', 1),
-    ('signer_reject_request', 'signer_rejectRequest', 1),
-    ('signer_requests_to_confirm', 'signer_requestsToConfirm', 1),
-    ('signer_subscribe_pending', 'signer_subscribePending', 1),
-    ('signer_unsubscribe_pending', 'signer_unsubscribePending', 1),
-    ('trace_block', 'trace_block', 1),
-    ('trace_call', 'trace_call', 1),
-    ('trace_filter', 'trace_filter', 1),
-    ('trace_get', 'trace_get', 1),
-    ('trace_raw_transaction', 'trace_RawTransaction', 1),
-    ('trace_replay_transaction', 'trace_replayTransaction', 1),
-    ('trace_transaction', 'trace_transaction', 1),
-    ('admin_add_peer', 'admin_addPeer', 1),
-    ('admin_datadir', 'admin_datadir', 1),
-    ('admin_node_info', 'admin_nodeInfo', 1),
-    ('admin_peers', 'admin_peers', 1),
-    ('admin_set_solc', 'admin_setSolc', 1),
-    ('admin_start_rpc', 'admin_startRPC', 1),
-    ('admin_start_ws', 'admin_startWS', 1),
-    ('admin_stop_rpc', 'admin_stopRPC', 1),
-    ('admin_stop_ws', 'admin_stopWS', 1),
-    ('debug_backtrace_at', 'debug_backtraceAt', 1),
-    ('debug_block_profile', 'debug_blockProfile', 1),
-    ('debug_cpu_profile', 'debug_cpuProfile', 1),
-    ('debug_dump_block', 'debug_dumpBlock', 1),
-    ('debug_gc_stats', 'debug_gcStats', 1),
-    ('debug_get_block_rlp', 'debug_getBlockRlp', 1),
-    ('debug_go_trace', 'debug_goTrace', 1),
-    ('debug_mem_stats', 'debug_memStats', 1),
-    ('debug_seed_hash', 'debug_seedHash', 1),
-    ('debug_set_head', 'debug_setHead', 1),
-    ('debug_set_block_profile_rate', 'debug_setBlockProfileRate', 1),
-    ('debug_stacks', 'debug_stacks', 1),
-    ('debug_start_cpu_profile', 'debug_startCPUProfile', 1),
-    ('debug_start_go_trace', 'debug_startGoTrace', 1),
-    ('debug_stop_cpu_profile', 'debug_stopCPUProfile', 1),
-    ('debug_stop_go_trace', 'debug_stopGoTrace', 1),
-    ('debug_trace_block', 'debug_traceBlock', 1),
-    ('debug_trace_block_by_number', 'debug_traceBlockByNumber', 1),
-    ('debug_trace_block_by_hash', 'debug_traceBlockByHash', 1),
-    ('debug_trace_block_from_file', 'debug_traceBlockFromFile', 1),
-    ('debug_trace_transaction', 'debug_traceTransaction', 1),
-    ('debug_verbosity', 'debug_verbosity', 1),
-    ('debug_vmodule', 'debug_vmodule', 1),
-    ('debug_write_block_profile', 'debug_writeBlockProfile', 1),
-    ('debug_write_mem_profile', 'debug_writeMemProfile', 1),
-    ('miner_set_extra', 'miner_setExtra', 1),
-    ('miner_set_gas_price', 'miner_setGasPrice', 1),
-    ('miner_start', 'miner_start', 1),
-    ('miner_stop', 'miner_stop', 1),
-    ('miner_set_ether_base', 'miner_setEtherBase', 1),
-    ('txpool_content', 'txpool_content', 1),
-    ('txpool_inspect', 'txpool_inspect', 1),
-    ('txpool_status', 'txpool_status', 1),
-    ('shh_add_private_key', 'shh_addPrivateKey', 1),
-    ('shh_add_sym_key', 'shh_addSymKey', 1),
-    ('shh_add_to_group', 'shh_addToGroup', 73),
-    ('shh_delete_key', 'shh_deleteKey', 1),
-    ('shh_delete_message_filter', 'shh_deleteMessageFilter', 1),
-    ('shh_get_filter_changes', 'shh_getFilterChanges', 73),
-    ('shh_get_filter_messages', 'shh_getFilterMessages', 1),
-    ('shh_get_messages', 'shh_getMessages', 73),
-    ('shh_get_private_key', 'shh_getPrivateKey', 1),
-    ('shh_get_public_key', 'shh_getPublicKey', 1),
-    ('shh_get_sym_key', 'shh_getSymKey', 1),
-    ('shh_has_identity', 'shh_hasIdentity', 73),
-    ('shh_info', 'shh_info', 1),
-    ('shh_new_filter', 'shh_newFilter', 73),
-    ('shh_new_group', 'shh_newGroup', 73),
-    ('shh_new_identity', 'shh_newIdentity', 73),
-    ('shh_new_key_pair', 'shh_newKeyPair', 1),
-    ('shh_new_message_filter', 'shh_newMessageFilter', 1),
-    ('shh_new_sym_key', 'shh_newSymKey', 1),
-    ('shh_post', 'shh_post', 73),
-    ('shh_subscribe', 'shh_subscribe', 1),
-    ('shh_uninstall_filter', 'shh_uninstallFilter', 73),
-    ('shh_unsubscribe', 'shh_unsubscribe', 1),
-    ('shh_version', 'shh_version', 67),
+    ('web3_client_version', 'web3_clientVersion'),
+    ('web3_sha3', 'web3_sha3'),
+    ('net_listening', 'net_listening'),
+    ('net_peer_count', 'net_peerCount'),
+    ('net_version', 'net_version'),
+    ('eth_accounts', 'eth_accounts'),
+    ('eth_block_number', 'eth_blockNumber'),
+    ('eth_call', 'eth_call'),
+    ('eth_coinbase', 'eth_coinbase'),
+    ('eth_compile_lll', 'eth_compileLLL'),
+    ('eth_compile_serpent', 'eth_compileSerpent'),
+    ('eth_compile_solidity', 'eth_compileSolidity'),
+    ('eth_estimate_gas', 'eth_estimateGas'),
+    ('eth_gas_price', 'eth_gasPrice'),
+    ('eth_get_balance', 'eth_getBalance'),
+    ('eth_get_block_by_hash', 'eth_getBlockByHash'),
+    ('eth_get_block_by_number', 'eth_getBlockByNumber'),
+    ('eth_get_block_transaction_count_by_hash', 'eth_getBlockTransactionCountByHash'),
+    ('eth_get_block_transaction_count_by_number', 'eth_getBlockTransactionCountByNumber'),
+    ('eth_get_code', 'eth_getCode'),
+    ('eth_get_compilers', 'eth_getCompilers'),
+    ('eth_get_filter_changes', 'eth_getFilterChanges'),
+    ('eth_get_filter_logs', 'eth_getFilterLogs'),
+    ('eth_get_logs', 'eth_getLogs'),
+    ('eth_get_storage_at', 'eth_getStorageAt'),
+    ('eth_get_transaction_by_block_hash_and_index', 'eth_getTransactionByBlockHashAndIndex'),
+    ('eth_get_transaction_by_block_number_and_index', 'eth_getTransactionByBlockNumberAndIndex'),
+    ('eth_get_transaction_by_hash', 'eth_getTransactionByHash'),
+    ('eth_get_transaction_count', 'eth_getTransactionCount'),
+    ('eth_get_transaction_receipt', 'eth_getTransactionReceipt'),
+    ('eth_get_uncle_by_block_hash_and_index', 'eth_getUncleByBlockHashAndIndex'),
+    ('eth_get_uncle_by_block_number_and_index', 'eth_getUncleByBlockNumberAndIndex'),
+    ('eth_get_uncle_count_by_block_hash', 'eth_getUncleCountByBlockHash'),
+    ('eth_get_uncle_count_by_block_number', 'eth_getUncleCountByBlockNumber'),
+    ('eth_get_work', 'eth_getWork'),
+    ('eth_hashrate', 'eth_hashrate'),
+    ('eth_mining', 'eth_mining'),
+    ('eth_new_block_filter', 'eth_newBlockFilter'),
+    ('eth_new_filter', 'eth_newFilter'),
+    ('eth_new_pending_transaction_filter', 'eth_newPendingTransactionFilter'),
+    ('eth_protocol_version', 'eth_protocolVersion'),
+    ('eth_send_raw_transaction', 'eth_sendRawTransaction'),
+    ('eth_send_transaction', 'eth_sendTransaction'),
+    ('eth_sign', 'eth_sign'),
+    ('eth_sign_transaction', 'eth_signTransaction'),
+    ('eth_submit_hashrate', 'eth_submitHashrate'),
+    ('eth_submit_work', 'eth_submitWork'),
+    ('eth_syncing', 'eth_syncing'),
+    ('eth_uninstall_filter', 'eth_uninstallFilter'),
+    ('eth_subscribe', 'eth_subscribe'),
+    ('eth_unsubscribe', 'eth_unsubscribe'),
+    ('personal_ec_recover', 'personal_ecRecover'),
+    ('personal_import_raw_key', 'personal_importRawKey'),
+    ('personal_list_accounts', 'personal_listAccounts'),
+    ('personal_lock_account', 'personal_lockAccount'),
+    ('personal_new_account', 'personal_newAccount'),
+    ('personal_send_transaction', 'personal_sendTransaction'),
+    ('personal_sign', 'personal_sign'),
+    ('personal_unlock_account', 'personal_unlockAccount'),
+    ('parity_accounts_info', 'parity_accountsInfo'),
+    ('parity_chain', 'parity_chain'),
+    ('parity_chain_status', 'parity_chainStatus'),
+    ('parity_change_vault', 'parity_changeVault'),
+    ('parity_change_vault_password', 'parity_changeVaultPassword'),
+    ('parity_check_request', 'parity_checkRequest'),
+    ('parity_cid_v0', 'parity_cidV0'),
+    ('parity_close_vault', 'parity_closeVault'),
+    ('parity_compose_transaction', 'parity_composeTransaction'),
+    ('parity_consensus_capability', 'parity_consensusCapability'),
+    ('parity_dapps_url', 'parity_dappsUrl'),
+    ('parity_decrypt_message', 'parity_decryptMessage'),
+    ('parity_default_account', 'parity_defaultAccount'),
+    ('parity_default_extra_data', 'parity_defaultExtraData'),
+    ('parity_dev_logs', 'parity_devLogs'),
+    ('parity_dev_logs_levels', 'parity_devLogsLevels'),
+    ('parity_encrypt_message', 'parity_encryptMessage'),
+    ('parity_enode', 'parity_enode'),
+    ('parity_extra_data', 'parity_extraData'),
+    ('parity_future_transactions', 'parity_futureTransactions'),
+    ('parity_gas_ceil_target', 'parity_gasCeilTarget'),
+    ('parity_gas_floor_target', 'parity_gasFloorTarget'),
+    ('parity_gas_price_histogram', 'parity_gasPriceHistogram'),
+    ('parity_generate_secret_phrase', 'parity_generateSecretPhrase'),
+    ('parity_get_block_header_by_number', 'parity_getBlockHeaderByNumber'),
+    ('parity_get_vault_meta', 'parity_getVaultMeta'),
+    ('parity_hardware_accounts_info', 'parity_hardwareAccountsInfo'),
+    ('parity_list_accounts', 'parity_listAccounts'),
+    ('parity_list_opened_vaults', 'parity_listOpenedVaults'),
+    ('parity_list_storage_keys', 'parity_listStorageKeys'),
+    ('parity_list_vaults', 'parity_listVaults'),
+    ('parity_local_transactions', 'parity_localTransactions'),
+    ('parity_min_gas_price', 'parity_minGasPrice'),
+    ('parity_mode', 'parity_mode'),
+    ('parity_new_vault', 'parity_newVault'),
+    ('parity_net_chain', 'parity_netChain'),
+    ('parity_net_peers', 'parity_netPeers'),
+    ('parity_net_port', 'parity_netPort'),
+    ('parity_next_nonce', 'parity_nextNonce'),
+    ('parity_node_kind', 'parity_nodeKind'),
+    ('parity_node_name', 'parity_nodeName'),
+    ('parity_pending_transactions', 'parity_pendingTransactions'),
+    ('parity_pending_transactions_stats', 'parity_pendingTransactionsStats'),
+    ('parity_phrase_to_address', 'parity_phraseToAddress'),
+    ('parity_open_vault', 'parity_openVault'),
+    ('parity_post_sign', 'parity_postSign'),
+    ('parity_post_transaction', 'parity_postTransaction'),
+    ('parity_registry_address', 'parity_registryAddress'),
+    ('parity_releases_info', 'parity_releasesInfo'),
+    ('parity_remove_transaction', 'parity_removeTransaction'),
+    ('parity_rpc_settings', 'parity_rpcSettings'),
+    ('parity_set_vault_meta', 'parity_setVaultMeta'),
+    ('parity_sign_message', 'parity_signMessage'),
+    ('parity_transactions_limit', 'parity_transactionsLimit'),
+    ('parity_unsigned_transactions_count', 'parity_unsignedTransactionsCount'),
+    ('parity_version_info', 'parity_versionInfo'),
+    ('parity_ws_url', 'parity_wsUrl'),
+    ('parity_accept_non_reserved_peers', 'parity_acceptNonReservedPeers'),
+    ('parity_add_reserved_peer', 'parity_addReservedPeer'),
+    ('parity_dapps_list', 'parity_dappsList'),
+    ('parity_drop_non_reserved_peers', 'parity_dropNonReservedPeers'),
+    ('parity_execute_upgrade', 'parity_executeUpgrade'),
+    ('parity_hash_content', 'parity_hashContent'),
+    ('parity_remove_reserved_peer', 'parity_removeReservedPeer'),
+    ('parity_set_author', 'parity_setAuthor'),
+    ('parity_set_chain', 'parity_setChain'),
+    ('parity_set_engine_signer', 'parity_setEngineSigner'),
+    ('parity_set_extra_data', 'parity_setExtraData'),
+    ('parity_set_gas_ceil_target', 'parity_setGasCeilTarget'),
+    ('parity_set_gas_floor_target', 'parity_setGasFloorTarget'),
+    ('parity_set_max_transaction_gas', 'parity_setMaxTransactionGas'),
+    ('parity_set_min_gas_price', 'parity_setMinGasPrice'),
+    ('parity_set_mode', 'parity_setMode'),
+    ('parity_set_transactions_limit', 'parity_setTransactionsLimit'),
+    ('parity_upgrade_ready', 'parity_upgradeReady'),
+    ('parity_subscribe', 'parity_subscribe'),
+    ('parity_unsubscribe', 'parity_unsubscribe'),
+    ('parity_all_accounts_info', 'parity_allAccountsInfo'),
+    ('parity_change_password', 'parity_changePassword'),
+    ('parity_derive_address_hash', 'parity_deriveAddressHash'),
+    ('parity_derive_address_index', 'parity_deriveAddressIndex'),
+    ('parity_export_account', 'parity_exportAccount'),
+    ('parity_get_dapp_addresses', 'parity_getDappAddresses'),
+    ('parity_get_dapp_default_address', 'parity_getDappDefaultAddress'),
+    ('parity_get_new_dapps_addresses', 'parity_getNewDappsAddresses'),
+    ('parity_get_new_dapps_default_address', 'parity_getNewDappsDefaultAddress'),
+    ('parity_import_geth_accounts', 'parity_importGethAccounts'),
+    ('parity_kill_account', 'parity_killAccount'),
+    ('parity_list_geth_accounts', 'parity_listGethAccounts'),
+    ('parity_list_recent_dapps', 'parity_listRecentDapps'),
+    ('parity_new_account_from_phrase', 'parity_newAccountFromPhrase'),
+    ('parity_new_account_from_secret', 'parity_newAccountFromSecret'),
+    ('parity_new_account_from_wallet', 'parity_newAccountFromWallet'),
+    ('parity_remove_address', 'parity_removeAddress'),
+    ('parity_set_account_meta', 'parity_setAccountMeta'),
+    ('parity_set_account_name', 'parity_setAccountName'),
+    ('parity_set_dapp_addresses', 'parity_setDappAddresses'),
+    ('parity_set_dapp_default_address', 'parity_setDappDefaultAddress'),
+    ('parity_set_new_dapps_addresses', 'parity_setNewDappsAddresses'),
+    ('parity_set_new_dapps_default_address', 'parity_setNewDappsDefaultAddress'),
+    ('parity_test_password', 'parity_testPassword'),
+    ('signer_confirm_request', 'signer_confirmRequest'),
+    ('signer_confirm_request_raw', 'signer_confirmRequestRaw'),
+    ('signer_confirm_request_with_token', 'signer_confirmRequestWithToken'),
+    ('signer_generate_authorization_token', 'signer_generateAuthorizationToken'),
+    ('signer_generate_web_proxy_access_token', 'signer_generateWebProxyAccessToken'),
+    ('signer_reject_request', 'signer_rejectRequest'),
+    ('signer_requests_to_confirm', 'signer_requestsToConfirm'),
+    ('signer_subscribe_pending', 'signer_subscribePending'),
+    ('signer_unsubscribe_pending', 'signer_unsubscribePending'),
+    ('trace_block', 'trace_block'),
+    ('trace_call', 'trace_call'),
+    ('trace_filter', 'trace_filter'),
+    ('trace_get', 'trace_get'),
+    ('trace_raw_transaction', 'trace_RawTransaction'),
+    ('trace_replay_transaction', 'trace_replayTransaction'),
+    ('trace_transaction', 'trace_transaction'),
+    ('admin_add_peer', 'admin_addPeer'),
+    ('admin_datadir', 'admin_datadir'),
+    ('admin_node_info', 'admin_nodeInfo'),
+    ('admin_peers', 'admin_peers'),
+    ('admin_set_solc', 'admin_setSolc'),
+    ('admin_start_rpc', 'admin_startRPC'),
+    ('admin_start_ws', 'admin_startWS'),
+    ('admin_stop_rpc', 'admin_stopRPC'),
+    ('admin_stop_ws', 'admin_stopWS'),
+    ('debug_backtrace_at', 'debug_backtraceAt'),
+    ('debug_block_profile', 'debug_blockProfile'),
+    ('debug_cpu_profile', 'debug_cpuProfile'),
+    ('debug_dump_block', 'debug_dumpBlock'),
+    ('debug_gc_stats', 'debug_gcStats'),
+    ('debug_get_block_rlp', 'debug_getBlockRlp'),
+    ('debug_go_trace', 'debug_goTrace'),
+    ('debug_mem_stats', 'debug_memStats'),
+    ('debug_seed_hash', 'debug_seedHash'),
+    ('debug_set_head', 'debug_setHead'),
+    ('debug_set_block_profile_rate', 'debug_setBlockProfileRate'),
+    ('debug_stacks', 'debug_stacks'),
+    ('debug_start_cpu_profile', 'debug_startCPUProfile'),
+    ('debug_start_go_trace', 'debug_startGoTrace'),
+    ('debug_stop_cpu_profile', 'debug_stopCPUProfile'),
+    ('debug_stop_go_trace', 'debug_stopGoTrace'),
+    ('debug_trace_block', 'debug_traceBlock'),
+    ('debug_trace_block_by_number', 'debug_traceBlockByNumber'),
+    ('debug_trace_block_by_hash', 'debug_traceBlockByHash'),
+    ('debug_trace_block_from_file', 'debug_traceBlockFromFile'),
+    ('debug_trace_transaction', 'debug_traceTransaction'),
+    ('debug_verbosity', 'debug_verbosity'),
+    ('debug_vmodule', 'debug_vmodule'),
+    ('debug_write_block_profile', 'debug_writeBlockProfile'),
+    ('debug_write_mem_profile', 'debug_writeMemProfile'),
+    ('miner_set_extra', 'miner_setExtra'),
+    ('miner_set_gas_price', 'miner_setGasPrice'),
+    ('miner_start', 'miner_start'),
+    ('miner_stop', 'miner_stop'),
+    ('miner_set_ether_base', 'miner_setEtherBase'),
+    ('txpool_content', 'txpool_content'),
+    ('txpool_inspect', 'txpool_inspect'),
+    ('txpool_status', 'txpool_status'),
+    ('shh_add_private_key', 'shh_addPrivateKey'),
+    ('shh_add_sym_key', 'shh_addSymKey'),
+    ('shh_add_to_group', 'shh_addToGroup'),
+    ('shh_delete_key', 'shh_deleteKey'),
+    ('shh_delete_message_filter', 'shh_deleteMessageFilter'),
+    ('shh_get_filter_changes', 'shh_getFilterChanges'),
+    ('shh_get_filter_messages', 'shh_getFilterMessages'),
+    ('shh_get_messages', 'shh_getMessages'),
+    ('shh_get_private_key', 'shh_getPrivateKey'),
+    ('shh_get_public_key', 'shh_getPublicKey'),
+    ('shh_get_sym_key', 'shh_getSymKey'),
+    ('shh_has_identity', 'shh_hasIdentity'),
+    ('shh_info', 'shh_info'),
+    ('shh_new_filter', 'shh_newFilter'),
+    ('shh_new_group', 'shh_newGroup'),
+    ('shh_new_identity', 'shh_newIdentity'),
+    ('shh_new_key_pair', 'shh_newKeyPair'),
+    ('shh_new_message_filter', 'shh_newMessageFilter'),
+    ('shh_new_sym_key', 'shh_newSymKey'),
+    ('shh_post', 'shh_post'),
+    ('shh_subscribe', 'shh_subscribe'),
+    ('shh_uninstall_filter', 'shh_uninstallFilter'),
+    ('shh_unsubscribe', 'shh_unsubscribe'),
+    ('shh_version', 'shh_version'),
 ]
 
 for _args in CLIENT_METHODS:
     AbstractClient._AbstractClient__method(*_args)
+
+# Methods without side effects, by Python API method name, which may be
+# coalesced or retried. Methods which send transactions, sign, create or
+# consume filters, or change node state are never included.
+IDEMPOTENT_METHODS = frozenset([
+    'debug_trace_block',
+    'debug_trace_block_by_hash',
+    'debug_trace_block_by_number',
+    'debug_trace_transaction',
+    'eth_accounts',
+    'eth_block_number',
+    'eth_call',
+    'eth_coinbase',
+    'eth_estimate_gas',
+    'eth_gas_price',
+    'eth_get_balance',
+    'eth_get_block_by_hash',
+    'eth_get_block_by_number',
+    'eth_get_block_transaction_count_by_hash',
+    'eth_get_block_transaction_count_by_number',
+    'eth_get_code',
+    'eth_get_compilers',
+    'eth_get_filter_logs',
+    'eth_get_logs',
+    'eth_get_storage_at',
+    'eth_get_transaction_by_block_hash_and_index',
+    'eth_get_transaction_by_block_number_and_index',
+    'eth_get_transaction_by_hash',
+    'eth_get_transaction_count',
+    'eth_get_transaction_receipt',
+    'eth_get_uncle_by_block_hash_and_index',
+    'eth_get_uncle_by_block_number_and_index',
+    'eth_get_uncle_count_by_block_hash',
+    'eth_get_uncle_count_by_block_number',
+    'eth_hashrate',
+    'eth_mining',
+    'eth_protocol_version',
+    'eth_syncing',
+    'net_listening',
+    'net_peer_count',
+    'net_version',
+    'parity_chain',
+    'parity_chain_status',
+    'parity_get_block_header_by_number',
+    'parity_next_nonce',
+    'parity_pending_transactions',
+    'trace_block',
+    'trace_call',
+    'trace_filter',
+    'trace_get',
+    'trace_raw_transaction',
+    'trace_replay_transaction',
+    'trace_transaction',
+    'txpool_content',
+    'txpool_inspect',
+    'txpool_status',
+    'web3_client_version',
+    'web3_sha3',
+])
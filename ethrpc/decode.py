@@ -0,0 +1,323 @@
+'''
+    decode
+    ------
+
+    Module for decoding JSON-RPC response bodies.
+
+    Decoders are declared once per method in `DECODERS`, so decoding a
+    response is a table lookup followed by conversion of the known
+    quantity fields from hex strings to integers.
+
+    `decode_result` and `decode_batch` parse and decode raw response
+    bodies, and are picklable, so CPU-bound decoding of large responses
+    can run in a process pool.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'decode_batch',
+    'decode_result',
+    'RPCError',
+    'DECODERS',
+]
+
+import functools
+from .codec import get_codec
+
+
+class RPCError(Exception):
+    """
+    Error object returned by the JSON-RPC API.
+    """
+
+    def __init__(self, code, message, data=None):
+        """
+        Initialize error.
+
+        :param code: JSON-RPC error code.
+        :param message: error message.
+        :param data: (optional) additional error data.
+        """
+        super(RPCError, self).__init__(code, message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+    def __str__(self):
+        return "{} (code {})".format(self.message, self.code)
+
+    def __reduce__(self):
+        return (type(self), (self.code, self.message, self.data))
+
+    @classmethod
+    def from_body(cls, body):
+        """
+        Create error from the 'error' field of a response body.
+
+        :param body: JSON response object.
+        """
+        error = body['error']
+        return cls(error.get('code'), error.get('message'), error.get('data'))
+
+
+# CONVERTERS
+
+
+def quantity(value):
+    '''Convert hex quantity to an integer.'''
+
+    if value is None:
+        return None
+    return int(value, 16)
+
+
+def decode_array(decoder, values):
+    '''Decode a list of values.'''
+
+    if values is None:
+        return None
+    return [decoder(i) for i in values]
+
+
+def decode_object(quantities, nested, obj):
+    '''Decode an object, with quantity and nested fields.'''
+
+    # transaction lists contain hashes unless full objects are requested
+    if not isinstance(obj, dict):
+        return obj
+    for key in quantities:
+        value = obj.get(key)
+        if value is not None:
+            obj[key] = int(value, 16)
+    for key, decoder in nested:
+        value = obj.get(key)
+        if value is not None:
+            obj[key] = decoder(value)
+    return obj
+
+
+# Decoders are partials of module-level functions, rather than closures,
+# so decoder tables can be pickled and sent to a worker process.
+
+
+def array(decoder):
+    '''Create decoder for a list of values.'''
+
+    return functools.partial(decode_array, decoder)
+
+
+def schema(quantities, **nested):
+    '''Create decoder for an object, with quantity and nested fields.'''
+
+    return functools.partial(decode_object, tuple(quantities), tuple(sorted(nested.items())))
+
+
+def syncing(value):
+    '''Decode sync status, which is `False` when not syncing.'''
+
+    if value is False:
+        return value
+    return sync_status(value)
+
+
+# SCHEMAS
+
+log = schema([
+    'blockNumber',
+    'logIndex',
+    'transactionIndex',
+    'transactionLogIndex',
+])
+
+transaction = schema([
+    'blockNumber',
+    'chainId',
+    'gas',
+    'gasPrice',
+    'maxFeePerGas',
+    'maxPriorityFeePerGas',
+    'nonce',
+    'transactionIndex',
+    'type',
+    'v',
+    'value',
+])
+
+block = schema([
+    'baseFeePerGas',
+    'difficulty',
+    'gasLimit',
+    'gasUsed',
+    'number',
+    'size',
+    'timestamp',
+    'totalDifficulty',
+], transactions=array(transaction))
+
+receipt = schema([
+    'blockNumber',
+    'cumulativeGasUsed',
+    'effectiveGasPrice',
+    'gasUsed',
+    'status',
+    'transactionIndex',
+    'type',
+], logs=array(log))
+
+trace = schema([], action=schema(['gas', 'value']), result=schema(['gasUsed']))
+
+sync_status = schema([
+    'currentBlock',
+    'highestBlock',
+    'knownStates',
+    'pulledStates',
+    'startingBlock',
+])
+
+DECODERS = {
+    'net_peer_count': quantity,
+    'eth_block_number': quantity,
+    'eth_estimate_gas': quantity,
+    'eth_gas_price': quantity,
+    'eth_get_balance': quantity,
+    'eth_get_block_by_hash': block,
+    'eth_get_block_by_number': block,
+    'eth_get_block_transaction_count_by_hash': quantity,
+    'eth_get_block_transaction_count_by_number': quantity,
+    'eth_get_filter_changes': array(log),
+    'eth_get_filter_logs': array(log),
+    'eth_get_logs': array(log),
+    'eth_get_transaction_by_block_hash_and_index': transaction,
+    'eth_get_transaction_by_block_number_and_index': transaction,
+    'eth_get_transaction_by_hash': transaction,
+    'eth_get_transaction_count': quantity,
+    'eth_get_transaction_receipt': receipt,
+    'eth_get_uncle_by_block_hash_and_index': block,
+    'eth_get_uncle_by_block_number_and_index': block,
+    'eth_get_uncle_count_by_block_hash': quantity,
+    'eth_get_uncle_count_by_block_number': quantity,
+    'eth_hashrate': quantity,
+    'eth_new_block_filter': quantity,
+    'eth_new_filter': quantity,
+    'eth_new_pending_transaction_filter': quantity,
+    'eth_syncing': syncing,
+    'parity_get_block_header_by_number': block,
+    'parity_next_nonce': quantity,
+    'trace_block': array(trace),
+    'trace_filter': array(trace),
+    'trace_get': trace,
+    'trace_transaction': array(trace),
+}
+
+
+def decode(name, body, decoders=DECODERS):
+    """
+    Decode response body for a method.
+    :return: decoded 'result' field, or raise `RPCError`.
+
+    :param name: Python API method name.
+    :param body: JSON response object.
+    :param decoders: (optional) decoders by Python API method name.
+    """
+    if 'error' in body:
+        raise RPCError.from_body(body)
+    decoder = decoders.get(name)
+    if decoder is None:
+        return body.get('result')
+    return decoder(body.get('result'))
+
+
+def unwrap(name, body, decode=True, record=None):
+    """
+    Get the result of a response body.
+    :return: result, decoded if `decode` is set, or raise `RPCError`.
+
+    :param name: Python API method name.
+    :param body: JSON response object.
+    :param decode: decode the result, either `True` to use `DECODERS`,
+        or a custom table of decoders by Python API method name.
+    :param record: (optional) function converting the result to a
+        record.
+    """
+    if 'error' in body:
+        raise RPCError.from_body(body)
+    result = body.get('result')
+    if decode:
+        decoders = decode if isinstance(decode, dict) else DECODERS
+        decoder = decoders.get(name)
+        if decoder is not None:
+            result = decoder(result)
+    return result if record is None else record(result)
+
+
+def decode_result(name, data, codec=None, decode=True, record=None):
+    """
+    Parse and decode a raw response body, such as in a worker process.
+    :return: result, or raise `RPCError`.
+
+    :param name: Python API method name.
+    :param data: raw JSON response body.
+    :param codec: (optional) JSON codec name.
+    :param decode: decode the result, either `True` to use `DECODERS`,
+        or a custom table of decoders, which must be picklable to be
+        sent to a worker process.
+    :param record: (optional) function converting the result to a
+        compact record, so less data is returned from the worker.
+    """
+    return unwrap(name, get_codec(codec).loads(data), decode, record)
+
+
+def decode_batch(name, ids, data, codec=None, decode=True, record=None):
+    """
+    Parse and decode a raw batch response body, such as in a worker
+    process.
+    :return: list of results in the order of `ids`, with the exception
+        for each failed call in place of its result.
+
+    :param name: Python API method name for every call in the batch.
+    :param ids: request ids of the calls.
+    :param data: raw JSON response body.
+    :param codec: (optional) JSON codec name.
+    :param decode: decode the results, as for `decode_result`.
+    :param record: (optional) function converting each result to a
+        compact record.
+    """
+    return unwrap_batch(name, ids, get_codec(codec).loads(data), decode, record)
+
+
+def unwrap_batch(name, ids, bodies, decode=True, record=None):
+    """
+    Get the results of a parsed batch response.
+    :return: list of results in the order of `ids`, with the exception
+        for each failed call in place of its result.
+
+    :param name: Python API method name for every call in the batch.
+    :param ids: request ids of the calls.
+    :param bodies: parsed JSON response, a list of response objects.
+    :param decode: decode the results, as for `unwrap`.
+    :param record: (optional) function converting each result to a
+        record.
+    """
+    # A server that rejects the whole batch responds with a single
+    # error object, rather than an array.
+    if isinstance(bodies, dict):
+        responses = dict.fromkeys(ids, bodies)
+    else:
+        responses = {i.get('id'): i for i in bodies}
+
+    results = []
+    for id_ in ids:
+        body = responses.get(id_)
+        if body is None:
+            results.append(ValueError("No response for batch request id {}.".format(id_)))
+            continue
+        try:
+            results.append(unwrap(name, body, decode, record))
+        except Exception as error:
+            results.append(error)
+    return results
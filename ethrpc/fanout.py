@@ -0,0 +1,85 @@
+'''
+    fanout
+    ------
+
+    Concurrent calls from synchronous code, on a thread pool.
+
+    Results stream back as calls complete, with a bound on the number
+    of outstanding calls, so arbitrarily long inputs use bounded memory.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'imap',
+    'DEFAULT_WORKERS',
+]
+
+import collections
+import concurrent.futures
+
+DEFAULT_WORKERS = 16
+
+
+def imap(func, iterable, workers=DEFAULT_WORKERS, ordered=True, max_pending=None,
+         executor=None):
+    """
+    Call a function on each item of an iterable from a thread pool.
+    :return: generator over the results, in input order if `ordered`,
+        otherwise in completion order. Raises the first exception, in
+        yield order, and cancels the outstanding calls.
+
+    :param func: function of a single item.
+    :param iterable: items, consumed lazily.
+    :param workers: number of threads.
+    :param ordered: yield results in input order.
+    :param max_pending: (optional) maximum outstanding calls, including
+        completed calls not yet yielded, defaults to twice `workers`.
+    :param executor: (optional) executor shared between calls, which
+        is not shut down, otherwise a pool of `workers` threads is
+        created for the call.
+    """
+    if max_pending is None:
+        max_pending = 2 * workers
+    if max_pending < 1:
+        raise ValueError("Maximum pending calls must be positive.")
+    owned = executor is None
+    if owned:
+        executor = concurrent.futures.ThreadPoolExecutor(workers)
+
+    pending = collections.deque() if ordered else set()
+    add = pending.append if ordered else pending.add
+    try:
+        for item in iterable:
+            add(executor.submit(func, item))
+            while len(pending) >= max_pending:
+                for result in next_results(pending, ordered):
+                    yield result
+        while pending:
+            for result in next_results(pending, ordered):
+                yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=False)
+
+
+def next_results(pending, ordered):
+    """
+    Wait for the next results.
+    :return: list of results, removed from the pending futures.
+
+    :param pending: deque of futures in input order if `ordered`,
+        otherwise a set of futures.
+    :param ordered: wait for the oldest future.
+    """
+    if ordered:
+        return [pending.popleft().result()]
+    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+    pending.difference_update(done)
+    return [future.result() for future in done]
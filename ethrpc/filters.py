@@ -0,0 +1,527 @@
+'''
+    filters
+    -------
+
+    Lifecycle management for polled filters.
+
+    Nodes silently expire filters which are not polled often enough, so
+    the manager owns the filter ids, polls every filter with a single
+    batch per tick, and reinstalls expired filters, filling the logs
+    missed while expired from the last polled block.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'is_filter_not_found',
+    'FilterManager',
+    'FilterResult',
+    'ManagedFilter',
+]
+
+import collections
+import re
+from .decode import RPCError
+from .models import quantity
+
+
+def identity(value):
+    '''Keep filter ID as returned by the node.'''
+
+    return value
+
+
+# Methods to poll and uninstall filters, and to convert the filter ID
+# to the format expected by their parameters, by creation method.
+FILTER_METHODS = {
+    'eth_new_block_filter': ('eth_get_filter_changes', 'eth_uninstall_filter', quantity),
+    'eth_new_filter': ('eth_get_filter_changes', 'eth_uninstall_filter', quantity),
+    'eth_new_pending_transaction_filter': ('eth_get_filter_changes', 'eth_uninstall_filter', quantity),
+    'shh_new_message_filter': ('shh_get_filter_messages', 'shh_delete_message_filter', identity),
+}
+
+# New changes of a filter from a poll, or the error which prevented
+# polling or reinstalling the filter, with no changes.
+FilterResult = collections.namedtuple('FilterResult', 'changes error')
+
+# Error messages from Geth, Parity and Nethermind for expired filters.
+FILTER_NOT_FOUND = re.compile(r'filter.*(not found|does not exist|expired)|unknown filter', re.I)
+
+
+def is_filter_not_found(error):
+    """
+    Get if polling a filter failed since the filter expired.
+
+    :param error: exception raised by the poll.
+    """
+    return isinstance(error, RPCError) and bool(FILTER_NOT_FOUND.search(error.message or ''))
+
+
+def log_key(log):
+    '''Get unique key for a log, for raw or decoded logs and `Log` models.'''
+
+    if isinstance(log, dict):
+        return log.get('blockHash'), log.get('logIndex')
+    return log.block_hash, log.log_index
+
+
+def log_block(log):
+    '''Get block number of a log, or None for pending logs.'''
+
+    number = log.get('blockNumber') if isinstance(log, dict) else log.block_number
+    return None if number is None else quantity(number)
+
+
+def head_number(batch, head):
+    '''Get block number of the head from an executed batch, or None.'''
+
+    try:
+        return quantity(batch.unwrap(head))
+    except RPCError:
+        return None
+
+
+class ManagedFilter(object):
+    """
+    Filter owned by a `FilterManager`, keeping the arguments to
+    reinstall the filter once it expires.
+    """
+
+    def __init__(self, method, **kwds):
+        """
+        Initialize filter.
+
+        :param method: Python API name of the creation method.
+        :param kwds: keyword arguments for the creation method.
+        """
+        self.method = method
+        self.kwds = kwds
+        self.id = None
+        # first block whose logs may not all have been returned, for
+        # log filters
+        self.cursor = None
+        # keys of the logs already returned from the cursor block
+        self.returned = set()
+        # block number of the head at the last install or poll
+        self.head = None
+        # keys of logs filled after a reinstall, to skip in the next poll
+        self.seen = None
+
+    def __repr__(self):
+        return 'ManagedFilter({}, id={!r})'.format(self.method, self.id)
+
+    @property
+    def changes_method(self):
+        """
+        Python API name of the method polling the filter.
+        """
+        return FILTER_METHODS[self.method][0]
+
+    @property
+    def uninstall_method(self):
+        """
+        Python API name of the method uninstalling the filter.
+        """
+        return FILTER_METHODS[self.method][1]
+
+    @property
+    def is_log_filter(self):
+        """
+        Get if the filter matches logs.
+        """
+        return self.method == 'eth_new_filter'
+
+    def install_kwds(self):
+        """
+        Get keyword arguments to install the filter, starting from the
+        cursor for log filters which have been polled.
+        """
+        kwds = dict(self.kwds)
+        if self.cursor is not None:
+            kwds['from_block'] = self.cursor
+        return kwds
+
+    def installed(self, filter_id, number=None):
+        """
+        Store the ID of the installed filter.
+
+        :param filter_id: filter ID returned by the node.
+        :param number: (optional) block number of the head when installed.
+        """
+        self.id = FILTER_METHODS[self.method][2](filter_id)
+        self.head = number
+
+    def update(self, changes, number):
+        """
+        Process changes returned by a poll.
+
+        The node evaluates the head and the poll in the same batch in no
+        particular order, so the cursor only advances past the logs
+        returned, and past the head seen by the previous install or
+        poll, whose blocks were processed before this poll was sent.
+        :return: list of new changes.
+
+        :param changes: list of changes.
+        :param number: block number of the head when polled.
+        """
+        changes = changes or []
+        if self.seen is not None:
+            seen, self.seen = self.seen, None
+            changes = [i for i in changes if log_key(i) not in seen]
+        if self.is_log_filter:
+            changes = self.advance(changes)
+            if self.head is not None and (self.cursor is None or self.head >= self.cursor):
+                self.cursor = self.head + 1
+                self.returned = set()
+        self.head = number
+        return changes
+
+    def fill(self, logs):
+        """
+        Process logs missed while the filter was expired.
+        :return: list of logs.
+
+        :param logs: list of all logs matching the reinstalled filter.
+        """
+        logs = self.advance(logs or [])
+        self.seen = set(log_key(i) for i in logs)
+        return logs
+
+    def advance(self, logs):
+        """
+        Skip logs already returned from the cursor block, and move the
+        cursor to the last block returned.
+        :return: list of new logs.
+
+        :param logs: list of logs, in block order.
+        """
+        logs = [i for i in logs if log_key(i) not in self.returned]
+        for log in logs:
+            number = log_block(log)
+            if number is None:
+                continue
+            if self.cursor is None or number > self.cursor:
+                self.cursor = number
+                self.returned = set()
+            if number == self.cursor:
+                self.returned.add(log_key(log))
+        return logs
+
+
+class FilterManager(object):
+    """
+    Synchronous manager for filters, polling all filters with one batch
+    request per tick.
+
+        >>> with FilterManager(client) as manager:
+        ...     transfers = manager.new_filter(address=token, topics=[TRANSFER])
+        ...     while True:
+        ...         for log in manager.poll()[transfers].changes:
+        ...             print(log['transactionHash'])
+        ...         time.sleep(1)
+
+    Batches are built and their results processed without I/O, so the
+    asynchronous manager only overrides the methods executing them.
+    """
+
+    def __init__(self, client, max_batch_size=None):
+        """
+        Initialize manager.
+
+        :param client: client used to install and poll filters.
+        :param max_batch_size: (optional) maximum calls per request,
+            defaults to polling every filter in a single request.
+        """
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.filters = []
+
+    def __len__(self):
+        return len(self.filters)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def batch(self, size):
+        """
+        Create batch for a number of calls.
+
+        :param size: number of calls.
+        """
+        return self.client.batch(self.max_batch_size or max(size, 1))
+
+    def new_filter(self, from_block=None, to_block=None, address=None, topics=None):
+        """
+        Install a log filter.
+        :return: `ManagedFilter`.
+
+        :param from_block: (optional) block number or tag to query.
+        :param to_block: (optional) block number or tag to query.
+        :param address: (optional) contract address or list of addresses.
+        :param topics: (optional) list of `DATA` topics.
+        """
+        return self.add(ManagedFilter('eth_new_filter', from_block=from_block,
+                                      to_block=to_block, address=address, topics=topics))
+
+    def new_block_filter(self):
+        """
+        Install a filter for new block hashes.
+        :return: `ManagedFilter`.
+        """
+        return self.add(ManagedFilter('eth_new_block_filter'))
+
+    def new_pending_transaction_filter(self):
+        """
+        Install a filter for new pending transaction hashes.
+        :return: `ManagedFilter`.
+        """
+        return self.add(ManagedFilter('eth_new_pending_transaction_filter'))
+
+    def new_message_filter(self, topics, decrypt_with=None, from_=None):
+        """
+        Install a Whisper message filter.
+        :return: `ManagedFilter`.
+
+        :param topics: list of `DATA` topics to identify messages.
+        :param decrypt_with: (optional) key ID for description.
+        :param from_: (optional) only accept messages signed by this key.
+        """
+        return self.add(ManagedFilter('shh_new_message_filter', topics=topics,
+                                      decrypt_with=decrypt_with, from_=from_))
+
+    def add(self, filter_):
+        """
+        Install and manage a filter.
+        :return: `filter_`.
+
+        :param filter_: `ManagedFilter`.
+        """
+        results = {}
+        self.reinstall([filter_], results)
+        return self.added(filter_, results)
+
+    def poll(self):
+        """
+        Poll all filters, reinstalling expired filters.
+        :return: dict of `FilterResult` by filter.
+        """
+        filters = list(self.filters)
+        if not filters:
+            return {}
+        batch = self.batch(len(filters) + 1)
+        head, calls = self.poll_calls(batch, filters)
+        batch.execute()
+        results, expired = self.resolve(batch, head, filters, calls)
+        if expired:
+            try:
+                self.reinstall(expired, results)
+            except Exception as error:
+                self.failed(expired, error, results)
+        return results
+
+    def reinstall(self, filters, results):
+        """
+        Install filters, and fill the logs missed by log filters since
+        their last poll.
+
+        :param filters: list of filters.
+        :param results: dict of `FilterResult` by filter, updated in-place.
+        """
+        batch = self.batch(len(filters) + 1)
+        head, calls = self.install_calls(batch, filters)
+        batch.execute()
+        gaps = self.installed(batch, head, filters, calls, results)
+        if gaps:
+            batch = self.batch(len(gaps))
+            calls = self.fill_calls(batch, gaps)
+            batch.execute()
+            self.filled(batch, gaps, calls, results)
+
+    # BOOKKEEPING
+
+    def added(self, filter_, results):
+        """
+        Manage an installed filter, or raise the error installing it.
+        :return: `filter_`.
+
+        :param filter_: `ManagedFilter`.
+        :param results: dict of `FilterResult` from `reinstall`.
+        """
+        error = results[filter_].error
+        if error is not None:
+            raise error
+        self.filters.append(filter_)
+        return filter_
+
+    def poll_calls(self, batch, filters):
+        """
+        Add the calls to poll filters to a batch, skipping filters whose
+        reinstall failed.
+        :return: call for the block number, and list of calls polling
+            each filter, or None.
+
+        :param batch: batch for the client.
+        :param filters: list of filters.
+        """
+        head = batch.eth_block_number()
+        calls = []
+        for filter_ in filters:
+            if filter_.id is None:
+                calls.append(None)
+            else:
+                calls.append(getattr(batch, filter_.changes_method)(filter_.id))
+        return head, calls
+
+    def resolve(self, batch, head, filters, calls):
+        """
+        Process the results of a poll.
+
+        Errors are returned by filter, rather than raised, since the
+        changes of the other filters were consumed by the poll. The
+        block number only advances the cursor of log filters, so an
+        error fetching it is ignored.
+        :return: dict of `FilterResult` by filter, and list of expired
+            filters.
+
+        :param batch: executed batch.
+        :param head: call for the block number.
+        :param filters: list of polled filters.
+        :param calls: list of calls from `poll_calls`.
+        """
+        number = head_number(batch, head)
+        results = {}
+        expired = []
+        for filter_, call in zip(filters, calls):
+            if call is None:
+                expired.append(filter_)
+                continue
+            try:
+                result = batch.unwrap(call)
+            except RPCError as error:
+                if is_filter_not_found(error):
+                    expired.append(filter_)
+                else:
+                    results[filter_] = FilterResult([], error)
+            else:
+                results[filter_] = FilterResult(filter_.update(result, number), None)
+        return results, expired
+
+    def install_calls(self, batch, filters):
+        """
+        Add the calls to install filters to a batch.
+        :return: call for the block number, and list of calls installing
+            each filter.
+
+        :param batch: batch for the client.
+        :param filters: list of filters.
+        """
+        head = batch.eth_block_number()
+        return head, [getattr(batch, i.method)(**i.install_kwds()) for i in filters]
+
+    def installed(self, batch, head, filters, calls, results):
+        """
+        Process the results of installing filters.
+        :return: list of log filters with logs to fill.
+
+        :param batch: executed batch.
+        :param head: call for the block number.
+        :param filters: list of installed filters.
+        :param calls: list of calls installing each filter.
+        :param results: dict of `FilterResult` by filter, updated in-place.
+        """
+        number = head_number(batch, head)
+        gaps = []
+        for filter_, call in zip(filters, calls):
+            try:
+                filter_.installed(batch.unwrap(call), number)
+            except RPCError as error:
+                self.failed([filter_], error, results)
+                continue
+            results[filter_] = FilterResult([], None)
+            if filter_.cursor is not None:
+                gaps.append(filter_)
+        return gaps
+
+    def fill_calls(self, batch, filters):
+        """
+        Add the calls to fetch all logs of reinstalled filters to a batch.
+        :return: list of calls for each filter.
+
+        :param batch: batch for the client.
+        :param filters: list of log filters.
+        """
+        return [batch.eth_get_filter_logs(i.id) for i in filters]
+
+    def filled(self, batch, filters, calls, results):
+        """
+        Process the logs of reinstalled filters.
+
+        :param batch: executed batch.
+        :param filters: list of log filters.
+        :param calls: list of calls from `fill_calls`.
+        :param results: dict of `FilterResult` by filter, updated in-place.
+        """
+        for filter_, call in zip(filters, calls):
+            try:
+                results[filter_] = FilterResult(filter_.fill(batch.unwrap(call)), None)
+            except RPCError as error:
+                self.failed([filter_], error, results)
+
+    def failed(self, filters, error, results):
+        """
+        Record an error reinstalling filters, which are reinstalled again
+        by the next poll.
+
+        :param filters: list of filters.
+        :param error: exception raised.
+        :param results: dict of `FilterResult` by filter, updated in-place.
+        """
+        for filter_ in filters:
+            filter_.id = None
+            results[filter_] = FilterResult([], error)
+
+    def uninstall_calls(self, batch, filters):
+        """
+        Add the calls to uninstall filters to a batch.
+
+        :param batch: batch for the client.
+        :param filters: list of filters.
+        """
+        for filter_ in filters:
+            if filter_.id is not None:
+                getattr(batch, filter_.uninstall_method)(filter_.id)
+
+    def remove(self, filter_):
+        """
+        Uninstall a filter, and stop managing it.
+
+        :param filter_: `ManagedFilter`.
+        """
+        self.filters.remove(filter_)
+        self.uninstall([filter_])
+
+    def close(self):
+        """
+        Uninstall all filters.
+        """
+        filters, self.filters = self.filters, []
+        self.uninstall(filters)
+
+    def uninstall(self, filters):
+        """
+        Uninstall filters, ignoring filters which already expired.
+
+        :param filters: list of filters.
+        """
+        if not filters:
+            return
+        batch = self.batch(len(filters))
+        self.uninstall_calls(batch, filters)
+        batch.execute()
@@ -0,0 +1,337 @@
+'''
+    follow
+    ------
+
+    Reorg-aware following of the chain head.
+
+    The last blocks are kept in a ring buffer, and each new head is
+    linked to the buffer by its parent hash, so a reorg is resolved by
+    fetching only the blocks back to the common ancestor, rather than
+    rescanning the chain.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'ChainEvent',
+    'ChainFollower',
+    'ChainTracker',
+    'DEFAULT_FOLLOW_DEPTH',
+    'DEFAULT_POLL_INTERVAL',
+]
+
+import binascii
+import collections
+import time
+from .decode import RPCError
+from .models import quantity
+
+DEFAULT_FOLLOW_DEPTH = 128
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Event for a block added to, or removed from, the canonical chain.
+# `type` is 'added' or 'removed'.
+ChainEvent = collections.namedtuple('ChainEvent', 'type block')
+
+# Sources for new heads, from most to least efficient.
+SUBSCRIPTION = 'subscription'
+FILTER = 'filter'
+BLOCK_NUMBER = 'block_number'
+
+
+def hex_data(value):
+    '''Convert data to a hex string, if decoded to bytes.'''
+
+    if isinstance(value, bytes):
+        return '0x' + binascii.hexlify(value).decode('ascii')
+    return value
+
+
+def header(block):
+    """
+    Get the number, hash and parent hash of a block, as an integer and
+    hex strings, for raw or decoded blocks and `Block` models.
+
+    :param block: block object.
+    """
+    if isinstance(block, dict):
+        number, hash_, parent = block['number'], block['hash'], block['parentHash']
+    else:
+        number, hash_, parent = block.number, block.hash, block.parent_hash
+    return quantity(number), hex_data(hash_), hex_data(parent)
+
+
+class ChainTracker(object):
+    """
+    Ring buffer of the last `depth` blocks of the canonical chain,
+    producing ordered events as new heads are applied.
+
+    The tracker does no I/O: `missing` returns the hash of the parent
+    block to fetch before a new head can be applied, if any.
+    """
+
+    def __init__(self, depth=DEFAULT_FOLLOW_DEPTH):
+        """
+        Initialize tracker.
+
+        :param depth: number of blocks kept, the deepest reorg resolved
+            incrementally.
+        """
+        if depth < 1:
+            raise ValueError("Depth must be positive.")
+        self.blocks = collections.deque(maxlen=depth)
+
+    def __len__(self):
+        return len(self.blocks)
+
+    @property
+    def head(self):
+        """
+        Get the current head block, or None.
+        """
+        if self.blocks:
+            return self.blocks[-1][2]
+        return None
+
+    def hashes(self):
+        """
+        Get the hashes of the buffered blocks, from oldest to newest.
+        """
+        return [i[1] for i in self.blocks]
+
+    def behind(self, number):
+        """
+        Get if the buffered head is older than block `number`.
+
+        :param number: block number of the node's head.
+        """
+        head = self.head
+        return head is None or number > header(head)[0]
+
+    def missing(self, block):
+        """
+        Get the hash of the parent to fetch before applying the chain
+        starting with `block`, or None once it links to the buffer.
+
+        :param block: oldest block of the new chain.
+        """
+        if not self.blocks:
+            return None
+        number, hash_, parent = header(block)
+        hashes = self.hashes()
+        if hash_ in hashes or parent in hashes or number <= self.blocks[0][0]:
+            return None
+        return parent
+
+    def apply(self, chain):
+        """
+        Apply a new chain, ending with the new head.
+        :return: list of events, blocks removed from newest to oldest,
+            followed by blocks added from oldest to newest.
+
+        :param chain: list of contiguous blocks, from oldest to newest.
+        """
+        hashes = self.hashes()
+        _, hash_, parent = header(chain[0])
+        if hash_ in hashes:
+            index = hashes.index(hash_)
+            chain = chain[1:]
+        elif parent in hashes:
+            index = hashes.index(parent)
+        else:
+            # new tracker, or a reorg deeper than the buffer
+            index = -1
+
+        events = []
+        while len(self.blocks) > index + 1:
+            events.append(ChainEvent('removed', self.blocks.pop()[2]))
+        for block in chain:
+            number, hash_, _ = header(block)
+            self.blocks.append((number, hash_, block))
+            events.append(ChainEvent('added', block))
+        return events
+
+
+class ChainFollower(object):
+    """
+    Synchronous follower of the chain head, yielding `ChainEvent`s.
+    New heads are polled from a block filter, or from `eth_blockNumber`
+    if the node does not support filters.
+
+        >>> for event in ChainFollower(client):
+        ...     print(event.type, event.block['number'])
+
+    Parameters are built and the filter state kept without I/O, so the
+    asynchronous follower only overrides the methods fetching from the
+    node.
+    """
+
+    def __init__(self, client, depth=DEFAULT_FOLLOW_DEPTH,
+                 interval=DEFAULT_POLL_INTERVAL, full_transactions=False):
+        """
+        Initialize follower.
+
+        :param client: synchronous client.
+        :param depth: number of blocks kept to resolve reorgs.
+        :param interval: seconds between polls.
+        :param full_transactions: return full transaction objects.
+        """
+        self.client = client
+        self.tracker = ChainTracker(depth)
+        self.interval = interval
+        self.full_transactions = full_transactions
+        self.mode = None
+        self.filter_id = None
+
+    def __iter__(self):
+        return self.events()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def events(self):
+        """
+        Yield events for the canonical chain, indefinitely.
+        """
+        try:
+            # install before fetching the head, so no new heads are missed
+            self.install()
+            for event in self.update(self.block_by_number('latest')):
+                yield event
+            while True:
+                for event in self.poll():
+                    yield event
+                time.sleep(self.interval)
+        finally:
+            self.close()
+
+    def poll(self):
+        """
+        Poll the node for new heads once.
+        :return: list of events.
+        """
+        if self.mode is None:
+            self.install()
+        if self.mode == FILTER:
+            try:
+                hashes = self.client.fetch('eth_getFilterChanges', self.changes_params())
+            except RPCError:
+                # filter expired, reinstall or fall back to the block number
+                self.install()
+                return self.update(self.block_by_number('latest'))
+            return [j for i in hashes[-1:] for j in self.update(self.block_by_hash(i))]
+
+        number = quantity(self.client.fetch('eth_blockNumber', []))
+        if self.tracker.behind(number):
+            return self.update(self.block_by_number(number))
+        return []
+
+    def update(self, block):
+        """
+        Apply a new head, fetching parents back to the buffered chain.
+        :return: list of events.
+
+        :param block: new head block, or None if not yet available.
+        """
+        if block is None:
+            return []
+        chain = [block]
+        parent = self.tracker.missing(block)
+        while parent is not None:
+            chain.insert(0, self.block_by_hash(parent))
+            parent = self.tracker.missing(chain[0])
+        return self.tracker.apply(chain)
+
+    def install(self):
+        """
+        Install a block filter, falling back to polling the block number
+        if the node does not support filters.
+        """
+        try:
+            self.installed(self.client.fetch('eth_newBlockFilter', []))
+        except RPCError:
+            self.installed(None)
+
+    def close(self):
+        """
+        Uninstall the block filter, if any.
+        """
+        params = self.uninstall_params()
+        if params is not None:
+            try:
+                self.client.fetch('eth_uninstallFilter', params)
+            except RPCError:
+                pass
+
+    def block_by_hash(self, hash_):
+        """
+        Fetch a block by hash.
+
+        :param hash_: block hash.
+        """
+        return self.client.fetch('eth_getBlockByHash', self.hash_params(hash_))
+
+    def block_by_number(self, number):
+        """
+        Fetch a block by number or tag.
+
+        :param number: block number or tag.
+        """
+        return self.client.fetch('eth_getBlockByNumber', self.number_params(number))
+
+    # BOOKKEEPING
+
+    def installed(self, filter_id):
+        """
+        Store the ID of the installed block filter, or fall back to
+        polling the block number.
+
+        :param filter_id: filter ID returned by the node, or None.
+        """
+        if filter_id is None:
+            self.filter_id = None
+            self.mode = BLOCK_NUMBER
+        else:
+            self.filter_id = quantity(filter_id)
+            self.mode = FILTER
+
+    def uninstall_params(self):
+        """
+        Forget the block filter.
+        :return: parameters to uninstall the filter, or None.
+        """
+        if self.filter_id is None:
+            return None
+        params = self.client.params('eth_uninstall_filter', self.filter_id)
+        self.filter_id = None
+        self.mode = None
+        return params
+
+    def changes_params(self):
+        """
+        Get parameters to poll the block filter.
+        """
+        return self.client.params('eth_get_filter_changes', self.filter_id)
+
+    def hash_params(self, hash_):
+        """
+        Get parameters to fetch a block by hash.
+
+        :param hash_: block hash, as hex or bytes.
+        """
+        return self.client.params('eth_get_block_by_hash', hex_data(hash_), self.full_transactions)
+
+    def number_params(self, number):
+        """
+        Get parameters to fetch a block by number or tag.
+
+        :param number: block number or tag.
+        """
+        return self.client.params('eth_get_block_by_number', number, self.full_transactions)
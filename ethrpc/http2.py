@@ -0,0 +1,136 @@
+'''
+    http2
+    -----
+
+    Module for the synchronous HTTP/2 Ethereum RPC client, using `httpx`.
+
+    Concurrent requests are multiplexed as streams over a few
+    connections, rather than each taking a connection of its own.
+    Requires `pip install httpx[http2]`, but not `aiohttp`.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'HTTP2Client',
+    'DEFAULT_HTTP2_CONNECTIONS',
+]
+
+import httpx
+from .core import AbstractClient, JSON_HEADERS, LOCALHOST_HTTP_ENDPOINT
+from .stream import STREAM_CHUNK_SIZE
+
+DEFAULT_HTTP2_CONNECTIONS = 4
+
+
+def http2_options(max_connections, prior_knowledge, timeout, transport):
+    """
+    Get keyword arguments for an `httpx` client.
+
+    :param max_connections: maximum connections to the endpoint.
+    :param prior_knowledge: speak HTTP/2 without negotiation (h2c).
+    :param timeout: seconds to wait for a response, a `(connect, read)`
+        tuple, an `httpx.Timeout`, or None.
+    :param transport: (optional) `httpx` transport.
+    """
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        timeout = httpx.Timeout(None, connect=connect, read=read)
+    elif not isinstance(timeout, httpx.Timeout):
+        timeout = httpx.Timeout(timeout)
+    options = {
+        'http1': not prior_knowledge,
+        'http2': True,
+        'limits': httpx.Limits(max_connections=max_connections,
+                               max_keepalive_connections=max_connections),
+        'timeout': timeout,
+    }
+    if transport is not None:
+        options['transport'] = transport
+    return options
+
+
+class HTTP2Client(AbstractClient):
+    """
+    Synchronous client using HTTP/2. Calls from multiple threads are
+    multiplexed over at most `max_connections` connections.
+
+    HTTPS endpoints negotiate HTTP/2 with ALPN, falling back to
+    HTTP/1.1. Plain HTTP endpoints, such as a local node behind an
+    HTTP/2-capable proxy, require `prior_knowledge` to use HTTP/2 (h2c).
+
+        >>> with HTTP2Client('http://127.0.0.1:8080', prior_knowledge=True) as client:
+        ...     client.eth_block_number()
+    """
+
+    def __init__(self, endpoint = LOCALHOST_HTTP_ENDPOINT,
+                 max_connections = DEFAULT_HTTP2_CONNECTIONS,
+                 prior_knowledge = False, timeout = None, transport = None,
+                 **kwds):
+        """
+        Initialize client.
+        :param endpoint: address of the Ethereum RPC.
+        :param max_connections: maximum connections to the endpoint.
+        :param prior_knowledge: speak HTTP/2 without negotiation (h2c).
+        :param timeout: (optional) seconds to wait for a response, a
+            `(connect, read)` tuple, or an `httpx.Timeout`.
+        :param transport: (optional) `httpx` transport, for testing.
+        :param kwds: optional arguments for `AbstractClient`, such as `decode`.
+        """
+        super(HTTP2Client, self).__init__(endpoint, **kwds)
+        options = http2_options(max_connections, prior_knowledge, timeout, transport)
+        self.session = httpx.Client(**options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def call(self, payload):
+        """
+        Make calls to the API via the HTTP POST method and JSON payload,
+        retrying failures if the retry policy allows.
+        :return: `httpx.Response` object
+        """
+        if self.retry is not None and self.retry.retryable(self, payload):
+            return self.retry.call(self.send, payload)
+        return self.send(payload)
+
+    def send(self, payload):
+        """
+        Send a JSON payload once, waiting for the rate limiter if set.
+        :return: `httpx.Response` object
+        """
+        if self.limiter is None:
+            return self.post(payload)
+        return self.limiter.call(self, self.post, payload)
+
+    def post(self, payload):
+        """
+        Send a JSON payload in a single HTTP POST request.
+        :return: `httpx.Response` object
+        """
+        data = self.codec.dumps(payload)
+        return self.session.post(self.endpoint, content=data, headers=JSON_HEADERS)
+
+    def call_stream(self, payload):
+        """
+        Make calls to the API via the HTTP POST method and JSON payload,
+        without buffering the response body.
+        :return: generator over chunks of the response body
+        """
+        data = self.codec.dumps(payload)
+        with self.session.stream('POST', self.endpoint, content=data, headers=JSON_HEADERS) as response:
+            for chunk in response.iter_bytes(STREAM_CHUNK_SIZE):
+                yield chunk
+
+    def close(self):
+        """
+        Close the connections.
+        """
+        self.session.close()
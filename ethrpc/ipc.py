@@ -0,0 +1,197 @@
+'''
+    ipc
+    ---
+
+    Module for the synchronous Unix-domain-socket Ethereum RPC client.
+
+    Geth and Parity both write each IPC response as a single line of
+    JSON, so responses are framed by newlines, while values spanning
+    several lines are still accepted.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'JSONStream',
+    'IPCClient',
+]
+
+import socket
+import threading
+from .codec import json_loads
+from .core import AbstractClient, DEFAULT_IPC_PATH
+
+# Size of each read from the socket.
+READ_SIZE = 65536
+
+
+class JSONStream(object):
+    """
+    Incremental decoder for newline-delimited JSON values.
+    """
+
+    def __init__(self, loads=json_loads):
+        """
+        Initialize stream.
+        :param loads: function to parse JSON bytes.
+        """
+        self.loads = loads
+        self.chunks = []
+        self.lines = []
+
+    def feed(self, data):
+        """
+        Feed bytes read from the socket.
+        :return: list of complete JSON values.
+
+        :param data: bytes read from the socket.
+        """
+        if b'\n' not in data:
+            self.chunks.append(data)
+            return []
+
+        parts = data.split(b'\n')
+        parts[0] = b''.join(self.chunks) + parts[0]
+        self.chunks = [parts.pop()]
+
+        values = []
+        for line in parts:
+            if not line.strip():
+                continue
+            # a value spanning several lines is decoded once complete,
+            # but a malformed line must not stall the stream.
+            self.lines.append(line)
+            for lines in (self.lines, [line]):
+                try:
+                    values.append(self.loads(b'\n'.join(lines)))
+                except ValueError:
+                    continue
+                self.lines = []
+                break
+        return values
+
+
+class IPCClient(AbstractClient):
+    """
+    Synchronous client using a Unix domain socket to a co-located node.
+    Each method returns the JSON response object. Calls from multiple
+    threads share one connection, and are serialized.
+    """
+
+    def __init__(self, endpoint = DEFAULT_IPC_PATH, timeout = None, **kwds):
+        """
+        Initialize client. The connection is opened on the first call.
+        :param endpoint: path to the node's IPC socket.
+        :param timeout: (optional) socket timeout in seconds.
+        :param kwds: optional arguments for `AbstractClient`, such as `decode`.
+        """
+        super(IPCClient, self).__init__(endpoint, **kwds)
+        self.timeout = timeout
+        self.socket = None
+        self.json_stream = None
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def connect(self):
+        """
+        Open the socket, if it is not already open.
+        """
+        if self.socket is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.endpoint)
+            self.socket = sock
+            self.json_stream = JSONStream(self.codec.loads)
+
+    def close(self):
+        """
+        Close the socket.
+        """
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+    def call(self, payload):
+        """
+        Make calls to the API over the socket, retrying failures if the
+        retry policy allows. The connection is reopened after a failure.
+        :return: JSON response object, or list of response objects for a
+            batch payload.
+        """
+        if self.retry is not None and self.retry.retryable(self, payload):
+            return self.retry.call(self.send, payload)
+        return self.send(payload)
+
+    def send(self, payload):
+        """
+        Send a JSON payload once, waiting for the rate limiter if set.
+        :return: JSON response object, or list of response objects
+        """
+        if self.limiter is None:
+            return self.exchange(payload)
+        return self.limiter.call(self, self.exchange, payload)
+
+    def exchange(self, payload):
+        """
+        Send a JSON payload over the socket and read the response.
+        :return: JSON response object, or list of response objects for a
+            batch payload.
+        """
+        data = self.codec.dumps(payload) + b'\n'
+        with self.__lock:
+            self.connect()
+            try:
+                self.socket.sendall(data)
+                return self.__receive(payload)
+            except:
+                # the stream may be left mid-response, reconnect next call.
+                self.close()
+                raise
+
+    def parse(self, response):
+        """
+        Responses are parsed when received.
+        :return: JSON response object
+        """
+        return response
+
+    def content(self, response):
+        """
+        Serialize a response, which is parsed when received.
+        :return: JSON response body
+        """
+        return self.codec.dumps(response)
+
+    # PRIVATE
+
+    def __receive(self, payload):
+        """
+        Read values from the socket until the response to payload.
+        Values for other requests, such as notifications, are discarded.
+        """
+        if isinstance(payload, list):
+            # a rejected batch returns a single error object, without id.
+            matches = lambda value: isinstance(value, list) or \
+                ('error' in value and value.get('id') is None)
+        else:
+            matches = lambda value: isinstance(value, dict) and value.get('id') == payload['id']
+
+        while True:
+            data = self.socket.recv(READ_SIZE)
+            if not data:
+                raise ConnectionError("IPC connection closed.")
+            for value in self.json_stream.feed(data):
+                if matches(value):
+                    return value
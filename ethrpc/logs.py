@@ -0,0 +1,218 @@
+'''
+    logs
+    ----
+
+    Adaptive block ranges for `eth_getLogs`.
+
+    Nodes reject or time out on log queries over large block ranges or
+    busy contracts, so ranges are bisected when a query fails for being
+    too large, and the window grows again while results are sparse.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'is_range_error',
+    'LogRange',
+    'LogWindow',
+    'DEFAULT_LOGS_CONCURRENCY',
+    'DEFAULT_LOGS_TARGET',
+    'DEFAULT_LOGS_WINDOW',
+]
+
+import collections
+import re
+import socket
+from .decode import RPCError
+
+try:
+    import requests
+    REQUESTS_TIMEOUT = (requests.exceptions.Timeout,)
+except ImportError:
+    REQUESTS_TIMEOUT = ()
+
+try:
+    import asyncio
+    ASYNCIO_TIMEOUT = (asyncio.TimeoutError,)
+except ImportError:
+    ASYNCIO_TIMEOUT = ()
+
+DEFAULT_LOGS_CONCURRENCY = 4
+DEFAULT_LOGS_TARGET = 5000
+DEFAULT_LOGS_WINDOW = 1000
+MAX_LOGS_WINDOW = 1000000
+
+# Error code for limits exceeded, from EIP-1474. Hosted nodes also use
+# it for rate limits, so it is only a range error without a rate-limit
+# message.
+LIMIT_EXCEEDED = -32005
+
+# Error messages from Geth, Parity and hosted nodes for queries that
+# return too many results, span too many blocks, or take too long.
+RANGE_ERROR = re.compile(
+    r'more than \d+|too many (?:results|logs|blocks)|range (?:is )?too (?:large|wide|big)'
+    r'|response (?:size|is too)|(?:block )?range (?:limit|exceed)|max(?:imum)? (?:block )?range'
+    r'|limited to (?:a )?\d+|query timeout|timed out',
+    re.I)
+
+# Error messages for rate limits and quotas, where bisecting the range
+# would only multiply the requests.
+RATE_LIMIT_ERROR = re.compile(
+    r'rate.?limit|too many requests|request (?:limit|count|rate)|per second|capacity'
+    r'|daily|quota|throttl|\b429\b',
+    re.I)
+
+TIMEOUT_ERRORS = (socket.timeout,) + REQUESTS_TIMEOUT + ASYNCIO_TIMEOUT
+
+
+def is_range_error(error):
+    """
+    Get if a log query failed since the block range was too large.
+
+    :param error: exception raised by the query.
+    """
+    if isinstance(error, RPCError):
+        message = error.message or ''
+        if RATE_LIMIT_ERROR.search(message):
+            return False
+        return error.code == LIMIT_EXCEEDED or bool(RANGE_ERROR.search(message))
+    return isinstance(error, TIMEOUT_ERRORS)
+
+
+class LogRange(object):
+    """
+    Inclusive block range for a single log query, and its logs once
+    fetched.
+    """
+
+    __slots__ = ('start', 'end', 'logs', 'future')
+
+    def __init__(self, start, end):
+        """
+        Initialize range.
+
+        :param start: first block number.
+        :param end: last block number (inclusive).
+        """
+        self.start = start
+        self.end = end
+        self.logs = None
+        self.future = None
+
+    def __len__(self):
+        return self.end - self.start + 1
+
+    def __repr__(self):
+        return 'LogRange({}, {})'.format(self.start, self.end)
+
+    def split(self):
+        """
+        Bisect the range.
+        :return: two ranges, covering the same blocks.
+        """
+        middle = self.start + len(self) // 2 - 1
+        return LogRange(self.start, middle), LogRange(middle + 1, self.end)
+
+
+class LogWindow(object):
+    """
+    Plan the block ranges for log queries from `start` to `end`, and
+    keep the ranges in block order until their logs are consumed.
+    """
+
+    def __init__(self, start, end, window=DEFAULT_LOGS_WINDOW,
+                 target=DEFAULT_LOGS_TARGET, max_window=MAX_LOGS_WINDOW,
+                 max_ranges=None):
+        """
+        Initialize window.
+
+        :param start: first block number.
+        :param end: last block number (inclusive).
+        :param window: initial number of blocks per query.
+        :param target: target number of logs per query.
+        :param max_window: maximum number of blocks per query.
+        :param max_ranges: (optional) maximum ranges planned but not
+            consumed, defaults to no limit.
+        """
+        self.cursor = start
+        self.end = end
+        self.window = max(1, window)
+        self.target = target
+        self.max_window = max_window
+        self.max_ranges = max_ranges
+        self.ranges = collections.deque()
+
+    def done(self):
+        """
+        Get if all ranges have been planned and consumed.
+        """
+        return self.cursor > self.end and not self.ranges
+
+    def pending(self, count):
+        """
+        Get up to `count` ranges to fetch, in block order, planning new
+        ranges as needed. No ranges are planned past `max_ranges`, so
+        a slow range at the front of the window stops the queries ahead
+        of it, rather than buffering their logs until it completes.
+
+        :param count: maximum number of ranges.
+        """
+        ranges = [i for i in self.ranges if i.logs is None and i.future is None][:count]
+        while len(ranges) < count and self.cursor <= self.end and not self.full():
+            log_range = LogRange(self.cursor, min(self.cursor + self.window - 1, self.end))
+            self.cursor = log_range.end + 1
+            self.ranges.append(log_range)
+            ranges.append(log_range)
+        return ranges
+
+    def full(self):
+        """
+        Get if `max_ranges` ranges are planned but not consumed.
+        """
+        return self.max_ranges is not None and len(self.ranges) >= self.max_ranges
+
+    def complete(self, log_range, logs):
+        """
+        Store the logs for a range, and adapt the window to the number
+        of results.
+
+        :param log_range: fetched range.
+        :param logs: list of logs for the range.
+        """
+        log_range.logs = logs
+        log_range.future = None
+        if len(logs) > self.target:
+            self.window = max(1, self.window // 2)
+        elif len(logs) < self.target // 2 and len(log_range) >= self.window:
+            self.window = min(2 * self.window, self.max_window)
+
+    def fail(self, log_range, error):
+        """
+        Bisect a range whose query failed for being too large, or
+        raise the error.
+
+        :param log_range: failed range.
+        :param error: exception raised by the query.
+        """
+        if len(log_range) == 1 or not is_range_error(error):
+            raise error
+        self.window = max(1, min(self.window, len(log_range) // 2))
+        index = self.ranges.index(log_range)
+        del self.ranges[index]
+        for i in reversed(log_range.split()):
+            self.ranges.insert(index, i)
+
+    def consume(self):
+        """
+        Pop the logs for ranges at the front of the window which have
+        been fetched.
+        :return: list of logs, in block order.
+        """
+        logs = []
+        while self.ranges and self.ranges[0].logs is not None:
+            logs.extend(self.ranges.popleft().logs)
+        return logs
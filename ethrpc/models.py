@@ -0,0 +1,268 @@
+'''
+    models
+    ------
+
+    Compact models for blocks, transactions, receipts, logs and traces.
+
+    Models use `__slots__` rather than a per-instance `__dict__`, and store
+    hashes, addresses and other data as `bytes` and quantities as `int`,
+    which is several times smaller than the dict of hex strings parsed
+    from the JSON response.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'Block',
+    'Log',
+    'Receipt',
+    'Trace',
+    'Transaction',
+    'MODEL_DECODERS',
+]
+
+import binascii
+import six
+from .decode import DECODERS, array
+
+# CONVERTERS
+
+
+def identity(value):
+    '''Keep value as parsed from JSON.'''
+
+    return value
+
+
+def quantity(value):
+    '''Convert hex quantity to an integer, if not already decoded.'''
+
+    if isinstance(value, six.integer_types):
+        return value
+    return int(value, 16)
+
+
+def data(value):
+    '''Convert hex data, such as a hash or address, to bytes.'''
+
+    return binascii.unhexlify(value[2:] if value.startswith('0x') else value)
+
+
+def datas(values):
+    '''Convert list of hex data to a list of bytes.'''
+
+    return [data(i) for i in values]
+
+
+class Model(object):
+    """
+    Base class for compact models.
+
+    Subclasses declare `fields`, a sequence of `(attribute, key,
+    converter)`, where `key` is the field name in the JSON object.
+    Missing or null fields are stored as `None`.
+    """
+
+    __slots__ = ()
+    fields = ()
+
+    def __init__(self, **kwds):
+        for name in self.__slots__:
+            setattr(self, name, kwds.pop(name, None))
+        if kwds:
+            raise TypeError("Unexpected fields {}.".format(', '.join(sorted(kwds))))
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(getattr(self, i) == getattr(other, i) for i in self.__slots__)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        attributes = ', '.join('{}={!r}'.format(i, getattr(self, i)) for i in self.__slots__)
+        return '{}({})'.format(type(self).__name__, attributes)
+
+    def __getstate__(self):
+        return tuple(getattr(self, i) for i in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in six.moves.zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    @classmethod
+    def from_json(cls, obj):
+        """
+        Create model from a JSON object.
+        :return: model, or `obj` if it is not an object.
+
+        :param obj: parsed JSON object.
+        """
+        if not isinstance(obj, dict):
+            return obj
+        get = obj.get
+        self = cls.__new__(cls)
+        for name, key, converter in cls.fields:
+            value = get(key)
+            setattr(self, name, None if value is None else converter(value))
+        return self
+
+
+def model(name, fields, doc):
+    '''Create a compact model class from a field declaration.'''
+
+    fields = tuple(fields)
+    namespace = {
+        '__doc__': doc,
+        '__slots__': tuple(i[0] for i in fields),
+        'fields': fields,
+    }
+    return type(name, (Model,), namespace)
+
+
+Log = model('Log', [
+    ('address', 'address', data),
+    ('block_hash', 'blockHash', data),
+    ('block_number', 'blockNumber', quantity),
+    ('data', 'data', data),
+    ('log_index', 'logIndex', quantity),
+    ('removed', 'removed', identity),
+    ('topics', 'topics', datas),
+    ('transaction_hash', 'transactionHash', data),
+    ('transaction_index', 'transactionIndex', quantity),
+], """
+    Compact model for an event log.
+    """)
+
+Transaction = model('Transaction', [
+    ('block_hash', 'blockHash', data),
+    ('block_number', 'blockNumber', quantity),
+    ('chain_id', 'chainId', quantity),
+    ('from_', 'from', data),
+    ('gas', 'gas', quantity),
+    ('gas_price', 'gasPrice', quantity),
+    ('hash', 'hash', data),
+    ('input', 'input', data),
+    ('max_fee_per_gas', 'maxFeePerGas', quantity),
+    ('max_priority_fee_per_gas', 'maxPriorityFeePerGas', quantity),
+    ('nonce', 'nonce', quantity),
+    ('r', 'r', quantity),
+    ('s', 's', quantity),
+    ('to', 'to', data),
+    ('transaction_index', 'transactionIndex', quantity),
+    ('type', 'type', quantity),
+    ('v', 'v', quantity),
+    ('value', 'value', quantity),
+], """
+    Compact model for a transaction.
+    """)
+
+
+def transactions(values):
+    '''Convert list of transaction hashes or objects.'''
+
+    return [data(i) if isinstance(i, six.string_types) else Transaction.from_json(i) for i in values]
+
+
+Block = model('Block', [
+    ('base_fee_per_gas', 'baseFeePerGas', quantity),
+    ('difficulty', 'difficulty', quantity),
+    ('extra_data', 'extraData', data),
+    ('gas_limit', 'gasLimit', quantity),
+    ('gas_used', 'gasUsed', quantity),
+    ('hash', 'hash', data),
+    ('logs_bloom', 'logsBloom', data),
+    ('miner', 'miner', data),
+    ('mix_hash', 'mixHash', data),
+    ('nonce', 'nonce', data),
+    ('number', 'number', quantity),
+    ('parent_hash', 'parentHash', data),
+    ('receipts_root', 'receiptsRoot', data),
+    ('sha3_uncles', 'sha3Uncles', data),
+    ('size', 'size', quantity),
+    ('state_root', 'stateRoot', data),
+    ('timestamp', 'timestamp', quantity),
+    ('total_difficulty', 'totalDifficulty', quantity),
+    ('transactions', 'transactions', transactions),
+    ('transactions_root', 'transactionsRoot', data),
+    ('uncles', 'uncles', datas),
+], """
+    Compact model for a block. Transactions are hashes, unless full
+    transaction objects were requested.
+    """)
+
+Receipt = model('Receipt', [
+    ('block_hash', 'blockHash', data),
+    ('block_number', 'blockNumber', quantity),
+    ('contract_address', 'contractAddress', data),
+    ('cumulative_gas_used', 'cumulativeGasUsed', quantity),
+    ('effective_gas_price', 'effectiveGasPrice', quantity),
+    ('from_', 'from', data),
+    ('gas_used', 'gasUsed', quantity),
+    ('logs', 'logs', array(Log.from_json)),
+    ('logs_bloom', 'logsBloom', data),
+    ('root', 'root', data),
+    ('status', 'status', quantity),
+    ('to', 'to', data),
+    ('transaction_hash', 'transactionHash', data),
+    ('transaction_index', 'transactionIndex', quantity),
+    ('type', 'type', quantity),
+], """
+    Compact model for a transaction receipt.
+    """)
+
+Trace = model('Trace', [
+    ('action', 'action', identity),
+    ('block_hash', 'blockHash', data),
+    ('block_number', 'blockNumber', identity),
+    ('error', 'error', identity),
+    ('result', 'result', identity),
+    ('subtraces', 'subtraces', identity),
+    ('trace_address', 'traceAddress', identity),
+    ('transaction_hash', 'transactionHash', data),
+    ('transaction_position', 'transactionPosition', identity),
+    ('type', 'type', identity),
+], """
+    Compact model for a Parity trace. The `action` and `result` objects
+    are kept as parsed, since their fields depend on the trace type.
+    """)
+
+
+def filter_change(value):
+    '''Convert a filter change, a block or transaction hash, or a log.'''
+
+    if isinstance(value, six.string_types):
+        return data(value)
+    return Log.from_json(value)
+
+
+# Decoders producing models, for use as `AbstractClient(decode=MODEL_DECODERS)`.
+MODEL_DECODERS = dict(DECODERS)
+MODEL_DECODERS.update({
+    'eth_get_block_by_hash': Block.from_json,
+    'eth_get_block_by_number': Block.from_json,
+    'eth_get_filter_changes': array(filter_change),
+    'eth_get_filter_logs': array(Log.from_json),
+    'eth_get_logs': array(Log.from_json),
+    'eth_get_transaction_by_block_hash_and_index': Transaction.from_json,
+    'eth_get_transaction_by_block_number_and_index': Transaction.from_json,
+    'eth_get_transaction_by_hash': Transaction.from_json,
+    'eth_get_transaction_receipt': Receipt.from_json,
+    'eth_get_uncle_by_block_hash_and_index': Block.from_json,
+    'eth_get_uncle_by_block_number_and_index': Block.from_json,
+    'parity_get_block_header_by_number': Block.from_json,
+    'trace_block': array(Trace.from_json),
+    'trace_filter': array(Trace.from_json),
+    'trace_get': Trace.from_json,
+    'trace_transaction': array(Trace.from_json),
+})
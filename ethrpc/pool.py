@@ -0,0 +1,488 @@
+'''
+    pool
+    ----
+
+    Client balancing requests over multiple nodes.
+
+    Each request is routed to the healthy node with the lowest expected
+    wait, from an exponentially weighted moving average (EWMA) of its
+    latency and its number of in-flight requests. Nodes are probed
+    periodically, and nodes which are down, syncing, or lagging behind
+    the highest head are ejected until they recover.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'NodePool',
+    'PoolNode',
+    'PooledClient',
+    'DEFAULT_HEDGE_SAMPLES',
+    'DEFAULT_MAX_LAG',
+    'DEFAULT_PROBE_INTERVAL',
+]
+
+import collections
+import concurrent.futures
+import threading
+import weakref
+from .client import Client
+from .core import AbstractClient
+from .fanout import DEFAULT_WORKERS
+from .models import quantity
+from .retry import is_idempotent, monotonic
+
+DEFAULT_EWMA_ALPHA = 0.3
+DEFAULT_HEDGE_SAMPLES = 20
+DEFAULT_LATENCY_WINDOW = 200
+DEFAULT_MAX_LAG = 5
+DEFAULT_PROBE_INTERVAL = 5.0
+
+
+class PoolNode(object):
+    """
+    Node within a pool, with its routing statistics.
+    """
+
+    def __init__(self, client):
+        """
+        Initialize node.
+
+        :param client: client for the node.
+        """
+        self.client = client
+        self.limiter = None
+        self.latency = None
+        self.inflight = 0
+        self.healthy = True
+        self.head = None
+
+    def __repr__(self):
+        return 'PoolNode({!r}, latency={}, inflight={}, healthy={}, head={})'.format(
+            self.client.endpoint, self.latency, self.inflight, self.healthy, self.head)
+
+    @property
+    def endpoint(self):
+        """
+        Address of the node.
+        """
+        return self.client.endpoint
+
+    def score(self):
+        """
+        Get expected wait for a new request, lower is better.
+        Nodes without latency samples are preferred, to measure them.
+        """
+        return (self.latency or 0.0) * (self.inflight + 1), self.inflight
+
+
+class NodePool(object):
+    """
+    Thread-safe routing state for a set of nodes.
+    """
+
+    def __init__(self, clients, max_lag=DEFAULT_MAX_LAG, alpha=DEFAULT_EWMA_ALPHA):
+        """
+        Initialize pool.
+
+        :param clients: clients for each node.
+        :param max_lag: maximum blocks a node may lag behind the highest
+            head before it is ejected.
+        :param alpha: weight of each new latency sample in the EWMA.
+        """
+        if not clients:
+            raise ValueError("Pool requires at least one node.")
+        self.nodes = [PoolNode(i) for i in clients]
+        self.max_lag = max_lag
+        self.alpha = alpha
+        self.latencies = collections.deque(maxlen=DEFAULT_LATENCY_WINDOW)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def head(self):
+        """
+        Get the highest head reported by any healthy node, or None.
+        """
+        heads = [i.head for i in self.nodes if i.healthy and i.head is not None]
+        return max(heads) if heads else None
+
+    def available(self):
+        """
+        Get the nodes requests may be routed to: healthy nodes within
+        `max_lag` blocks of the highest head, or every node if all nodes
+        are ejected.
+        """
+        head = self.head()
+        nodes = [i for i in self.nodes if i.healthy and not self.lagging(i, head)]
+        return nodes or self.nodes
+
+    def lagging(self, node, head):
+        """
+        Get if a node lags too far behind the head.
+
+        :param node: pool node.
+        :param head: highest head, or None.
+        """
+        return head is not None and node.head is not None and head - node.head > self.max_lag
+
+    def quantile(self, q):
+        """
+        Get a quantile of the recent request latencies over all nodes,
+        or None if there are too few samples.
+
+        :param q: quantile, from 0 to 1.
+        """
+        with self.lock:
+            latencies = sorted(self.latencies)
+        if len(latencies) < DEFAULT_HEDGE_SAMPLES:
+            return None
+        return latencies[int(q * (len(latencies) - 1))]
+
+    def acquire(self, exclude=None):
+        """
+        Select the node for a new request, counting it as in flight.
+        :return: pool node.
+
+        :param exclude: (optional) node to avoid, if any other node
+            is available.
+        """
+        with self.lock:
+            nodes = self.available()
+            nodes = [i for i in nodes if i is not exclude] or nodes
+            node = min(nodes, key=PoolNode.score)
+            node.inflight += 1
+            return node
+
+    def release(self, node, elapsed=None, error=None):
+        """
+        Record the result of a request.
+
+        :param node: pool node returned by `acquire`.
+        :param elapsed: (optional) seconds taken by the request, or None
+            if the request was abandoned.
+        :param error: (optional) exception raised by the transport,
+            ejecting the node until its next successful probe.
+        """
+        with self.lock:
+            node.inflight -= 1
+            if error is not None:
+                node.healthy = False
+            elif elapsed is not None:
+                self.sample(node, elapsed)
+                self.latencies.append(elapsed)
+
+    def sample(self, node, elapsed):
+        """
+        Add a latency sample to the EWMA, with the lock held.
+
+        :param node: pool node.
+        :param elapsed: seconds taken by the request.
+        """
+        if node.latency is None:
+            node.latency = elapsed
+        else:
+            node.latency += self.alpha * (elapsed - node.latency)
+
+    def probe_calls(self, batch):
+        """
+        Add the health probe calls to a batch for a node.
+        :return: list of deferred results.
+
+        :param batch: batch for the node's client.
+        """
+        return [batch.net_listening(), batch.eth_syncing(), batch.eth_block_number()]
+
+    def update(self, node, batch, calls, elapsed, error=None):
+        """
+        Update node health from the results of a probe. Nodes which are
+        not listening, are syncing, or fail to respond are ejected.
+
+        :param node: pool node.
+        :param batch: executed batch.
+        :param calls: deferred results from `probe_calls`.
+        :param elapsed: seconds taken by the probe.
+        :param error: (optional) exception raised by the probe.
+        """
+        try:
+            if error is not None:
+                raise error
+            listening, syncing, head = [batch.unwrap(i) for i in calls]
+            head = quantity(head)
+        except Exception:
+            with self.lock:
+                node.healthy = False
+            return
+        with self.lock:
+            node.healthy = bool(listening) and not syncing
+            node.head = head
+            self.sample(node, elapsed)
+
+
+class PooledClient(AbstractClient):
+    """
+    Synchronous client balancing requests over multiple nodes.
+
+        >>> client = PooledClient(['http://node1:8545', 'http://node2:8545'])
+        >>> client.eth_block_number()
+    """
+
+    def __init__(self, endpoints, client_type=Client, max_lag=DEFAULT_MAX_LAG,
+                 probe_interval=DEFAULT_PROBE_INTERVAL, hedge=None,
+                 max_concurrency=DEFAULT_WORKERS, **kwds):
+        """
+        Initialize client.
+
+        :param endpoints: addresses of the Ethereum RPCs, or clients.
+        :param client_type: client class for each address.
+        :param max_lag: maximum blocks a node may lag behind the highest
+            head before it is ejected.
+        :param probe_interval: seconds between health probes, or None
+            to only probe on calls to `probe`.
+        :param hedge: (optional) latency quantile, such as 0.95, after
+            which a call to an idempotent method is duplicated to a
+            second node, whose response is used if the first node fails.
+        :param max_concurrency: number of threads expected to call the
+            client at once, and the number of worker threads for hedges.
+        :param kwds: optional arguments for `AbstractClient`, such as `decode`.
+        """
+        super(PooledClient, self).__init__(list(endpoints), **kwds)
+        clients = [i if isinstance(i, AbstractClient) else client_type(i, codec=self.codec)
+                   for i in self.endpoint]
+        # clients created for addresses are closed with the pool
+        self.owned = [i for i, j in zip(clients, self.endpoint) if i is not j]
+        self.pool = NodePool(clients, max_lag)
+        # requests to each node are limited separately
+        if self.limiter is not None:
+            for node in self.pool.nodes:
+                node.limiter = self.limiter.copy()
+        self.probe_interval = probe_interval
+        self.hedge = hedge
+        # each caller waits for at most one hedge, so a worker per caller
+        # never delays a hedge behind other callers' requests
+        self.executor = None
+        if hedge is not None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_concurrency)
+        # client which returned each response, to parse the response
+        self.served = weakref.WeakKeyDictionary()
+        self.served_lock = threading.Lock()
+        self.__stopped = threading.Event()
+        self.__prober = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def nodes(self):
+        """
+        Nodes within the pool.
+        """
+        return self.pool.nodes
+
+    def call(self, payload):
+        """
+        Make calls to the API on the selected node, retrying failures on
+        the next selected node if the retry policy allows.
+        :return: response object
+        """
+        self.__start_probes()
+        if self.retry is not None and self.retry.retryable(self, payload):
+            return self.retry.call(self.send, payload)
+        return self.send(payload)
+
+    def send(self, payload):
+        """
+        Send a JSON payload once, hedged if enabled. The request is sent
+        on the calling thread, and the hedge, if the request is still in
+        flight after the hedge delay, on a worker thread.
+        :return: response object
+        """
+        delay = self.hedge_delay(payload)
+        node = self.pool.acquire()
+        if delay is None:
+            return self.send_node(node, payload)
+
+        done = threading.Event()
+        hedge = self.executor.submit(self.send_hedge, node, payload, monotonic() + delay, done)
+        try:
+            response = self.send_node(node, payload)
+        except Exception:
+            done.set()
+            # the hedge is only sent if the request was still in flight
+            if hedge.cancel() or hedge.exception() is not None or hedge.result() is None:
+                raise
+            return hedge.result()
+        done.set()
+        return response
+
+    def send_hedge(self, node, payload, expires, done):
+        """
+        Send a JSON payload to a second node, if the request to the
+        first node is not done when the hedge delay expires.
+        :return: response object, or None if the hedge was not sent
+
+        :param node: pool node of the first request.
+        :param payload: JSON payload, or list of payloads for a batch.
+        :param expires: `monotonic` time at which to send the hedge.
+        :param done: event set once the first request completes.
+        """
+        if done.wait(max(expires - monotonic(), 0)):
+            return None
+        return self.send_node(self.pool.acquire(exclude=node), payload)
+
+    def send_node(self, node, payload):
+        """
+        Send a JSON payload to a node acquired from the pool, waiting
+        for the rate limiter of the node if set.
+        :return: response object
+
+        :param node: pool node returned by `pool.acquire`.
+        :param payload: JSON payload, or list of payloads for a batch.
+        """
+        start = monotonic()
+        try:
+            if node.limiter is None:
+                response = node.client.call(payload)
+            else:
+                response = node.limiter.call(self, node.client.call, payload)
+        except Exception as error:
+            self.pool.release(node, monotonic() - start, error)
+            raise
+        self.pool.release(node, monotonic() - start)
+        return self.serve(node, response)
+
+    def serve(self, node, response):
+        """
+        Remember the node's client returned a response, so the response
+        is parsed by that client.
+        :return: `response`
+
+        :param node: pool node which returned the response.
+        :param response: response object.
+        """
+        try:
+            with self.served_lock:
+                self.served[response] = node.client
+        except TypeError:
+            # parsed bodies, from clients which parse when received
+            pass
+        return response
+
+    def served_by(self, response):
+        """
+        Get the client which returned a response, or None for parsed
+        bodies.
+
+        :param response: response object returned by `call`.
+        """
+        try:
+            with self.served_lock:
+                client = self.served.get(response)
+        except TypeError:
+            return None
+        return self.nodes[0].client if client is None else client
+
+    def hedge_delay(self, payload):
+        """
+        Get the delay before hedging a payload, or None if the payload
+        may not be hedged.
+
+        :param payload: JSON payload, or list of payloads for a batch.
+        """
+        if self.hedge is None or len(self.pool) < 2 or not is_idempotent(self, payload):
+            return None
+        return self.pool.quantile(self.hedge)
+
+    def call_stream(self, payload):
+        """
+        Make calls to the API on the selected node, without buffering
+        the response body.
+        :return: generator over chunks of the response body
+        """
+        node = self.pool.acquire()
+        start = monotonic()
+        error = None
+        try:
+            for chunk in node.client.call_stream(payload):
+                yield chunk
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            self.pool.release(node, monotonic() - start, error)
+
+    def parse(self, response):
+        """
+        Parse the JSON body from a response returned by `call`, with the
+        client which returned it.
+
+        :param response: response object returned by `call`.
+        """
+        client = self.served_by(response)
+        return response if client is None else client.parse(response)
+
+    def content(self, response):
+        """
+        Get the raw JSON body from a response returned by `call`, with
+        the client which returned it.
+
+        :param response: response object returned by `call`.
+        """
+        client = self.served_by(response)
+        return self.codec.dumps(response) if client is None else client.content(response)
+
+    def probe(self):
+        """
+        Probe the health and head of every node.
+        """
+        for node in self.nodes:
+            batch = node.client.batch()
+            calls = self.pool.probe_calls(batch)
+            start = monotonic()
+            try:
+                batch.execute()
+            except Exception as error:
+                self.pool.update(node, batch, calls, monotonic() - start, error)
+            else:
+                self.pool.update(node, batch, calls, monotonic() - start)
+
+    def close(self):
+        """
+        Stop the health probes and hedged requests, and close the
+        clients created for addresses.
+        """
+        self.__stopped.set()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+        for client in self.owned:
+            client.close()
+
+    # PRIVATE
+
+    def __start_probes(self):
+        """
+        Start probing nodes in a background thread, on the first call.
+        """
+        if self.probe_interval is None or self.__prober is not None:
+            return
+        with self.pool.lock:
+            if self.__prober is not None:
+                return
+            self.__prober = threading.Thread(target=self.__probe_loop, name='ethrpc-probe')
+            self.__prober.daemon = True
+        self.__prober.start()
+
+    def __probe_loop(self):
+        """
+        Probe nodes every `probe_interval` seconds, until closed.
+        """
+        while not self.__stopped.wait(self.probe_interval):
+            self.probe()
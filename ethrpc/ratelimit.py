@@ -0,0 +1,341 @@
+'''
+    ratelimit
+    ---------
+
+    Client-side token-bucket rate limiting.
+
+    Requests are smoothed to a steady rate per endpoint, and optionally
+    per method class, so expensive `trace_*` and `debug_*` calls can be
+    limited separately from cheap reads. In adaptive mode, the rate
+    follows additive-increase/multiplicative-decrease (AIMD): it backs
+    off when the node throttles (HTTP 429), times out or slows down
+    relative to the usual latency of the same methods, and recovers
+    slowly to the configured rate.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'RateLimiter',
+    'TokenBucket',
+]
+
+import threading
+import time
+from .retry import monotonic, response_status
+
+DEFAULT_AIMD_COOLDOWN = 1.0
+DEFAULT_AIMD_DECREASE = 0.5
+DEFAULT_AIMD_INCREASE = 1.0
+DEFAULT_LATENCY_FACTOR = 2.0
+DEFAULT_LATENCY_ALPHA = 0.1
+DEFAULT_BASELINE_ALPHA = 0.01
+DEFAULT_MIN_RATE_RATIO = 0.05
+
+# HTTP status for throttled requests.
+TOO_MANY_REQUESTS = 429
+
+
+class TokenBucket(object):
+    """
+    Thread-safe token bucket, refilled at `rate` tokens per second up
+    to `burst` tokens. Tokens are reserved ahead of time, so concurrent
+    callers wait in turn rather than all retrying at once.
+    """
+
+    def __init__(self, rate, burst=None, min_rate=None):
+        """
+        Initialize bucket.
+
+        :param rate: tokens per second, and the maximum adaptive rate.
+        :param burst: (optional) bucket capacity, defaults to one
+            second of tokens.
+        :param min_rate: (optional) minimum adaptive rate.
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = rate * DEFAULT_MIN_RATE_RATIO if min_rate is None else min_rate
+        self.burst = max(rate, 1) if burst is None else burst
+        self.tokens = self.burst
+        self.updated = monotonic()
+        self.decreased = None
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return 'TokenBucket(rate={}, burst={})'.format(self.rate, self.burst)
+
+    def copy(self):
+        """
+        Create a full bucket with the same rates, such as for another
+        endpoint.
+        """
+        return TokenBucket(self.max_rate, self.burst, self.min_rate)
+
+    def reserve(self, count=1):
+        """
+        Take tokens from the bucket.
+        :return: seconds to wait until the tokens are available.
+
+        :param count: number of tokens.
+        """
+        with self.lock:
+            self.__refill()
+            self.tokens -= count
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def increase(self, step):
+        """
+        Additively increase the rate, up to `max_rate`.
+
+        :param step: tokens per second to add to the rate.
+        """
+        with self.lock:
+            self.__refill()
+            self.rate = min(self.rate + step, self.max_rate)
+
+    def decrease(self, factor, cooldown=DEFAULT_AIMD_COOLDOWN):
+        """
+        Multiplicatively decrease the rate, down to `min_rate`, at most
+        once per cooldown, so a burst of failures for requests sent at
+        the old rate only backs off once.
+
+        :param factor: multiplier for the rate, from 0 to 1.
+        :param cooldown: minimum seconds between decreases.
+        """
+        with self.lock:
+            now = monotonic()
+            if self.decreased is not None and now - self.decreased < cooldown:
+                return
+            self.__refill()
+            self.decreased = now
+            self.rate = max(self.rate * factor, self.min_rate)
+            self.tokens = min(self.tokens, self.burst * self.rate / self.max_rate)
+
+    # PRIVATE
+
+    def __refill(self):
+        """
+        Add the tokens accrued since the last update, with the lock held.
+        """
+        now = monotonic()
+        self.tokens = min(self.tokens + (now - self.updated) * self.rate, self.burst)
+        self.updated = now
+
+
+class Latency(object):
+    """
+    Moving average of the latency for a kind of request, and the
+    baseline it is compared to. The baseline follows the average down
+    immediately, and up slowly, so it recovers after the node changes.
+    """
+
+    __slots__ = ('average', 'baseline')
+
+    def __init__(self, elapsed):
+        """
+        Initialize latency.
+
+        :param elapsed: seconds taken by the first request.
+        """
+        self.average = elapsed
+        self.baseline = elapsed
+
+    def add(self, elapsed):
+        """
+        Add a latency sample.
+        :return: ratio of the average latency to the baseline.
+
+        :param elapsed: seconds taken by the request.
+        """
+        self.average += DEFAULT_LATENCY_ALPHA * (elapsed - self.average)
+        if self.average < self.baseline:
+            self.baseline = self.average
+        else:
+            self.baseline += DEFAULT_BASELINE_ALPHA * (self.average - self.baseline)
+        return self.average / self.baseline if self.baseline > 0 else 1.0
+
+
+class RateLimiter(object):
+    """
+    Rate limiter for a client, with a bucket for the endpoint and
+    buckets for method classes. Each call in a payload takes a token
+    from the endpoint bucket and from the bucket for its class.
+
+        >>> limiter = RateLimiter(rate=50, classes={'trace': 2, 'debug': 1})
+        >>> client = Client('https://mainnet.example.com', limiter=limiter)
+    """
+
+    def __init__(self, rate=None, burst=None, classes=None, adaptive=False,
+                 increase=DEFAULT_AIMD_INCREASE, decrease=DEFAULT_AIMD_DECREASE,
+                 latency_factor=DEFAULT_LATENCY_FACTOR):
+        """
+        Initialize limiter.
+
+        :param rate: (optional) requests per second to the endpoint.
+        :param burst: (optional) burst size for the endpoint.
+        :param classes: (optional) dict of rates for method classes, by
+            API namespace (such as `trace`) or Python API method name
+            (such as `eth_get_logs`). Each rate is a number of requests
+            per second, a `(rate, burst)` tuple, or a `TokenBucket`.
+        :param adaptive: adjust rates from the responses (AIMD).
+        :param increase: requests per second added to a rate each
+            second without congestion, in adaptive mode.
+        :param decrease: multiplier for a rate on congestion, in
+            adaptive mode.
+        :param latency_factor: ratio of the average latency to the
+            baseline latency considered congestion, in adaptive mode.
+            Latency is tracked separately by method, so slow methods
+            such as traces do not look like congestion for fast ones.
+        """
+        self.bucket = None if rate is None else TokenBucket(rate, burst)
+        self.classes = {k: self.__bucket(v) for k, v in (classes or {}).items()}
+        self.adaptive = adaptive
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.latencies = {}
+        self.lock = threading.Lock()
+
+    def copy(self):
+        """
+        Create a limiter with the same settings and full, independent
+        buckets, such as for each endpoint of a pool. Method classes
+        sharing a bucket still share a bucket in the copy.
+        """
+        limiter = RateLimiter(adaptive=self.adaptive, increase=self.increase,
+                              decrease=self.decrease, latency_factor=self.latency_factor)
+        buckets = {}
+        for bucket in [self.bucket] + list(self.classes.values()):
+            if bucket is not None and bucket not in buckets:
+                buckets[bucket] = bucket.copy()
+        limiter.bucket = buckets.get(self.bucket)
+        limiter.classes = {k: buckets[v] for k, v in self.classes.items()}
+        return limiter
+
+    def buckets(self, name):
+        """
+        Get the buckets limiting a method.
+
+        :param name: Python API method name.
+        """
+        buckets = [] if self.bucket is None else [self.bucket]
+        bucket = self.classes.get(name) or self.classes.get(name.split('_', 1)[0])
+        if bucket is not None:
+            buckets.append(bucket)
+        return buckets
+
+    def payload_names(self, client, payload):
+        """
+        Get the method name of each call in a payload.
+        :return: list of Python API method names, or RPC method names
+            for unknown methods.
+
+        :param client: client sending the payload.
+        :param payload: JSON payload, or list of payloads for a batch.
+        """
+        names = []
+        for item in (payload if isinstance(payload, list) else [payload]):
+            method = item['method']
+            names.append(client.python_name(method) if client.has_method(method) else method)
+        return names
+
+    def payload_buckets(self, client, payload):
+        """
+        Get the tokens required from each bucket for a payload.
+        :return: dict of token counts by bucket.
+
+        :param client: client sending the payload.
+        :param payload: JSON payload, or list of payloads for a batch.
+        """
+        counts = {}
+        for name in self.payload_names(client, payload):
+            for bucket in self.buckets(name):
+                counts[bucket] = counts.get(bucket, 0) + 1
+        return counts
+
+    def reserve(self, client, payload):
+        """
+        Take the tokens for a payload.
+        :return: seconds to wait before sending the payload.
+
+        :param client: client sending the payload.
+        :param payload: JSON payload, or list of payloads for a batch.
+        """
+        delays = [i.reserve(n) for i, n in self.payload_buckets(client, payload).items()]
+        return max(delays) if delays else 0.0
+
+    def update(self, client, payload, elapsed, response=None, error=None):
+        """
+        Adjust the rates from the result of a request, in adaptive mode.
+        Throttled responses, transport errors and rising latency are
+        congestion.
+
+        :param client: client sending the payload.
+        :param payload: JSON payload, or list of payloads for a batch.
+        :param elapsed: seconds taken by the request.
+        :param response: (optional) response object.
+        :param error: (optional) exception raised by the transport.
+        """
+        if not self.adaptive:
+            return
+        congested = error is not None or response_status(response) == TOO_MANY_REQUESTS
+        if not congested:
+            congested = self.__slow(self.payload_names(client, payload), elapsed)
+        for bucket in self.payload_buckets(client, payload):
+            if congested:
+                bucket.decrease(self.decrease)
+            else:
+                # approximately `increase` per second at the current rate
+                bucket.increase(self.increase / bucket.rate)
+
+    def call(self, client, send, payload):
+        """
+        Send a payload once its tokens are available, and adjust the
+        rates from the result.
+        :return: response object
+
+        :param client: client sending the payload.
+        :param send: function to send the payload.
+        :param payload: JSON payload, or list of payloads for a batch.
+        """
+        time.sleep(self.reserve(client, payload))
+        start = monotonic()
+        try:
+            response = send(payload)
+        except Exception as error:
+            self.update(client, payload, monotonic() - start, error=error)
+            raise
+        self.update(client, payload, monotonic() - start, response)
+        return response
+
+    # PRIVATE
+
+    def __bucket(self, value):
+        """
+        Create a bucket from a rate, `(rate, burst)` tuple, or bucket.
+        """
+        if isinstance(value, TokenBucket):
+            return value
+        elif isinstance(value, tuple):
+            return TokenBucket(*value)
+        return TokenBucket(value)
+
+    def __slow(self, names, elapsed):
+        """
+        Add a latency sample for the methods of a payload, per call, and
+        get if their average latency rose too far above the baseline.
+        """
+        key = tuple(sorted(set(names)))
+        elapsed /= max(len(names), 1)
+        with self.lock:
+            latency = self.latencies.get(key)
+            if latency is None:
+                self.latencies[key] = Latency(elapsed)
+                return False
+            return latency.add(elapsed) > self.latency_factor
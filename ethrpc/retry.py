@@ -0,0 +1,224 @@
+'''
+    retry
+    -----
+
+    Retry policies for transient transport failures.
+
+    Calls to idempotent methods which fail with a transport error, or
+    an HTTP status for an overloaded or failing node, are retried with
+    exponential backoff and full jitter, within a deadline for the call.
+    Calls with side effects, such as sending transactions or any
+    `personal_*` method, are never retried.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'is_idempotent',
+    'RetryPolicy',
+    'DEFAULT_RETRY_ATTEMPTS',
+    'RETRY_STATUSES',
+    'TRANSPORT_ERRORS',
+]
+
+import random
+import six
+import socket
+import time
+
+try:
+    import requests
+    REQUESTS_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+except ImportError:
+    REQUESTS_ERRORS = ()
+
+try:
+    import aiohttp
+    import asyncio
+    ASYNCIO_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+except ImportError:
+    ASYNCIO_ERRORS = ()
+
+try:
+    import httpx
+    HTTPX_ERRORS = (httpx.NetworkError, httpx.RemoteProtocolError, httpx.TimeoutException)
+except ImportError:
+    HTTPX_ERRORS = ()
+
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_RETRY_BACKOFF = 0.1
+DEFAULT_RETRY_MAX_BACKOFF = 5.0
+
+# HTTP statuses for rate-limited, overloaded or failing nodes.
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+CONNECTION_ERROR = getattr(six.moves.builtins, 'ConnectionError', socket.error)
+
+TRANSPORT_ERRORS = (CONNECTION_ERROR, socket.timeout) + REQUESTS_ERRORS + ASYNCIO_ERRORS + HTTPX_ERRORS
+
+monotonic = getattr(time, 'monotonic', time.time)
+
+
+def is_idempotent(client, payload, methods=None):
+    """
+    Get if every call in a payload may safely be sent more than once.
+
+    :param client: client sending the payload.
+    :param payload: JSON payload, or list of payloads for a batch.
+    :param methods: (optional) Python API method names without side
+        effects, defaults to `IDEMPOTENT_METHODS`.
+    """
+    if methods is None:
+        from .core import IDEMPOTENT_METHODS as methods
+    items = payload if isinstance(payload, list) else [payload]
+    for item in items:
+        method = item['method']
+        if not client.has_method(method) or client.python_name(method) not in methods:
+            return False
+    return True
+
+
+def response_status(response):
+    """
+    Get the HTTP status of a response, or None for other transports.
+
+    :param response: response object returned by `call`.
+    """
+    status = getattr(response, 'status_code', None)
+    if status is None:
+        status = getattr(response, 'status', None)
+    return status if isinstance(status, six.integer_types) else None
+
+
+def retry_after(response):
+    """
+    Get the delay requested by a `Retry-After` header, in seconds.
+
+    :param response: response object returned by `call`.
+    """
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return max(float(headers.get('Retry-After')), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy(object):
+    """
+    Policy to retry failed calls to idempotent methods.
+
+        >>> client = Client(retry=RetryPolicy(attempts=5, deadline=10))
+    """
+
+    def __init__(self, attempts=DEFAULT_RETRY_ATTEMPTS, backoff=DEFAULT_RETRY_BACKOFF,
+                 max_backoff=DEFAULT_RETRY_MAX_BACKOFF, deadline=None,
+                 statuses=RETRY_STATUSES, errors=TRANSPORT_ERRORS, methods=None):
+        """
+        Initialize policy.
+
+        :param attempts: maximum attempts per call, including the first.
+        :param backoff: base delay before the first retry, in seconds.
+        :param max_backoff: maximum delay between attempts, in seconds.
+        :param deadline: (optional) maximum seconds for a call including
+            its retries. Retries are not started past the deadline, and
+            asynchronous attempts are cancelled at the deadline.
+        :param statuses: HTTP statuses to retry.
+        :param errors: exception types to retry.
+        :param methods: (optional) Python API method names which may be
+            retried, defaults to `IDEMPOTENT_METHODS`.
+        """
+        if attempts < 1:
+            raise ValueError("Retry policy requires at least one attempt.")
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.statuses = statuses
+        self.errors = errors
+        self.methods = methods
+
+    def retryable(self, client, payload):
+        """
+        Get if a payload may be retried.
+
+        :param client: client sending the payload.
+        :param payload: JSON payload, or list of payloads for a batch.
+        """
+        return self.attempts > 1 and is_idempotent(client, payload, self.methods)
+
+    def failed(self, response):
+        """
+        Get if a response failed with a retryable HTTP status.
+
+        :param response: response object returned by `call`.
+        """
+        return response_status(response) in self.statuses
+
+    def delay(self, attempt, response=None):
+        """
+        Get the delay before a retry, with full jitter, so clients
+        failing together do not retry together.
+
+        :param attempt: number of attempts made.
+        :param response: (optional) failed response, whose `Retry-After`
+            header is a lower bound on the delay.
+        """
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+        after = retry_after(response) if response is not None else None
+        if after is not None:
+            delay = max(delay, min(after, self.max_backoff))
+        return delay
+
+    def expires(self):
+        """
+        Get the monotonic time at which a call starting now expires, or None.
+        """
+        return None if self.deadline is None else monotonic() + self.deadline
+
+    def next_delay(self, attempt, expires, response=None):
+        """
+        Get the delay before the next attempt, or None if the call
+        should not be retried.
+
+        :param attempt: number of attempts made.
+        :param expires: monotonic deadline for the call, or None.
+        :param response: (optional) failed response.
+        """
+        if attempt >= self.attempts:
+            return None
+        delay = self.delay(attempt, response)
+        if expires is not None and monotonic() + delay >= expires:
+            return None
+        return delay
+
+    def call(self, send, payload):
+        """
+        Send a payload, retrying transport errors and failed responses.
+        :return: response object, the last failed response if no
+            attempts succeeded, or raise the last transport error.
+
+        :param send: function to send the payload once.
+        :param payload: JSON payload, or list of payloads for a batch.
+        """
+        expires = self.expires()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = send(payload)
+            except self.errors:
+                delay = self.next_delay(attempt, expires)
+                if delay is None:
+                    raise
+            else:
+                if not self.failed(response):
+                    return response
+                delay = self.next_delay(attempt, expires, response)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
@@ -0,0 +1,341 @@
+'''
+    stream
+    ------
+
+    Incremental parsing of large JSON-RPC responses.
+
+    Rather than buffering and parsing the full response, the body is
+    parsed as it is read, and each element at a path within the result,
+    such as each struct log of a transaction trace, is yielded once it
+    is complete. Values outside the path are skipped without being
+    decoded, so memory is bounded by the largest element, rather than
+    by the size of the response.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'iter_stream',
+    'StreamParser',
+    'STREAM_CHUNK_SIZE',
+    'STREAM_PATHS',
+    'STREAM_TRACE_PATHS',
+]
+
+import codecs
+import json
+import re
+from .decode import RPCError
+
+# Size of each chunk read from the response body.
+STREAM_CHUNK_SIZE = 65536
+
+# Default paths to the streamed elements within the result, by Python
+# API method name. '*' matches every element of an array or object.
+STREAM_PATHS = {
+    'debug_trace_block': ('*',),
+    'debug_trace_block_by_hash': ('*',),
+    'debug_trace_block_by_number': ('*',),
+    'debug_trace_block_from_file': ('*',),
+    'debug_trace_transaction': ('structLogs', '*'),
+    'eth_get_filter_changes': ('*',),
+    'eth_get_filter_logs': ('*',),
+    'eth_get_logs': ('*',),
+    'trace_block': ('*',),
+    'trace_filter': ('*',),
+    'trace_raw_transaction': ('trace', '*'),
+    'trace_replay_transaction': ('trace', '*'),
+    'trace_transaction': ('*',),
+    'txpool_content': ('*', '*', '*'),
+}
+
+# Paths to each field of the `trace_replay_transaction` and
+# `trace_raw_transaction` results, for the requested trace types.
+STREAM_TRACE_PATHS = {
+    'trace': ('trace', '*'),
+    'vmTrace': ('vmTrace', 'ops', '*'),
+    'stateDiff': ('stateDiff', '*'),
+}
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# Characters which change the nesting of a skipped value.
+STRUCTURE = re.compile(r'["\[\]{}]')
+
+# Longest run of complete string characters and escapes.
+STRING_CHARS = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+
+# Sentinel yielded internally when the parser needs more data.
+NEED_DATA = object()
+
+
+class StreamParser(object):
+    """
+    Incremental parser for a JSON-RPC response body, yielding the
+    values at a path within the result.
+
+        >>> parser = StreamParser(('structLogs', '*'))
+        >>> parser.feed(chunk)
+        >>> for struct_log in parser.items():
+        ...     print(struct_log['op'])
+    """
+
+    def __init__(self, path):
+        """
+        Initialize parser.
+
+        :param path: sequence of object keys, array indexes, or '*'.
+        """
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.done = False
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.scanner = json.JSONDecoder()
+        self.__value = None
+        self.__closed = False
+        self.__events = self.__document(tuple(path))
+
+    def feed(self, data):
+        """
+        Feed bytes from the response body.
+
+        :param data: bytes read from the response body.
+        """
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(data)
+        self.pos = 0
+
+    def close(self):
+        """
+        Mark the end of the response body.
+        """
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(b'', True)
+        self.pos = 0
+        self.eof = True
+
+    def items(self):
+        """
+        Yield the values which can be parsed from the data fed so far.
+        """
+        for item in self.__events:
+            if item is NEED_DATA:
+                return
+            yield item
+        self.done = True
+
+    # PRIVATE
+
+    def __skip_whitespace(self):
+        """
+        Advance to the next non-whitespace character.
+        """
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return
+            elif self.eof:
+                raise ValueError("Unexpected end of JSON document.")
+            yield NEED_DATA
+
+    def __parse_value(self):
+        """
+        Parse the next complete value, storing it in `__value`.
+        """
+        for item in self.__skip_whitespace():
+            yield item
+
+        # retry only once the buffer doubles, so large values are not
+        # reparsed for every chunk.
+        needed = 0
+        while True:
+            remaining = len(self.buffer) - self.pos
+            if remaining >= needed or self.eof:
+                try:
+                    value, end = self.scanner.raw_decode(self.buffer, self.pos)
+                    # a number may continue into the next chunk
+                    if end < len(self.buffer) or self.eof:
+                        self.pos = end
+                        self.__value = value
+                        return
+                except ValueError:
+                    if self.eof:
+                        raise
+                needed = 2 * remaining
+            yield NEED_DATA
+
+    def __skip_string(self):
+        """
+        Skip to the end of a string, after its opening quote.
+        """
+        while True:
+            self.pos = STRING_CHARS.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) and self.buffer[self.pos] == '"':
+                self.pos += 1
+                return
+            elif self.eof:
+                raise ValueError("Unexpected end of JSON document.")
+            yield NEED_DATA
+
+    def __skip_value(self):
+        """
+        Skip the next value without decoding it, consuming each chunk
+        as it is scanned.
+        """
+        for item in self.__skip_whitespace():
+            yield item
+        if self.buffer[self.pos] not in '"[{':
+            for item in self.__parse_value():
+                yield item
+            return
+
+        depth = 0
+        while True:
+            match = STRUCTURE.search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+                if self.eof:
+                    raise ValueError("Unexpected end of JSON document.")
+                yield NEED_DATA
+                continue
+
+            self.pos = match.end()
+            char = match.group()
+            if char == '"':
+                for item in self.__skip_string():
+                    yield item
+            elif char in '[{':
+                depth += 1
+            else:
+                depth -= 1
+            if depth == 0:
+                self.__value = None
+                return
+
+    def __parse_separator(self, close):
+        """
+        Parse ',' or the closing character of a container, storing if
+        the container was closed in `__closed`.
+        """
+        for item in self.__skip_whitespace():
+            yield item
+        char = self.buffer[self.pos]
+        self.pos += 1
+        if char == close:
+            self.__closed = True
+        elif char == ',':
+            self.__closed = False
+        else:
+            raise ValueError("Expected ',' or '{}', got '{}'.".format(close, char))
+
+    def __parse_open(self, open_, close):
+        """
+        Parse the opening character of a container, storing if the
+        container is empty in `__closed`.
+        """
+        for item in self.__skip_whitespace():
+            yield item
+        if self.buffer[self.pos] != open_:
+            raise ValueError("Expected '{}'.".format(open_))
+        self.pos += 1
+        for item in self.__skip_whitespace():
+            yield item
+        self.__closed = self.buffer[self.pos] == close
+        if self.__closed:
+            self.pos += 1
+
+    def __parse_key(self):
+        """
+        Parse an object key and the following ':'.
+        """
+        for item in self.__parse_value():
+            yield item
+        key = self.__value
+        for item in self.__skip_whitespace():
+            yield item
+        if self.buffer[self.pos] != ':':
+            raise ValueError("Expected ':'.")
+        self.pos += 1
+        self.__value = key
+
+    def __document(self, path):
+        """
+        Yield the values at path within the result of the document.
+        """
+        for item in self.__parse_open('{', '}'):
+            yield item
+        while not self.__closed:
+            for item in self.__parse_key():
+                yield item
+            key = self.__value
+            if key == 'result':
+                for item in self.__walk(path):
+                    yield item
+            else:
+                for item in self.__parse_value():
+                    yield item
+                if key == 'error':
+                    raise RPCError.from_body({'error': self.__value})
+            for item in self.__parse_separator('}'):
+                yield item
+
+    def __walk(self, path):
+        """
+        Yield the values at path within the next value.
+        """
+        if not path:
+            for item in self.__parse_value():
+                yield item
+            yield self.__value
+            return
+
+        for item in self.__skip_whitespace():
+            yield item
+        char = self.buffer[self.pos]
+        if char not in '[{':
+            # null or a scalar, where a container was expected
+            for item in self.__parse_value():
+                yield item
+            return
+
+        is_array = char == '['
+        for item in self.__parse_open(char, ']' if is_array else '}'):
+            yield item
+        index = 0
+        while not self.__closed:
+            if is_array:
+                key = index
+                index += 1
+            else:
+                for item in self.__parse_key():
+                    yield item
+                key = self.__value
+
+            if path[0] == '*' or path[0] == key:
+                for item in self.__walk(path[1:]):
+                    yield item
+            else:
+                for item in self.__skip_value():
+                    yield item
+            for item in self.__parse_separator(']' if is_array else '}'):
+                yield item
+
+
+def iter_stream(chunks, path):
+    """
+    Parse the values at path within the result of a response body.
+
+    :param chunks: iterable of bytes from the response body.
+    :param path: sequence of object keys, array indexes, or '*'.
+    """
+    parser = StreamParser(path)
+    for chunk in chunks:
+        parser.feed(chunk)
+        for item in parser.items():
+            yield item
+    parser.close()
+    for item in parser.items():
+        yield item
@@ -0,0 +1,282 @@
+'''
+    websocket
+    ---------
+
+    Module for the asynchronous WebSocket Ethereum RPC client.
+
+    The client keeps a single long-lived connection, multiplexes
+    concurrent requests over it by request id, and routes subscription
+    notifications to per-subscription asynchronous iterators.
+'''
+
+__copyright__ = "2018 QChain Inc. All Rights Reserved."
+__version__ = "0.1.0"
+__license__ = "License: Apache v2, see LICENSE."
+__author__ = "QChain Inc."
+__email__ = "alex@qchain.co"
+__maintainer__ = "Alex Huszagh"
+__all__ = [
+    'Subscription',
+    'WebSocketClient',
+]
+
+import aiohttp
+import asyncio
+from .asyncio import AbstractAsyncioClient, limit, multiplex, retry
+from .core import LOCALHOST_WS_ENDPOINT
+from .decode import RPCError
+
+# Methods to cancel a subscription, by the method used to create it.
+UNSUBSCRIBE_METHODS = {
+    'eth_subscribe': 'eth_unsubscribe',
+    'parity_subscribe': 'parity_unsubscribe',
+    'shh_subscribe': 'shh_unsubscribe',
+    'signer_subscribePending': 'signer_unsubscribePending',
+}
+
+
+class Subscription(object):
+    """
+    Asynchronous iterator over the notifications for a subscription.
+
+        >>> subscription = await client.subscribe('eth_subscribe', 'newHeads')
+        >>> async for header in subscription:
+        ...     print(header['number'])
+    """
+
+    __closed = object()
+
+    def __init__(self, client, id_, unsubscribe_method):
+        """
+        Initialize subscription.
+
+        :param client: client that owns the connection.
+        :param id_: subscription ID returned by the node.
+        :param unsubscribe_method: JSON-RPC method to cancel the subscription.
+        """
+        self.client = client
+        self.id = id_
+        self.unsubscribe_method = unsubscribe_method
+        self.queue = asyncio.Queue()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self.queue.get()
+        if item is self.__closed:
+            raise StopAsyncIteration
+        elif isinstance(item, Exception):
+            raise item
+        return item
+
+    def put(self, result):
+        """
+        Queue a notification result for the subscription.
+
+        :param result: 'result' field of the notification.
+        """
+        self.queue.put_nowait(result)
+
+    def close(self, exception=None):
+        """
+        Stop iteration, after all queued notifications are consumed.
+
+        :param exception: (optional) exception to raise instead of stopping.
+        """
+        self.queue.put_nowait(self.__closed if exception is None else exception)
+
+    async def unsubscribe(self):
+        """
+        Cancel the subscription on the node and stop iteration.
+        :return: coroutine to the JSON response object, or the decoded
+            result if the client decodes results.
+        """
+        self.client.subscriptions.pop(self.id, None)
+        self.close()
+        return await self.client.request(self.unsubscribe_method, [self.id])
+
+
+class WebSocketClient(AbstractAsyncioClient):
+    """
+    Asynchronous client using a persistent WebSocket connection.
+    Concurrent requests share the connection, and responses are matched
+    to requests by id. Each method returns a coroutine to the JSON
+    response object.
+    """
+
+    def __init__(self, endpoint = LOCALHOST_WS_ENDPOINT, **kwds):
+        """
+        Initialize client. The connection is opened on the first call.
+        :param endpoint: address of the Ethereum RPC.
+        :param kwds: optional arguments for `AbstractClient`, such as `decode`.
+        """
+        super(WebSocketClient, self).__init__(endpoint, **kwds)
+        self.session = None
+        self.websocket = None
+        self.reader = None
+        self.subscriptions = {}
+        self.__lock = asyncio.Lock()
+        self.__unclaimed = {}
+        self.__subscribing = 0
+        self.__closing = False
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def connect(self):
+        """
+        Open the WebSocket connection, if it is not already open.
+        """
+        async with self.__lock:
+            if self.websocket is None or self.websocket.closed:
+                if self.session is None:
+                    self.session = aiohttp.ClientSession()
+                self.websocket = await self.session.ws_connect(self.endpoint)
+                # errors on a reopened connection are not from `close`
+                self.__closing = False
+                self.reader = asyncio.ensure_future(self.__read(self.websocket))
+
+    async def close(self):
+        """
+        Close the connection and session, failing in-flight requests
+        and ending all subscriptions.
+        """
+        self.__closing = True
+        if self.websocket is not None:
+            await self.websocket.close()
+        if self.reader is not None:
+            await self.reader
+        session, self.session = self.session, None
+        if session is not None:
+            await session.close()
+
+    async def call(self, payload):
+        """
+        Make calls to the API over the connection, retrying failures if
+        the retry policy allows. The connection is reopened after it
+        closes, but subscriptions are not restored.
+        :return: coroutine to the JSON response object, or list of
+            response objects for a batch payload.
+        """
+        if self.retry is not None and self.retry.retryable(self, payload):
+            return await retry(self.retry, self.send, payload)
+        return await self.send(payload)
+
+    async def send(self, payload):
+        """
+        Send a JSON payload once, waiting for the rate limiter if set.
+        :return: coroutine to the JSON response object
+        """
+        if self.limiter is None:
+            return await self.exchange(payload)
+        return await limit(self.limiter, self, self.exchange, payload)
+
+    async def exchange(self, payload):
+        """
+        Send a JSON payload over the connection, and wait for the response.
+        :return: coroutine to the JSON response object, or list of
+            response objects for a batch payload.
+        """
+        await self.connect()
+        return await multiplex(self, payload, self.__send)
+
+    async def parse(self, response):
+        """
+        Responses are parsed when received.
+        :return: coroutine to the JSON response object
+        """
+        return response
+
+    async def content(self, response):
+        """
+        Serialize a response, which is parsed when received.
+        :return: coroutine to the JSON response body
+        """
+        return self.codec.dumps(response)
+
+    async def subscribe(self, name, *args, **kwds):
+        """
+        Create a subscription and return an iterator over its
+        notifications.
+
+        :param name: Python or JSON-RPC name of the subscribe method.
+        :param args: positional arguments for the subscribe method.
+        :param kwds: keyword arguments for the subscribe method.
+        :return: coroutine to the `Subscription`
+        """
+        method = self.rpc_name(name)
+        if method not in UNSUBSCRIBE_METHODS:
+            raise ValueError("Unexpected subscribe method {}.".format(name))
+
+        self.__subscribing += 1
+        try:
+            params = self.params(method, *args, **kwds)
+            body = await self.call(self.payload(method, params))
+        finally:
+            self.__subscribing -= 1
+        unclaimed = self.__unclaimed.pop(body.get('result'), [])
+        if not self.__subscribing:
+            self.__unclaimed.clear()
+        if 'error' in body:
+            raise RPCError.from_body(body)
+
+        subscription = Subscription(self, body['result'], UNSUBSCRIBE_METHODS[method])
+        self.subscriptions[subscription.id] = subscription
+        for result in unclaimed:
+            subscription.put(result)
+        return subscription
+
+    def dispatch(self, body):
+        """
+        Route a message received from the node to the in-flight request
+        or subscription it belongs to.
+
+        :param body: parsed JSON message.
+        """
+        if isinstance(body, list):
+            for item in body:
+                self.dispatch(item)
+        elif 'id' in body:
+            self.resolve_future(body)
+        elif 'subscription' in body.get('params', {}):
+            params = body['params']
+            subscription = self.subscriptions.get(params['subscription'])
+            if subscription is not None:
+                subscription.put(params.get('result'))
+            elif self.__subscribing:
+                # notifications may arrive before `subscribe` registers
+                # the subscription, keep them until it does.
+                unclaimed = self.__unclaimed.setdefault(params['subscription'], [])
+                unclaimed.append(params.get('result'))
+
+    # PRIVATE
+
+    async def __send(self, payload):
+        """
+        Write payload to the connection.
+        """
+        await self.websocket.send_str(self.codec.dumps(payload).decode('utf-8'))
+
+    async def __read(self, websocket):
+        """
+        Read messages from the connection until it closes.
+        """
+        try:
+            async for message in websocket:
+                if message.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                    self.dispatch(self.codec.loads(message.data))
+                elif message.type == aiohttp.WSMsgType.ERROR:
+                    break
+        finally:
+            error = ConnectionError("WebSocket connection closed.")
+            self.fail_futures(error)
+            subscriptions = self.subscriptions
+            self.subscriptions = {}
+            self.__unclaimed.clear()
+            for subscription in subscriptions.values():
+                subscription.close(None if self.__closing else error)
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import unittest
+import ethrpc
+from test_base import MockAsyncioClient
+
+try:
+    import aiohttp
+    from aiohttp import web
+    from ethrpc.asyncio import client_timeout
+except ImportError:
+    aiohttp = None
+
+
+async def rpc(request):
+    payload = await request.json()
+    if payload['method'] == 'eth_syncing':
+        await asyncio.sleep(0.5)
+    return web.json_response({'jsonrpc': '2.0', 'id': payload['id'], 'result': '0x64'})
+
+
+@unittest.skipIf(aiohttp is None or MockAsyncioClient is None, 'Requires aiohttp.')
+class TestAsyncioClient(unittest.TestCase):
+
+    def serve(self, test):
+        async def run():
+            app = web.Application()
+            app.router.add_post('/', rpc)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            try:
+                return await test('http://127.0.0.1:{}/'.format(port))
+            finally:
+                await runner.cleanup()
+
+        return ethrpc.run(run())
+
+    def test_timeout(self):
+        self.assertIsNone(client_timeout(None))
+        self.assertEqual(client_timeout(5).total, 5)
+        timeout = client_timeout((1, 10))
+        self.assertEqual((timeout.total, timeout.sock_connect, timeout.sock_read), (None, 1, 10))
+
+    def test_session(self):
+        async def test(endpoint):
+            client = ethrpc.AsyncioClient(endpoint, decode=True, limit=20, limit_per_host=5,
+                                          ttl_dns_cache=60, timeout=0.2)
+            self.assertIsNone(client.session)
+            async with client:
+                self.assertEqual(await client.eth_block_number(), 100)
+                connector = client.session.connector
+                self.assertEqual((connector.limit, connector.limit_per_host), (20, 5))
+                self.assertTrue(connector.use_dns_cache)
+                with self.assertRaises(asyncio.TimeoutError):
+                    await client.eth_syncing()
+            self.assertIsNone(client.session)
+            self.assertTrue(connector.closed)
+
+            # the session is reopened by the next call
+            self.assertEqual(await client.eth_block_number(), 100)
+            await client.close()
+
+        self.serve(test)
+
+    def test_shared_connector(self):
+        async def test(endpoint):
+            connector = aiohttp.TCPConnector(limit=10)
+            clients = [ethrpc.AsyncioClient(endpoint, decode=True, connector=connector) for _ in range(2)]
+            for client in clients:
+                async with client:
+                    self.assertEqual(await client.eth_block_number(), 100)
+                    self.assertIs(client.session.connector, connector)
+                self.assertFalse(connector.closed)
+            await connector.close()
+
+        self.serve(test)
+
+    def test_pool(self):
+        async def test(endpoint):
+            async with ethrpc.AsyncioPooledClient([endpoint, endpoint], decode=True) as client:
+                self.assertEqual(await client.eth_block_number(), 100)
+                sessions = [i.client.session for i in client.nodes]
+            self.assertTrue(all(i is None or i.closed for i in sessions))
+            self.assertTrue(all(i.client.session is None for i in client.nodes))
+
+        self.serve(test)
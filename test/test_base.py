@@ -11,6 +11,29 @@ import requests_mock
 #   `lambda n: binascii.b2a_hex(os.urandom(n))`
 
 
+class MockError(Exception):
+    '''Error raised by mock handlers to produce a JSON-RPC error.'''
+
+    def __init__(self, code, message):
+        super(MockError, self).__init__(code, message)
+        self.code = code
+        self.message = message
+
+
+def rpc_response(handler, payload):
+    '''Build JSON-RPC response body from `handler(method, params)`.'''
+
+    if isinstance(payload, list):
+        return [rpc_response(handler, i) for i in payload]
+
+    body = {"jsonrpc": "2.0", "id": payload["id"]}
+    try:
+        body["result"] = handler(payload["method"], payload["params"])
+    except MockError as error:
+        body["error"] = {"code": error.code, "message": error.message}
+    return body
+
+
 class TestBase(unittest.TestCase):
 
     def setUp(self):
@@ -37,3 +60,40 @@ class TestBase(unittest.TestCase):
             response = callback()
             self.assertEqual(response.status_code, 200)
             self.assertEqual(response.url.rstrip('/'), url)
+
+    def mock_rpc(self, handler):
+        '''Mock JSON-RPC responses, computed from `handler(method, params)`.'''
+
+        if not self.use_mock:
+            self.skipTest('Requires mock requests.')
+
+        callback = lambda request, context: rpc_response(handler, request.json())
+        mockery = requests_mock.Mocker()
+        mockery.post(self.endpoint, json=callback)
+        return mockery
+
+
+try:
+    import asyncio
+
+    class MockAsyncioClient(ethrpc.AsyncioClient):
+        '''Asynchronous client with responses from `handler(method, params)`.'''
+
+        def __init__(self, handler, *args, **kwds):
+            super(MockAsyncioClient, self).__init__('mock://127.0.0.1:8545', *args, **kwds)
+            self.handler = handler
+            self.payloads = []
+
+        async def call(self, payload):
+            self.payloads.append(payload)
+            await asyncio.sleep(0)
+            return rpc_response(self.handler, payload)
+
+        async def parse(self, response):
+            return response
+
+        async def content(self, response):
+            return self.codec.dumps(response)
+
+except AttributeError:
+    MockAsyncioClient = None
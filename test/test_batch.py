@@ -0,0 +1,71 @@
+import unittest
+import ethrpc
+from test_base import MockAsyncioClient, MockError, TestBase
+
+
+def handler(method, params):
+    if method == 'eth_getBlockByNumber':
+        return {"number": params[0]}
+    elif method == 'eth_getBalance':
+        raise MockError(-32000, "header not found")
+    return None
+
+
+class TestBatch(TestBase):
+
+    def test_batch(self):
+        with self.mock_rpc(handler) as mockery:
+            with self.client.batch() as batch:
+                blocks = [batch.eth_get_block_by_number(i) for i in range(3)]
+                balance = batch.eth_getBalance('0xdae1bfb92c7c0fd23396619ee1a0d643bf609c2e')
+            self.assertEqual(mockery.call_count, 1)
+
+        self.assertEqual(len(mockery.request_history[0].json()), 4)
+        self.assertEqual([i.result()['result'] for i in blocks], [
+            {"number": "0x0"},
+            {"number": "0x1"},
+            {"number": "0x2"},
+        ])
+        self.assertEqual(balance.result()['error']['code'], -32000)
+
+    def test_batch_split(self):
+        with self.mock_rpc(handler) as mockery:
+            with self.client.batch(max_batch_size=2) as batch:
+                blocks = [batch.eth_get_block_by_number(i) for i in range(5)]
+            self.assertEqual(mockery.call_count, 3)
+
+        numbers = [int(i.result()['result']['number'], 16) for i in blocks]
+        self.assertEqual(numbers, list(range(5)))
+
+    def test_batch_pending(self):
+        batch = self.client.batch()
+        result = batch.eth_block_number()
+        self.assertFalse(result.done())
+        with self.assertRaises(RuntimeError):
+            result.result()
+        with self.assertRaises(AttributeError):
+            batch.eth_unknown_method()
+
+    def test_batch_missing_response(self):
+        batch = self.client.batch()
+        result = batch.eth_block_number()
+        batch.resolve(batch.chunks()[0], [])
+        with self.assertRaises(ValueError):
+            result.result()
+
+
+@unittest.skipIf(MockAsyncioClient is None, 'Requires aiohttp.')
+class TestAsyncioBatch(unittest.TestCase):
+
+    def test_batch(self):
+        client = MockAsyncioClient(handler)
+
+        async def run():
+            async with client.batch(max_batch_size=2) as batch:
+                blocks = [batch.eth_get_block_by_number(i) for i in range(5)]
+            return blocks
+
+        blocks = ethrpc.run(run())
+        self.assertEqual(len(client.payloads), 3)
+        numbers = [int(i.result()['result']['number'], 16) for i in blocks]
+        self.assertEqual(numbers, list(range(5)))
@@ -0,0 +1,247 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import ethrpc
+from ethrpc.cache import LRUCache, ResponseCache, SQLiteCache, TieredCache
+from test_base import MockAsyncioClient, TestBase
+
+HASH = '0x' + 'ab' * 32
+
+
+def handler(method, params):
+    if method == 'eth_blockNumber':
+        return '0x64'
+    elif method == 'eth_getBlockByHash':
+        return {'hash': params[0], 'number': '0x5'}
+    elif method == 'eth_getBalance':
+        return '0x1'
+    elif method == 'eth_getTransactionByHash':
+        number = None if params[0] == HASH else '0x50'
+        return {'hash': params[0], 'blockNumber': number}
+    elif method == 'eth_getTransactionReceipt':
+        return None
+    elif method == 'eth_accounts':
+        return []
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_size(self):
+        cache = LRUCache(max_size=2)
+        cache.set(b'a', b'1')
+        cache.set(b'b', b'2')
+        self.assertEqual(cache.get(b'a'), b'1')
+        cache.set(b'c', b'3')
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(b'b'))
+        self.assertEqual(cache.get(b'a'), b'1')
+        self.assertEqual(cache.get(b'c'), b'3')
+
+    def test_bytes(self):
+        cache = LRUCache(max_size=None, max_bytes=10)
+        cache.set(b'a', b'1234')
+        cache.set(b'b', b'1234')
+        self.assertEqual(cache.bytes, 10)
+        cache.set(b'a', b'12345')
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.bytes, 6)
+        cache.set(b'c', b'12345678901')
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.bytes, 0)
+
+    def test_ttl(self):
+        cache = LRUCache()
+        cache.set(b'a', b'1', ttl=0.01)
+        cache.set(b'b', b'2')
+        self.assertEqual(cache.get(b'a'), b'1')
+        time.sleep(0.02)
+        self.assertIsNone(cache.get(b'a'))
+        self.assertEqual(cache.get(b'b'), b'2')
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_key(self):
+        cache = ResponseCache()
+        self.assertEqual(cache.key('eth_getLogs', [{'b': 1, 'a': 2}]), cache.key('eth_getLogs', [{'a': 2, 'b': 1}]))
+        self.assertNotEqual(cache.key('eth_getCode', ['0x1']), cache.key('eth_getBalance', ['0x1']))
+
+    def test_policy(self):
+        cache = ResponseCache(confirmations=6)
+        result = {'result': '0x1'}
+        self.assertFalse(cache.cacheable('eth_send_raw_transaction'))
+        self.assertIsNone(cache.policy('eth_accounts', [], result))
+        self.assertEqual(cache.policy('eth_get_block_by_hash', [HASH, False], result), (None, None))
+        self.assertEqual(cache.policy('eth_gas_price', [], result), (5, None))
+
+        # block parameters
+        self.assertEqual(cache.policy('eth_get_balance', ['0x1', '0x10'], result), (None, 16))
+        self.assertEqual(cache.policy('eth_get_balance', ['0x1', 'earliest'], result), (None, None))
+        self.assertIsNone(cache.policy('eth_get_balance', ['0x1', 'latest'], result))
+        self.assertIsNone(cache.policy('eth_get_balance', ['0x1', 'pending'], result))
+
+        # results tied to a block
+        self.assertIsNone(cache.policy('eth_get_transaction_receipt', [HASH], {'result': None}))
+        self.assertIsNone(cache.policy('eth_get_transaction_by_hash', [HASH], {'result': {'blockNumber': None}}))
+        self.assertEqual(cache.policy('eth_get_transaction_by_hash', [HASH], {'result': {'blockNumber': '0x5'}}), (None, 5))
+        self.assertEqual(cache.policy('trace_transaction', [HASH], {'result': [{'blockNumber': 7}]}), (None, 7))
+
+        # results tied to the block of a transaction's receipt
+        trace = {'result': {'structLogs': []}}
+        self.assertEqual(cache.transaction('debug_trace_transaction', [HASH], trace), HASH)
+        self.assertIsNone(cache.transaction('debug_trace_transaction', [HASH], {'error': {}}))
+        self.assertIsNone(cache.transaction('eth_get_transaction_receipt', [HASH], trace))
+        self.assertIsNone(cache.policy('debug_trace_transaction', [HASH], trace))
+        self.assertIsNone(cache.policy('debug_trace_transaction', [HASH], trace, {'blockNumber': None}))
+        self.assertEqual(cache.policy('debug_trace_transaction', [HASH], trace, {'blockNumber': '0x9'}), (None, 9))
+
+        # errors
+        self.assertIsNone(cache.policy('eth_get_block_by_hash', [HASH, False], {'error': {}}))
+
+
+class TestClientCache(TestBase):
+
+    def calls(self, mockery, method):
+        return sum(i.json()['method'] == method for i in mockery.request_history)
+
+    def test_fetch(self):
+        client = ethrpc.Client(self.endpoint, cache=ResponseCache())
+        with self.mock_rpc(handler) as mockery:
+            params = client.params('eth_get_block_by_hash', HASH)
+            for _ in range(3):
+                block = client.fetch('eth_getBlockByHash', params)
+                self.assertEqual(block, {'hash': HASH, 'number': '0x5'})
+                block['number'] = None
+            self.assertEqual(self.calls(mockery, 'eth_getBlockByHash'), 1)
+
+            # not cached
+            for _ in range(2):
+                self.assertEqual(client.fetch('eth_accounts', []), [])
+            self.assertEqual(self.calls(mockery, 'eth_accounts'), 2)
+
+            # raw responses are not cached
+            self.assertEqual(client.eth_get_block_by_hash(HASH).json()['result']['number'], '0x5')
+            self.assertEqual(self.calls(mockery, 'eth_getBlockByHash'), 2)
+
+    def test_confirmations(self):
+        client = ethrpc.Client(self.endpoint, decode=True, cache=ResponseCache(confirmations=10))
+        with self.mock_rpc(handler) as mockery:
+            for _ in range(2):
+                self.assertEqual(client.eth_get_balance('0x1', 90), 1)
+                self.assertEqual(client.eth_get_balance('0x1', 91), 1)
+                self.assertEqual(client.eth_get_balance('0x1', 'latest'), 1)
+            self.assertEqual(self.calls(mockery, 'eth_getBalance'), 5)
+            self.assertEqual(self.calls(mockery, 'eth_blockNumber'), 1)
+
+            for _ in range(2):
+                client.eth_get_transaction_by_hash(HASH)
+                client.eth_get_transaction_by_hash('0x' + 'cd' * 32)
+                client.eth_get_transaction_receipt(HASH)
+            self.assertEqual(self.calls(mockery, 'eth_getTransactionByHash'), 3)
+            self.assertEqual(self.calls(mockery, 'eth_getTransactionReceipt'), 2)
+
+    def test_reorg(self):
+        state = {'head': 0x64, 'block': '0x60'}
+
+        def trace_handler(method, params):
+            if method == 'eth_blockNumber':
+                return hex(state['head'])
+            elif method == 'debug_traceTransaction':
+                return {'structLogs': [], 'block': state['block']}
+            elif method == 'eth_getTransactionReceipt':
+                return {'blockNumber': state['block']}
+
+        client = ethrpc.Client(self.endpoint, decode=True, cache=ResponseCache(confirmations=10))
+        with self.mock_rpc(trace_handler) as mockery:
+            # traces of recent transactions are not cached, and may change
+            self.assertEqual(client.debug_trace_transaction(HASH)['block'], '0x60')
+            state['block'] = '0x61'
+            self.assertEqual(client.debug_trace_transaction(HASH)['block'], '0x61')
+            self.assertEqual(self.calls(mockery, 'debug_traceTransaction'), 2)
+
+            # and are cached once the transaction is confirmed
+            state['head'] = 0x80
+            client.cache.store.clear()
+            for _ in range(2):
+                self.assertEqual(client.debug_trace_transaction(HASH)['block'], '0x61')
+            self.assertEqual(self.calls(mockery, 'debug_traceTransaction'), 3)
+
+
+@unittest.skipIf(MockAsyncioClient is None, 'Requires aiohttp.')
+class TestAsyncioClientCache(unittest.TestCase):
+
+    def test_cache(self):
+        client = MockAsyncioClient(handler, decode=True, cache=ResponseCache())
+
+        async def run():
+            for _ in range(2):
+                self.assertEqual(await client.eth_get_block_by_hash(HASH), {'hash': HASH, 'number': 5})
+                self.assertEqual(await client.eth_get_balance('0x1', 1), 1)
+                self.assertEqual(await client.eth_get_balance('0x1', 99), 1)
+
+        ethrpc.run(run())
+        methods = [i['method'] for i in client.payloads]
+        self.assertEqual(methods.count('eth_getBlockByHash'), 1)
+        self.assertEqual(methods.count('eth_getBalance'), 3)
+        self.assertEqual(methods.count('eth_blockNumber'), 1)
+
+
+class TestSQLiteCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_persistent(self):
+        value = b'{"result":"' + b'0' * 1000 + b'"}'
+        with SQLiteCache(self.path) as cache:
+            cache.set(b'a', value)
+            cache.set(b'b', b'2', ttl=1)
+            self.assertEqual(cache.get(b'a'), value)
+            self.assertIsNone(cache.get(b'b'))
+            self.assertEqual(len(cache), 1)
+
+            # values are compressed
+            row = cache.connection.execute('SELECT value FROM responses').fetchone()
+            self.assertLess(len(row[0]), 100)
+
+        with SQLiteCache(self.path) as cache:
+            self.assertEqual(cache.get(b'a'), value)
+            cache.clear()
+            self.assertEqual(len(cache), 0)
+
+    def test_tiered(self):
+        with SQLiteCache(self.path) as disk:
+            disk.set(b'a', b'1')
+            memory = LRUCache()
+            cache = TieredCache(memory, disk)
+            self.assertEqual(cache.get(b'a'), b'1')
+            self.assertEqual(memory.get(b'a'), b'1')
+            self.assertIsNone(cache.get(b'b'))
+
+            cache.set(b'b', b'2', ttl=1)
+            self.assertEqual(memory.get(b'b'), b'2')
+            self.assertIsNone(disk.get(b'b'))
+
+    @unittest.skipIf(MockAsyncioClient is None, 'Requires aiohttp.')
+    def test_client(self):
+        client = MockAsyncioClient(handler, decode=True, cache=ResponseCache(SQLiteCache(self.path)))
+
+        async def run():
+            return await client.eth_get_block_by_hash(HASH)
+
+        self.assertEqual(ethrpc.run(run()), {'hash': HASH, 'number': 5})
+        client.cache.store.close()
+
+        # warm restart
+        client = MockAsyncioClient(handler, decode=True, cache=ResponseCache(SQLiteCache(self.path)))
+        self.assertEqual(ethrpc.run(run()), {'hash': HASH, 'number': 5})
+        self.assertEqual(client.payloads, [])
+        client.cache.store.close()
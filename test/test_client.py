@@ -0,0 +1,100 @@
+import json
+import socket
+import threading
+import unittest
+import ethrpc
+from ethrpc.client import keepalive_options
+from test_base import TestBase
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    BaseHTTPRequestHandler = None
+
+
+def handler(method, params):
+    return '0x64'
+
+
+class TestClientOptions(TestBase):
+
+    def test_adapter(self):
+        client = ethrpc.Client(self.endpoint, pool_connections=4, pool_maxsize=64,
+                               pool_block=True, keepalive=30)
+        adapter = client.session.adapters['http://']
+        self.assertIs(client.session.adapters['https://'], adapter)
+        self.assertEqual(adapter._pool_maxsize, 64)
+        self.assertEqual(adapter._pool_block, True)
+        options = adapter.poolmanager.connection_pool_kw['socket_options']
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), options)
+
+        adapter = ethrpc.Client(self.endpoint).session.adapters['http://']
+        self.assertNotIn('socket_options', adapter.poolmanager.connection_pool_kw)
+
+    def test_keepalive_options(self):
+        options = keepalive_options(30, count=3)
+        self.assertEqual(options[0], (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        if hasattr(socket, 'TCP_KEEPCNT'):
+            self.assertIn((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3), options)
+
+    def test_timeout(self):
+        client = ethrpc.Client(self.endpoint, timeout=(1, 5))
+        with self.mock_rpc(handler) as mockery:
+            client.eth_block_number()
+            list(client.stream('eth_get_logs'))
+            self.assertEqual([i.timeout for i in mockery.request_history], [(1, 5)] * 2)
+
+
+@unittest.skipIf(BaseHTTPRequestHandler is None, 'Requires Python 3.')
+class TestClientThreads(unittest.TestCase):
+
+    def setUp(self):
+        peers = self.peers = set()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                peers.add(self.client_address)
+                payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                body = json.dumps({'jsonrpc': '2.0', 'id': payload['id'], 'result': '0x64'}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingMixIn, HTTPServer):
+            daemon_threads = True
+
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.endpoint = 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_threads(self):
+        client = ethrpc.Client(self.endpoint, decode=True, pool_maxsize=8, pool_block=True, timeout=5)
+        results = []
+
+        def run():
+            for _ in range(10):
+                results.append(client.eth_block_number())
+
+        threads = [threading.Thread(target=run) for _ in range(32)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [100] * 320)
+        # connections are reused, and limited by the pool size
+        self.assertLessEqual(len(self.peers), 8)
+        client.session.close()
@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+import unittest
+import ethrpc
+from test_base import MockAsyncioClient, MockError, TestBase
+
+
+def handler(method, params):
+    time.sleep(0.05)
+    if method == 'eth_getTransactionReceipt':
+        raise MockError(-32000, "unknown transaction")
+    elif method == 'eth_sendRawTransaction':
+        return '0x' + 'ab' * 32
+    return '0x64'
+
+
+def async_handler(method, params):
+    if method == 'eth_getTransactionReceipt':
+        raise MockError(-32000, "unknown transaction")
+    return '0x64'
+
+
+class TestCoalesce(TestBase):
+
+    def fetch_all(self, client, method, params, count=8):
+        barrier = threading.Barrier(count)
+        results = []
+
+        def run():
+            barrier.wait()
+            try:
+                results.append(client.fetch(method, params))
+            except ethrpc.RPCError as error:
+                results.append(error)
+
+        threads = [threading.Thread(target=run) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_threads(self):
+        client = ethrpc.Client(self.endpoint, coalesce=True)
+        with self.mock_rpc(handler) as mockery:
+            results = self.fetch_all(client, 'eth_blockNumber', [])
+            self.assertEqual(results, ['0x64'] * 8)
+            self.assertEqual(mockery.call_count, 1)
+            self.assertEqual(client.flights, {})
+
+            # errors are shared
+            results = self.fetch_all(client, 'eth_getTransactionReceipt', ['0x1'])
+            self.assertTrue(all(isinstance(i, ethrpc.RPCError) for i in results))
+            self.assertEqual(mockery.call_count, 2)
+
+            # methods with side effects are never coalesced
+            self.fetch_all(client, 'eth_sendRawTransaction', ['0x1'], count=2)
+            self.assertEqual(mockery.call_count, 4)
+
+            # once the request completes, calls are sent again
+            client.fetch('eth_blockNumber', [])
+            self.assertEqual(mockery.call_count, 5)
+
+    def test_interrupted(self):
+        client = ethrpc.Client(self.endpoint, coalesce=True)
+        started = threading.Event()
+        results = []
+
+        def interrupt(method, params):
+            started.set()
+            time.sleep(0.05)
+            raise KeyboardInterrupt
+
+        def follow():
+            started.wait()
+            try:
+                results.append(client.fetch('eth_blockNumber', []))
+            except RuntimeError as error:
+                results.append(error)
+
+        with self.mock_rpc(interrupt):
+            thread = threading.Thread(target=follow)
+            thread.start()
+            with self.assertRaises(KeyboardInterrupt):
+                client.fetch('eth_blockNumber', [])
+            thread.join(1)
+
+        # the waiting thread fails, rather than blocking forever
+        self.assertFalse(thread.is_alive())
+        self.assertIsInstance(results[0], RuntimeError)
+        self.assertEqual(client.flights, {})
+
+    def test_disabled(self):
+        with self.mock_rpc(handler) as mockery:
+            self.fetch_all(self.client, 'eth_blockNumber', [], count=4)
+            self.assertEqual(mockery.call_count, 4)
+
+
+@unittest.skipIf(MockAsyncioClient is None, 'Requires aiohttp.')
+class TestAsyncioCoalesce(unittest.TestCase):
+
+    def test_tasks(self):
+        client = MockAsyncioClient(async_handler, decode=True, coalesce=True)
+
+        async def run():
+            numbers = await asyncio.gather(*[client.eth_block_number() for _ in range(10)])
+            balances = await asyncio.gather(*[client.eth_get_balance('0x1', i % 2) for i in range(10)])
+            receipts = await asyncio.gather(*[client.eth_get_transaction_receipt('0x1') for _ in range(3)],
+                                            return_exceptions=True)
+            return numbers, balances, receipts
+
+        numbers, balances, receipts = ethrpc.run(run())
+        self.assertEqual(numbers, [100] * 10)
+        self.assertEqual(balances, [100] * 10)
+        self.assertTrue(all(isinstance(i, ethrpc.RPCError) for i in receipts))
+        methods = [i['method'] for i in client.payloads]
+        self.assertEqual(methods, ['eth_blockNumber', 'eth_getBalance', 'eth_getBalance', 'eth_getTransactionReceipt'])
+        self.assertEqual(client.flights, {})
+
+    def test_cancel(self):
+        client = MockAsyncioClient(async_handler, coalesce=True)
+
+        async def run():
+            first = asyncio.ensure_future(client.fetch('eth_blockNumber', []))
+            second = asyncio.ensure_future(client.fetch('eth_blockNumber', []))
+            await asyncio.sleep(0)
+            second.cancel()
+            return await first
+
+        self.assertEqual(ethrpc.run(run()), '0x64')
+        self.assertEqual(len(client.payloads), 1)
+
+    def test_cancel_leader(self):
+        client = MockAsyncioClient(async_handler, coalesce=True)
+
+        async def run():
+            # the first caller sends the request, but does not own it
+            first = asyncio.ensure_future(client.fetch('eth_blockNumber', []))
+            second = asyncio.ensure_future(client.fetch('eth_blockNumber', []))
+            await asyncio.sleep(0)
+            first.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await first
+            result = await second
+
+            # once every caller is cancelled, so is the request
+            third = asyncio.ensure_future(client.fetch('eth_blockNumber', []))
+            await asyncio.sleep(0)
+            flight = client.flights[ethrpc.cache.request_key('eth_blockNumber', [])]
+            third.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await third
+            await asyncio.sleep(0)
+            return result, flight.task.cancelled()
+
+        self.assertEqual(ethrpc.run(run()), ('0x64', True))
+        self.assertEqual(client.flights, {})
@@ -0,0 +1,34 @@
+import ethrpc
+from ethrpc.codec import CODECS, DEFAULT_CODEC, get_codec
+from test_base import TestBase
+
+
+def handler(method, params):
+    return params
+
+
+class TestCodec(TestBase):
+
+    def test_codecs(self):
+        value = {"jsonrpc": "2.0", "id": 1, "result": [{"number": "0x1b4", "uncles": []}, None, True]}
+        for codec in CODECS.values():
+            encoded = codec.dumps(value)
+            self.assertIsInstance(encoded, bytes)
+            self.assertEqual(codec.loads(encoded), value)
+            self.assertEqual(codec.loads(encoded.decode('utf-8')), value)
+
+    def test_get_codec(self):
+        self.assertIs(get_codec(), DEFAULT_CODEC)
+        self.assertIs(get_codec('json'), CODECS['json'])
+        self.assertIs(get_codec(CODECS['json']), CODECS['json'])
+        with self.assertRaises(ValueError):
+            get_codec('simplejson2')
+
+    def test_client(self):
+        for name in CODECS:
+            client = ethrpc.Client(self.endpoint, decode=True, codec=name)
+            with self.mock_rpc(handler) as mockery:
+                self.assertEqual(client.eth_get_code('0x1', 5), ['0x1', '0x5'])
+                request = mockery.request_history[0]
+            self.assertEqual(request.headers['Content-Type'], 'application/json')
+            self.assertEqual(request.json()['method'], 'eth_getCode')
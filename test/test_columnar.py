@@ -0,0 +1,126 @@
+import pickle
+import unittest
+import ethrpc
+from test_base import TestBase
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BLOCKS = [{
+    "number": hex(15000000 + i),
+    "hash": "0x" + "%064x" % (i + 1),
+    "parentHash": "0x" + "%064x" % i,
+    "miner": "0xea674fdde714fd979de3edf0f56aa9716b898ec8",
+    "timestamp": hex(1655000000 + 12 * i),
+    "size": "0x1d29",
+    "gasLimit": "0x1c9c380",
+    "gasUsed": hex(1000000 * (i + 1)),
+    "baseFeePerGas": hex(10 ** 10 + i) if i else None,
+    "difficulty": "0x2bd0cbd2a1a53a",
+    "totalDifficulty": "0xb5f8be0ac5f3dd0a1cc",
+    "transactions": [{
+        "blockNumber": hex(15000000 + i),
+        "transactionIndex": hex(j),
+        "hash": "0x" + "%064x" % (100 * i + j),
+        "from": "0x" + "%040x" % j,
+        "to": None if j else "0x" + "ab" * 20,
+        "nonce": hex(j),
+        "gas": "0x5208",
+        "gasPrice": hex(2 * 10 ** 10),
+        "value": hex(10 ** 24 * (j + 1)),
+    } for j in range(3)],
+} for i in range(4)]
+
+
+def handler(method, params):
+    if method == 'eth_getBlockByNumber':
+        return BLOCKS[int(params[0], 16) - 15000000]
+    return None
+
+
+@unittest.skipIf(np is None, 'Requires numpy.')
+class TestHex(unittest.TestCase):
+
+    def test_uint64(self):
+        values = ['0x0', '0x1', '0xff', '0xFfFfFfFfFfFfFfFf', None, '0x']
+        numbers = ethrpc.hex_to_uint64(values)
+        self.assertEqual(numbers.dtype, np.uint64)
+        self.assertEqual(numbers.tolist(), [0, 1, 255, 2 ** 64 - 1, 0, 0])
+        self.assertEqual(ethrpc.hex_to_uint64([]).tolist(), [])
+
+    def test_uint256(self):
+        values = [0, 1, 2 ** 70 + 5, 2 ** 256 - 1, 10 ** 24]
+        limbs = ethrpc.hex_to_uint256([hex(i) for i in values])
+        self.assertEqual(limbs.shape, (5, 4))
+        self.assertEqual(limbs[2].tolist(), [5, 64, 0, 0])
+        self.assertEqual(ethrpc.uint256_to_int(limbs).tolist(), values)
+        self.assertAlmostEqual(ethrpc.uint256_to_float(limbs)[4] / 1e24, 1.0)
+
+    def test_bytes(self):
+        data = ethrpc.hex_to_bytes(['0x00ab', '0x1234', '0x1', None], 2)
+        self.assertEqual(data.dtype, np.dtype('S2'))
+        self.assertEqual(data.view(np.uint8).reshape(4, 2).tolist(), [[0, 171], [18, 52], [0, 1], [0, 0]])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ethrpc.hex_to_uint64(['0x1g'])
+        with self.assertRaises(ValueError):
+            ethrpc.hex_to_uint64(['0x' + '1' * 17])
+        with self.assertRaises(ValueError):
+            ethrpc.hex_to_uint64(['12'])
+        # decoded results are already integers
+        with self.assertRaises(ValueError):
+            ethrpc.hex_to_uint64([1, 2])
+
+
+@unittest.skipIf(np is None, 'Requires numpy.')
+class TestColumns(TestBase):
+
+    def test_blocks(self):
+        blocks = ethrpc.block_columns(BLOCKS)
+        self.assertEqual(blocks['number'].tolist(), [15000000, 15000001, 15000002, 15000003])
+        self.assertEqual(blocks['gas_used'].sum(), 10000000)
+        self.assertEqual(ethrpc.uint256_to_int(blocks['base_fee_per_gas']).tolist(), [0, 10 ** 10 + 1, 10 ** 10 + 2, 10 ** 10 + 3])
+        self.assertEqual(np.ascontiguousarray(blocks['hash']).view(np.uint8).reshape(4, 32)[:, -1].tolist(), [1, 2, 3, 4])
+        self.assertEqual(ethrpc.uint256_to_int(blocks['total_difficulty']).tolist(), [int("0xb5f8be0ac5f3dd0a1cc", 16)] * 4)
+
+    def test_transactions(self):
+        transactions = ethrpc.transaction_columns(BLOCKS)
+        self.assertEqual(len(transactions), 12)
+        self.assertEqual(transactions['transaction_index'].tolist(), [0, 1, 2] * 4)
+        self.assertEqual(transactions['to'][0], b'\xab' * 20)
+        self.assertEqual(transactions['to'][1], b'')
+        total = ethrpc.uint256_to_int(transactions['value']).sum()
+        self.assertEqual(total, 24 * 10 ** 24)
+        fees = (transactions['gas'] * ethrpc.uint256_to_int(transactions['gas_price'])).sum()
+        self.assertEqual(fees, 12 * 21000 * 2 * 10 ** 10)
+
+        same = ethrpc.transaction_columns([i for block in BLOCKS for i in block['transactions']])
+        self.assertEqual(same.tobytes(), transactions.tobytes())
+        # fees are 256-bit quantities
+        fees = [dict(i, maxFeePerGas=hex(2 ** 64 + 1)) for i in BLOCKS[0]['transactions']]
+        self.assertEqual(ethrpc.uint256_to_int(ethrpc.transaction_columns(fees)['max_fee_per_gas']).tolist(), [2 ** 64 + 1] * 3)
+        # blocks without full transactions only list hashes
+        hashes = [dict(i, transactions=[j['hash'] for j in i['transactions']]) for i in BLOCKS]
+        with self.assertRaises(ValueError):
+            ethrpc.transaction_columns(hashes)
+        with self.assertRaises(ValueError):
+            ethrpc.transaction_columns(hashes[0]['transactions'])
+        # compact when returned from a worker process
+        self.assertEqual(pickle.loads(pickle.dumps(transactions)).tobytes(), transactions.tobytes())
+
+    def test_custom(self):
+        spec = ethrpc.BLOCK_COLUMNS[:1] + (ethrpc.Column('gas', 'gasUsed', np.uint64, ethrpc.hex_to_uint64),)
+        blocks = ethrpc.block_columns(BLOCKS, spec)
+        self.assertEqual(blocks.dtype.names, ('number', 'gas'))
+
+    def test_iter_blocks(self):
+        with self.mock_rpc(handler):
+            blocks = ethrpc.block_columns(list(self.client.iter_blocks(15000000, 15000003)))
+        self.assertEqual(blocks['timestamp'].tolist(), [1655000000 + 12 * i for i in range(4)])
+
+
+if __name__ == '__main__':
+    unittest.main()
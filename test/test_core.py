@@ -13,3 +13,27 @@ class TestCore(unittest.TestCase):
     def test_abstract_client(self):
         with self.assertRaises(TypeError):
             ethrpc.AbstractClient()
+
+    def test_request_ids(self):
+        client = ethrpc.Client('mock://127.0.0.1:8545')
+        ids = [client.next_id() for _ in range(3)]
+        self.assertEqual(ids, sorted(set(ids)))
+        other = ethrpc.Client('mock://127.0.0.1:8545')
+        self.assertEqual(other.next_id(), ids[0])
+
+    def test_inflight_futures(self):
+        from concurrent.futures import Future
+
+        client = ethrpc.Client('mock://127.0.0.1:8545')
+        first, second = Future(), Future()
+        client.register_future(1, first)
+        client.register_future(2, second)
+        self.assertTrue(client.resolve_future({"id": 2, "result": "0x2"}))
+        self.assertFalse(client.resolve_future({"id": 3, "result": "0x3"}))
+        self.assertEqual(second.result(), {"id": 2, "result": "0x2"})
+        self.assertFalse(first.done())
+
+        client.fail_futures(ConnectionError())
+        with self.assertRaises(ConnectionError):
+            first.result()
+        self.assertEqual(client.inflight, {})
@@ -0,0 +1,109 @@
+import json
+import pickle
+import unittest
+import ethrpc
+from test_base import MockAsyncioClient, MockError, TestBase
+
+BLOCK = {
+    "number": "0x1b4",
+    "hash": "0xdc0818cf78f21a8e70579cb46a43643f78291264dda342ae31049421c82d21ae",
+    "gasUsed": "0x9f759",
+    "timestamp": "0x54e34e8e",
+    "transactions": [{
+        "hash": "0xc6ef2fc5426d6ad6fd9e2a26abeab0aa2411b7ab17f30a99d3cb96aed1d1055b",
+        "blockNumber": "0x1b4",
+        "value": "0xf3dbb76162000",
+        "gasPrice": "0x4a817c800",
+    }],
+}
+
+
+def handler(method, params):
+    if method == 'eth_blockNumber':
+        return '0x4b7'
+    elif method == 'eth_getBlockByNumber':
+        return dict(BLOCK, transactions=[dict(i) for i in BLOCK['transactions']])
+    elif method == 'eth_getTransactionReceipt':
+        return {"status": "0x1", "gasUsed": "0x5208", "logs": [{"logIndex": "0x2"}]}
+    raise MockError(-32601, "the method does not exist")
+
+
+class TestDecode(TestBase):
+
+    def setUp(self):
+        super(TestDecode, self).setUp()
+        self.client = ethrpc.Client(self.endpoint, decode=True)
+
+    def test_quantity(self):
+        with self.mock_rpc(handler):
+            self.assertEqual(self.client.eth_block_number(), 1207)
+
+    def test_block(self):
+        with self.mock_rpc(handler):
+            block = self.client.eth_get_block_by_number(436, True)
+        self.assertEqual(block['number'], 436)
+        self.assertEqual(block['gasUsed'], 653145)
+        self.assertEqual(block['hash'], BLOCK['hash'])
+        self.assertEqual(block['transactions'][0]['value'], 4290000000000000)
+        self.assertEqual(block['transactions'][0]['gasPrice'], 20000000000)
+
+    def test_receipt(self):
+        with self.mock_rpc(handler):
+            receipt = self.client.eth_get_transaction_receipt(BLOCK['transactions'][0]['hash'])
+        self.assertEqual(receipt, {"status": 1, "gasUsed": 21000, "logs": [{"logIndex": 2}]})
+
+    def test_error(self):
+        with self.mock_rpc(handler):
+            with self.assertRaises(ethrpc.RPCError) as context:
+                self.client.eth_coinbase()
+        self.assertEqual(context.exception.code, -32601)
+
+    def test_batch(self):
+        with self.mock_rpc(handler):
+            with self.client.batch() as batch:
+                number = batch.eth_block_number()
+                coinbase = batch.eth_coinbase()
+        self.assertEqual(number.result(), 1207)
+        with self.assertRaises(ethrpc.RPCError):
+            coinbase.result()
+
+    def test_syncing(self):
+        self.assertIs(self.client.decode_body('eth_syncing', {"result": False}), False)
+        status = self.client.decode_body('eth_syncing', {"result": {"currentBlock": "0x10"}})
+        self.assertEqual(status, {"currentBlock": 16})
+
+    def test_decode_result(self):
+        data = json.dumps({"id": 1, "result": dict(BLOCK)}).encode('utf-8')
+        block = ethrpc.decode_result('eth_get_block_by_number', data)
+        self.assertEqual(block['gasUsed'], 653145)
+        self.assertEqual(block['transactions'][0]['gasPrice'], 20000000000)
+        raw = ethrpc.decode_result('eth_get_block_by_number', data, 'json', decode=False)
+        self.assertEqual(raw['gasUsed'], '0x9f759')
+        number = ethrpc.decode_result('eth_get_block_by_number', data, record=lambda i: i['number'])
+        self.assertEqual(number, 436)
+
+    def test_decode_batch(self):
+        data = json.dumps([
+            {"id": 2, "error": {"code": -32000, "message": "header not found", "data": "0x"}},
+            {"id": 1, "result": "0x10"},
+        ]).encode('utf-8')
+        results = ethrpc.decode_batch('eth_block_number', [1, 2, 3], data)
+        self.assertEqual(results[0], 16)
+        self.assertIsInstance(results[1], ethrpc.RPCError)
+        self.assertIsInstance(results[2], ValueError)
+
+        # errors keep their data when returned from a worker process
+        error = pickle.loads(pickle.dumps(results[1]))
+        self.assertEqual((error.code, error.message, error.data), (-32000, "header not found", "0x"))
+
+        # a rejected batch fails every call
+        data = json.dumps({"id": None, "error": {"code": -32600, "message": "invalid"}}).encode('utf-8')
+        results = ethrpc.decode_batch('eth_block_number', [1, 2], data)
+        self.assertEqual([i.code for i in results], [-32600, -32600])
+
+    @unittest.skipIf(MockAsyncioClient is None, 'Requires aiohttp.')
+    def test_asyncio(self):
+        client = MockAsyncioClient(handler, decode=True)
+        self.assertEqual(ethrpc.run(client.eth_block_number()), 1207)
+        with self.assertRaises(ethrpc.RPCError):
+            ethrpc.run(client.eth_coinbase())
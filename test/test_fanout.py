@@ -0,0 +1,222 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+import unittest
+import ethrpc
+from test_base import MockAsyncioClient, TestBase
+
+
+def handler(method, params):
+    if method == 'eth_getBlockByNumber':
+        return {"number": params[0]}
+    return None
+
+
+class TestImap(unittest.TestCase):
+
+    def test_ordered(self):
+        # later items complete first, but are yielded in input order
+        delay = lambda i: time.sleep(0.01 * (5 - i)) or i
+        self.assertEqual(list(ethrpc.imap(delay, range(5), workers=5)), [0, 1, 2, 3, 4])
+
+    def test_unordered(self):
+        delay = lambda i: time.sleep(0.02 * (3 - i)) or i
+        results = list(ethrpc.imap(delay, range(3), workers=3, ordered=False))
+        self.assertEqual(results, [2, 1, 0])
+
+    def test_max_pending(self):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+        consumed = []
+
+        def call(i):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.005)
+            with lock:
+                state['active'] -= 1
+            return i
+
+        def items():
+            for i in range(50):
+                consumed.append(i)
+                yield i
+
+        results = ethrpc.imap(call, items(), workers=8, max_pending=3)
+        self.assertEqual(next(results), 0)
+        # the input is consumed lazily
+        self.assertLessEqual(len(consumed), 4)
+        self.assertEqual(list(results), list(range(1, 50)))
+        self.assertLessEqual(state['peak'], 3)
+
+    def test_error(self):
+        def call(i):
+            if i == 3:
+                raise ValueError(i)
+            return i
+
+        results = ethrpc.imap(call, range(100), workers=2)
+        self.assertEqual([next(results) for _ in range(3)], [0, 1, 2])
+        with self.assertRaises(ValueError):
+            next(results)
+
+        with self.assertRaises(ValueError):
+            list(ethrpc.imap(call, range(10), max_pending=0))
+
+
+class TestClientMap(TestBase):
+
+    def test_map(self):
+        client = ethrpc.Client(self.endpoint, decode=True)
+        with self.mock_rpc(handler):
+            blocks = list(client.map('eth_get_block_by_number', range(20), workers=4))
+            self.assertEqual([i['number'] for i in blocks], list(range(20)))
+
+            blocks = client.map('eth_getBlockByNumber', range(5), workers=2)
+            self.assertEqual([i['number'] for i in blocks], list(range(5)))
+
+            blocks = client.imap_unordered(client.eth_get_block_by_number, range(20), workers=4)
+            self.assertEqual(sorted(i['number'] for i in blocks), list(range(20)))
+
+    def test_shared_executor(self):
+        client = ethrpc.Client(self.endpoint, decode=True)
+        with self.mock_rpc(handler):
+            with concurrent.futures.ThreadPoolExecutor(2) as executor:
+                first = list(client.map('eth_get_block_by_number', range(3), executor=executor))
+                second = list(client.map('eth_get_block_by_number', range(3), executor=executor))
+            self.assertEqual(first, second)
+
+    def test_asyncio(self):
+        async def run():
+            client = MockAsyncioClient(handler, decode=True)
+            blocks = [i async for i in client.map('eth_get_block_by_number', range(20), concurrency=4)]
+            unordered = [i async for i in client.imap_unordered('eth_getBlockByNumber', range(20))]
+            return blocks, unordered
+
+        blocks, unordered = ethrpc.run(run())
+        self.assertEqual([i['number'] for i in blocks], list(range(20)))
+        self.assertEqual(sorted(i['number'] for i in unordered), list(range(20)))
+
+
+class TestAmap(unittest.TestCase):
+
+    def collect(self, *args, **kwds):
+        async def run():
+            return [i async for i in ethrpc.amap(*args, **kwds)]
+        return ethrpc.run(run())
+
+    def test_ordered(self):
+        async def delay(i):
+            await asyncio.sleep(0.01 * (5 - i))
+            return i
+
+        self.assertEqual(self.collect(delay, range(5)), [0, 1, 2, 3, 4])
+        self.assertEqual(self.collect(delay, range(5), ordered=False), [4, 3, 2, 1, 0])
+
+    def test_async_iterable(self):
+        async def items():
+            for i in range(10):
+                await asyncio.sleep(0)
+                yield i
+
+        async def double(i):
+            return 2 * i
+
+        self.assertEqual(self.collect(double, items(), concurrency=3), list(range(0, 20, 2)))
+
+    def test_bounds(self):
+        state = {'active': 0, 'peak': 0, 'consumed': 0}
+
+        async def call(i):
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+            await asyncio.sleep(0.001)
+            state['active'] -= 1
+            return i
+
+        def items():
+            for i in range(100):
+                state['consumed'] += 1
+                yield i
+
+        async def run():
+            results = ethrpc.amap(call, items(), concurrency=4, max_pending=8)
+            first = await results.__anext__()
+            consumed = state['consumed']
+            rest = [i async for i in results]
+            return first, consumed, rest
+
+        first, consumed, rest = ethrpc.run(run())
+        self.assertEqual([first] + rest, list(range(100)))
+        self.assertLessEqual(consumed, 9)
+        self.assertLessEqual(state['peak'], 4)
+
+    def test_fail_fast(self):
+        cancelled = []
+
+        async def call(i):
+            try:
+                await asyncio.sleep(0 if i < 3 else 0.01 if i == 3 else 10)
+                if i == 3:
+                    raise ValueError(i)
+                return i
+            except asyncio.CancelledError:
+                cancelled.append(i)
+                raise
+
+        async def run():
+            results = []
+            with self.assertRaises(ValueError):
+                async for i in ethrpc.amap(call, range(10), concurrency=10):
+                    results.append(i)
+            return results
+
+        # the error is raised without waiting for earlier calls
+        self.assertEqual(ethrpc.run(asyncio.wait_for(run(), 1)), [0, 1, 2])
+        self.assertEqual(sorted(cancelled), list(range(4, 10)))
+
+    def test_return_exceptions(self):
+        async def call(i):
+            if i % 2:
+                raise ValueError(i)
+            await asyncio.sleep(0.05 if i == 4 else 0)
+            return i
+
+        results = self.collect(call, range(6), return_exceptions=True, timeout=0.01)
+        self.assertEqual(results[::2][:2], [0, 2])
+        self.assertIsInstance(results[1], ValueError)
+        self.assertIsInstance(results[4], asyncio.TimeoutError)
+
+    def test_cancel(self):
+        cancelled = []
+
+        async def call(i):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(i)
+                raise
+
+        async def consume():
+            async for _ in ethrpc.amap(call, range(1000), concurrency=5):
+                pass
+
+        async def run():
+            task = asyncio.ensure_future(consume())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        ethrpc.run(run())
+        # running calls are cancelled, as are calls waiting to run
+        self.assertEqual(len(cancelled), 5)
+
+        with self.assertRaises(ValueError):
+            self.collect(call, range(3), concurrency=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+import unittest
+import ethrpc
+from test_base import MockAsyncioClient, MockError, TestBase
+
+
+class MockNode(object):
+    '''Node with expiring filters, with responses from `handler`.'''
+
+    def __init__(self):
+        self.number = 100
+        self.count = 0
+        self.filters = {}
+        self.uninstalled = []
+
+    def log(self, number, index=0):
+        return {'blockNumber': hex(number), 'blockHash': '0x{:064x}'.format(number), 'logIndex': hex(index)}
+
+    def install(self, kind, params):
+        self.count += 1
+        id_ = hex(self.count)
+        self.filters[id_] = {'kind': kind, 'params': params, 'changes': []}
+        return id_
+
+    def push(self, kind, change):
+        for filter_ in self.filters.values():
+            if filter_['kind'] == kind:
+                filter_['changes'].append(change)
+
+    def expire(self):
+        self.filters.clear()
+
+    def get(self, id_):
+        try:
+            return self.filters[id_]
+        except KeyError:
+            raise MockError(-32000, "filter not found")
+
+    def handler(self, method, params):
+        if method == 'eth_blockNumber':
+            return hex(self.number)
+        elif method == 'eth_newFilter':
+            return self.install('logs', params[0])
+        elif method == 'eth_newBlockFilter':
+            return self.install('blocks', params)
+        elif method == 'shh_newMessageFilter':
+            return self.install('messages', params[0])
+        elif method in ('eth_getFilterChanges', 'shh_getFilterMessages'):
+            filter_ = self.get(params[0])
+            changes, filter_['changes'] = filter_['changes'], []
+            return changes
+        elif method == 'eth_getFilterLogs':
+            first = int(self.get(params[0])['params']['fromBlock'], 16)
+            return [self.log(i) for i in range(first, self.number + 1)]
+        elif method in ('eth_uninstallFilter', 'shh_deleteMessageFilter'):
+            self.uninstalled.append(params[0])
+            return self.filters.pop(params[0], None) is not None
+
+
+class TestFilterManager(TestBase):
+
+    def test_poll(self):
+        node = MockNode()
+        with self.mock_rpc(node.handler) as mockery:
+            manager = ethrpc.FilterManager(self.client)
+            logs = [manager.new_filter(from_block='latest', address='0x1') for _ in range(50)]
+            blocks = manager.new_block_filter()
+            messages = manager.new_message_filter(['0x01'])
+            self.assertEqual(len(manager), 52)
+            self.assertEqual(node.filters['0x1']['params'], {'fromBlock': 'latest', 'address': '0x1'})
+            self.assertEqual(messages.id, '0x34')
+            self.assertEqual(blocks.id, 51)
+
+            # all filters are polled in a single request
+            node.push('logs', node.log(100))
+            node.push('blocks', '0xb')
+            node.push('messages', {'payload': '0x'})
+            count = mockery.call_count
+            results = manager.poll()
+            self.assertEqual(mockery.call_count, count + 1)
+            self.assertEqual(len(results), 52)
+            self.assertEqual(results[logs[0]].changes, [node.log(100)])
+            self.assertEqual(results[blocks].changes, ['0xb'])
+            self.assertEqual(results[messages].changes, [{'payload': '0x'}])
+            self.assertEqual(logs[0].cursor, 101)
+
+            manager.remove(messages)
+            self.assertEqual(node.uninstalled, ['0x34'])
+            manager.close()
+            self.assertEqual(len(node.uninstalled), 52)
+            self.assertEqual(len(manager), 0)
+            self.assertEqual(manager.poll(), {})
+
+    def test_reinstall(self):
+        node = MockNode()
+        with self.mock_rpc(node.handler), ethrpc.FilterManager(self.client) as manager:
+            logs = manager.new_filter(from_block='latest')
+            blocks = manager.new_block_filter()
+            empty = ethrpc.FilterResult([], None)
+            self.assertEqual(manager.poll(), {logs: empty, blocks: empty})
+
+            # logs missed while expired are filled from the last poll
+            node.number = 103
+            node.expire()
+            results = manager.poll()
+            self.assertEqual(results[logs].changes, [node.log(101), node.log(102), node.log(103)])
+            self.assertEqual(results[blocks].changes, [])
+            self.assertEqual(node.filters[hex(logs.id)]['params'], {'fromBlock': '0x65'})
+            self.assertEqual(blocks.id, 4)
+
+            # and skipped if returned by the next poll
+            node.number = 104
+            node.push('logs', node.log(103))
+            node.push('logs', node.log(104))
+            self.assertEqual(manager.poll()[logs].changes, [node.log(104)])
+
+    def test_boundary(self):
+        node = MockNode()
+        with self.mock_rpc(node.handler), ethrpc.FilterManager(self.client) as manager:
+            logs = manager.new_filter(from_block='latest')
+
+            # the head is read after the poll, so logs past the returned
+            # logs are filled after a reinstall, not skipped
+            node.push('logs', node.log(100))
+            node.number = 105
+            self.assertEqual(manager.poll()[logs].changes, [node.log(100)])
+            self.assertEqual(logs.cursor, 101)
+            node.expire()
+            results = manager.poll()
+            self.assertEqual(results[logs].changes, [node.log(i) for i in range(101, 106)])
+
+            # the head is read before the poll, so logs returned from the
+            # block past the head are not duplicated
+            node.push('logs', node.log(107))
+            node.push('logs', node.log(107, 1))
+            self.assertEqual(len(manager.poll()[logs].changes), 2)
+            self.assertEqual(logs.cursor, 107)
+            node.number = 107
+            node.expire()
+            self.assertEqual(manager.poll()[logs].changes, [])
+
+    def test_decode(self):
+        node = MockNode()
+        client = ethrpc.Client(self.endpoint, decode=ethrpc.MODEL_DECODERS)
+        with self.mock_rpc(node.handler), ethrpc.FilterManager(client) as manager:
+            logs = manager.new_filter()
+            manager.poll()
+            node.number = 102
+            node.expire()
+            results = manager.poll()
+            self.assertEqual([i.block_number for i in results[logs].changes], [101, 102])
+            node.push('logs', node.log(102))
+            self.assertEqual(manager.poll()[logs].changes, [])
+
+    def test_error(self):
+        def handler(method, params):
+            if method in failing:
+                raise MockError(-32603, "internal error")
+            return node.handler(method, params)
+
+        node = MockNode()
+        failing = set()
+        with self.mock_rpc(handler):
+            manager = ethrpc.FilterManager(self.client)
+            logs = manager.new_filter(from_block='latest')
+            messages = manager.new_message_filter(['0x01'])
+
+            # errors are returned by filter, without losing the changes
+            # consumed from other filters
+            failing.update(['shh_getFilterMessages', 'eth_blockNumber'])
+            node.push('logs', node.log(100))
+            results = manager.poll()
+            self.assertEqual(results[logs], ethrpc.FilterResult([node.log(100)], None))
+            self.assertEqual(results[messages].changes, [])
+            self.assertIsInstance(results[messages].error, ethrpc.RPCError)
+            self.assertIsNone(logs.head)
+
+            # filters failing to reinstall are reinstalled by the next poll
+            failing = set(['eth_newFilter'])
+            node.number = 102
+            node.expire()
+            results = manager.poll()
+            self.assertIsInstance(results[logs].error, ethrpc.RPCError)
+            self.assertIsNone(logs.id)
+            self.assertEqual(results[messages], ethrpc.FilterResult([], None))
+            failing.clear()
+            results = manager.poll()
+            self.assertEqual(results[logs], ethrpc.FilterResult([node.log(101), node.log(102)], None))
+
+            # errors installing a new filter are raised
+            failing.add('eth_newBlockFilter')
+            with self.assertRaises(ethrpc.RPCError):
+                manager.new_block_filter()
+            self.assertEqual(len(manager), 2)
+
+
+@unittest.skipIf(MockAsyncioClient is None, 'Requires aiohttp.')
+class TestAsyncioFilterManager(unittest.TestCase):
+
+    def test_poll(self):
+        node = MockNode()
+        client = MockAsyncioClient(node.handler)
+
+        async def run():
+            async with ethrpc.AsyncioFilterManager(client) as manager:
+                logs = await manager.new_filter(from_block='latest')
+                blocks = await manager.new_block_filter()
+                node.push('logs', node.log(100))
+                count = len(client.payloads)
+                results = await manager.poll()
+                self.assertEqual(len(client.payloads), count + 1)
+                self.assertEqual(results[logs], ethrpc.FilterResult([node.log(100)], None))
+                self.assertEqual(results[blocks], ethrpc.FilterResult([], None))
+
+                node.number = 102
+                node.expire()
+                results = await manager.poll()
+                self.assertEqual(results[logs].changes, [node.log(101), node.log(102)])
+                await manager.remove(blocks)
+                self.assertEqual(len(manager), 1)
+
+        ethrpc.run(run())
+        self.assertEqual(node.uninstalled, ['0x4', '0x3'])
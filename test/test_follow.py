@@ -0,0 +1,210 @@
+import unittest
+import ethrpc
+from ethrpc.follow import ChainTracker
+from test_base import MockAsyncioClient, MockError, TestBase
+
+
+class MockChain(object):
+    '''Simulated chain, with JSON-RPC responses from `handler`.'''
+
+    def __init__(self, length, filters=True):
+        self.count = 0
+        self.blocks = {}
+        self.canonical = []
+        self.filters = filters
+        self.seen = 0
+        self.extend(length)
+
+    def block(self, number, parent):
+        self.count += 1
+        hash_ = '0x{:064x}'.format(self.count)
+        block = {'number': hex(number), 'hash': hash_, 'parentHash': parent}
+        self.blocks[hash_] = block
+        return block
+
+    def extend(self, count):
+        for _ in range(count):
+            parent = self.canonical[-1]['hash'] if self.canonical else '0x' + '0' * 64
+            self.canonical.append(self.block(len(self.canonical), parent))
+
+    def reorg(self, depth, count):
+        del self.canonical[-depth:]
+        self.seen = min(self.seen, len(self.canonical))
+        self.extend(count)
+
+    def handler(self, method, params):
+        if method == 'eth_getBlockByNumber':
+            if params[0] == 'latest':
+                return self.canonical[-1]
+            return self.canonical[int(params[0], 16)]
+        elif method == 'eth_getBlockByHash':
+            return self.blocks[params[0]]
+        elif method == 'eth_blockNumber':
+            return hex(len(self.canonical) - 1)
+        elif not self.filters:
+            raise MockError(-32601, "Method not found")
+        elif method == 'eth_newBlockFilter':
+            self.seen = len(self.canonical)
+            return '0x1'
+        elif method == 'eth_getFilterChanges':
+            hashes = [i['hash'] for i in self.canonical[self.seen:]]
+            self.seen = len(self.canonical)
+            return hashes
+        elif method == 'eth_uninstallFilter':
+            return True
+
+
+def summary(events):
+    return [(i.type, int(i.block['number'], 16)) for i in events]
+
+
+class TestChainTracker(unittest.TestCase):
+
+    def test_tracker(self):
+        chain = MockChain(10)
+        tracker = ChainTracker(4)
+        self.assertIsNone(tracker.head)
+        self.assertTrue(tracker.behind(0))
+        self.assertEqual(summary(tracker.apply(chain.canonical[:6])), [('added', i) for i in range(6)])
+        self.assertEqual(len(tracker), 4)
+        self.assertEqual(tracker.head, chain.canonical[5])
+        self.assertFalse(tracker.behind(5))
+        self.assertTrue(tracker.behind(6))
+
+        # new heads link to the buffer through their parents
+        self.assertEqual(tracker.missing(chain.canonical[8]), chain.canonical[7]['hash'])
+        self.assertIsNone(tracker.missing(chain.canonical[6]))
+        self.assertEqual(summary(tracker.apply(chain.canonical[6:9])), [('added', i) for i in range(6, 9)])
+
+        # known heads are ignored
+        self.assertEqual(tracker.apply(chain.canonical[8:9]), [])
+
+        with self.assertRaises(ValueError):
+            ChainTracker(0)
+
+
+class TestChainFollower(TestBase):
+
+    def test_filter(self):
+        chain = MockChain(5)
+        follower = ethrpc.ChainFollower(self.client, depth=8, interval=0)
+        with self.mock_rpc(chain.handler), follower:
+            events = follower.events()
+            self.assertEqual(summary([next(events)]), [('added', 4)])
+            self.assertEqual(follower.poll(), [])
+            self.assertEqual(follower.mode, 'filter')
+
+            # fetch the missing parents of a new head
+            chain.extend(3)
+            self.assertEqual(summary(follower.poll()), [('added', 5), ('added', 6), ('added', 7)])
+
+            # removed blocks are newest first, added blocks oldest first
+            chain.reorg(2, 3)
+            self.assertEqual(summary(follower.poll()), [
+                ('removed', 7), ('removed', 6),
+                ('added', 6), ('added', 7), ('added', 8),
+            ])
+            self.assertEqual(follower.tracker.head, chain.canonical[-1])
+        self.assertIsNone(follower.filter_id)
+
+    def test_block_number(self):
+        chain = MockChain(5, filters=False)
+        follower = ethrpc.ChainFollower(self.client, depth=8, interval=0)
+        with self.mock_rpc(chain.handler):
+            self.assertEqual(summary(follower.poll()), [('added', 4)])
+            self.assertEqual(follower.mode, 'block_number')
+            self.assertEqual(follower.poll(), [])
+
+            chain.reorg(1, 2)
+            self.assertEqual(summary(follower.poll()), [('removed', 4), ('added', 4), ('added', 5)])
+
+    def test_deep_reorg(self):
+        chain = MockChain(10, filters=False)
+        follower = ethrpc.ChainFollower(self.client, depth=3, interval=0)
+        with self.mock_rpc(chain.handler):
+            follower.poll()
+            chain.extend(2)
+            self.assertEqual(summary(follower.poll()), [('added', 10), ('added', 11)])
+
+            # reorgs deeper than the buffer replace the whole buffer
+            chain.reorg(5, 6)
+            self.assertEqual(summary(follower.poll()), [
+                ('removed', 11), ('removed', 10), ('removed', 9),
+                ('added', 9), ('added', 10), ('added', 11), ('added', 12),
+            ])
+
+
+@unittest.skipIf(MockAsyncioClient is None, 'Requires aiohttp.')
+class TestAsyncioChainFollower(unittest.TestCase):
+
+    def test_filter(self):
+        chain = MockChain(5)
+        client = MockAsyncioClient(chain.handler)
+
+        async def run():
+            events = []
+            async with ethrpc.AsyncioChainFollower(client, interval=0) as follower:
+                iterator = follower.events()
+                async for event in iterator:
+                    events.append(event)
+                    if len(chain.canonical) < 8:
+                        chain.extend(1)
+                    elif len(events) == 4:
+                        chain.reorg(1, 2)
+                    elif len(events) == 7:
+                        break
+                await iterator.aclose()
+            return events
+
+        events = ethrpc.run(run())
+        self.assertEqual(summary(events), [
+            ('added', 4), ('added', 5), ('added', 6), ('added', 7),
+            ('removed', 7), ('added', 7), ('added', 8),
+        ])
+        self.assertEqual(client.payloads[-1]['method'], 'eth_uninstallFilter')
+
+    def test_subscription(self):
+        chain = MockChain(5)
+
+        class MockSubscription(object):
+
+            def __init__(self):
+                self.unsubscribed = False
+
+            async def __aiter__(self):
+                chain.extend(2)
+                yield chain.canonical[-1]
+                chain.reorg(1, 1)
+                yield chain.canonical[-1]
+
+            async def unsubscribe(self):
+                self.unsubscribed = True
+
+        subscription = MockSubscription()
+
+        class MockSubscribeClient(MockAsyncioClient):
+
+            async def subscribe(self, name, *args, **kwds):
+                self.subscribed = (name, args)
+                return subscription
+
+        client = MockSubscribeClient(chain.handler)
+
+        async def run():
+            follower = ethrpc.AsyncioChainFollower(client)
+            iterator = follower.events()
+            events = []
+            async for event in iterator:
+                events.append(event)
+                if len(events) == 5:
+                    break
+            await iterator.aclose()
+            return follower, events
+
+        follower, events = ethrpc.run(run())
+        self.assertEqual(summary(events), [
+            ('added', 4), ('added', 5), ('added', 6), ('removed', 6), ('added', 6),
+        ])
+        self.assertEqual(client.subscribed, ('eth_subscribe', ('newHeads',)))
+        self.assertEqual(follower.mode, 'subscription')
+        self.assertTrue(subscription.unsubscribed)
@@ -0,0 +1,79 @@
+import json
+import subprocess
+import sys
+import unittest
+import ethrpc
+from test_base import rpc_response
+
+try:
+    import httpx
+    import h2
+except ImportError:
+    httpx = None
+
+
+def handler(method, params):
+    if method == 'eth_getLogs':
+        return [{'logIndex': hex(i)} for i in range(3)]
+    return '0x64'
+
+
+def transport(statuses=()):
+    '''Mock transport, failing with `statuses` before responding.'''
+
+    statuses = list(statuses)
+    requests = []
+
+    def respond(request):
+        requests.append(request)
+        if statuses:
+            return httpx.Response(statuses.pop(0))
+        return httpx.Response(200, json=rpc_response(handler, json.loads(request.content)))
+
+    return requests, respond
+
+
+@unittest.skipIf(httpx is None, 'Requires httpx[http2].')
+class TestHTTP2Client(unittest.TestCase):
+
+    def test_call(self):
+        requests, respond = transport()
+        with ethrpc.HTTP2Client('http://node:8545', decode=True,
+                                transport=httpx.MockTransport(respond)) as client:
+            self.assertEqual(client.eth_block_number(), 100)
+            with client.batch() as batch:
+                calls = [batch.eth_block_number() for _ in range(3)]
+            self.assertEqual([batch.unwrap(i) for i in calls], [100] * 3)
+            self.assertEqual(len(list(client.stream('eth_get_logs'))), 3)
+        self.assertEqual(len(requests), 3)
+        self.assertEqual(requests[0].headers['Content-Type'], 'application/json')
+
+    def test_retry(self):
+        requests, respond = transport([503, 502])
+        policy = ethrpc.RetryPolicy(backoff=0.001)
+        with ethrpc.HTTP2Client('http://node:8545', decode=True, retry=policy,
+                                transport=httpx.MockTransport(respond)) as client:
+            self.assertEqual(client.eth_block_number(), 100)
+        self.assertEqual(len(requests), 3)
+
+    def test_asyncio(self):
+        requests, respond = transport([429])
+        policy = ethrpc.RetryPolicy(backoff=0.001)
+
+        async def run():
+            async with ethrpc.AsyncioHTTP2Client('http://node:8545', decode=True, retry=policy,
+                                                 transport=httpx.MockTransport(respond)) as client:
+                number = await client.eth_block_number()
+                logs = [i async for i in client.stream('eth_get_logs')]
+                return number, logs
+
+        number, logs = ethrpc.run(run())
+        self.assertEqual(number, 100)
+        self.assertEqual(len(logs), 3)
+        self.assertEqual(len(requests), 3)
+
+    def test_without_aiohttp(self):
+        # the synchronous client does not require aiohttp
+        code = ("import sys; sys.modules['aiohttp'] = None; import ethrpc.http2; "
+                "assert not hasattr(ethrpc.http2, 'AsyncioHTTP2Client')")
+        subprocess.check_call([sys.executable, '-c', code])
@@ -0,0 +1,102 @@
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+import ethrpc
+
+try:
+    import asyncio
+    AsyncioIPCClient = ethrpc.AsyncioIPCClient
+except AttributeError:
+    AsyncioIPCClient = None
+
+
+def respond(payload):
+    '''Echo the parameters of each request as its result.'''
+
+    if isinstance(payload, list):
+        return [respond(i) for i in payload]
+    return {"jsonrpc": "2.0", "id": payload["id"], "result": payload["params"]}
+
+
+class TestJSONStream(unittest.TestCase):
+
+    def test_feed(self):
+        stream = ethrpc.JSONStream()
+        self.assertEqual(stream.feed(b'{"id": 1, "res'), [])
+        self.assertEqual(stream.feed(b'ult": "0x1"}\n{"id": 2}\n['), [
+            {"id": 1, "result": "0x1"},
+            {"id": 2},
+        ])
+        self.assertEqual(stream.feed(b'1,\n 2]\n'), [[1, 2]])
+        self.assertEqual(stream.feed(b'{"a\n{"id": 3}\n'), [{"id": 3}])
+
+
+@unittest.skipIf(not hasattr(socket, 'AF_UNIX'), 'Requires Unix domain sockets.')
+class TestIPC(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'geth.ipc')
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.path)
+        self.server.listen(1)
+        self.thread = threading.Thread(target=self.serve)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.close()
+        shutil.rmtree(self.directory)
+
+    def serve(self):
+        connection, _ = self.server.accept()
+        stream = ethrpc.JSONStream()
+        with connection:
+            while True:
+                data = connection.recv(4096)
+                if not data:
+                    break
+                for payload in stream.feed(data):
+                    # split responses to exercise incremental decoding.
+                    body = json.dumps(respond(payload)).encode('utf-8') + b'\n'
+                    connection.sendall(body[:10])
+                    connection.sendall(body[10:])
+
+    def test_call(self):
+        with ethrpc.IPCClient(self.path, timeout=5) as client:
+            address = '0xdae1bfb92c7c0fd23396619ee1a0d643bf609c2e'
+            body = client.eth_get_balance(address)
+            self.assertEqual(body['result'], [address, 'latest'])
+            with client.batch() as batch:
+                results = [batch.eth_get_block_by_number(i) for i in range(3)]
+            self.assertEqual([i.result()['result'][0] for i in results], ['0x0', '0x1', '0x2'])
+
+    def test_stream(self):
+        # responses are buffered, then parsed incrementally
+        with ethrpc.IPCClient(self.path, timeout=5) as client:
+            logs = list(client.stream('eth_get_logs', 1, 2))
+        self.assertEqual(len(logs), 1)
+        self.assertEqual(logs[0]['fromBlock'], '0x1')
+
+    def test_limiter(self):
+        limiter = ethrpc.RateLimiter(rate=20, burst=1)
+        with ethrpc.IPCClient(self.path, timeout=5, limiter=limiter) as client:
+            start = time.time()
+            for i in range(5):
+                self.assertEqual(client.eth_get_block_by_number(i)['result'][0], hex(i))
+            self.assertGreaterEqual(time.time() - start, 0.18)
+
+    @unittest.skipIf(AsyncioIPCClient is None, 'Requires aiohttp.')
+    def test_asyncio_call(self):
+        async def run():
+            async with ethrpc.AsyncioIPCClient(self.path) as client:
+                futures = [client.eth_get_block_by_number(i) for i in range(10)]
+                return await asyncio.gather(*futures)
+
+        bodies = ethrpc.run(run())
+        self.assertEqual([i['result'][0] for i in bodies], [hex(i) for i in range(10)])
@@ -0,0 +1,175 @@
+import concurrent.futures
+import unittest
+import ethrpc
+from test_base import MockAsyncioClient, MockError, TestBase, rpc_response
+
+
+def handler(method, params):
+    if method == 'eth_getBlockByNumber':
+        if params[0] == '0x2a':
+            raise MockError(-32000, "header not found")
+        return {"number": params[0], "transactions": [] if params[1] else None}
+    elif method == 'trace_block':
+        return [{"action": {"gas": "0x10", "value": "0x0"}, "result": {"gasUsed": params[0]}}]
+    return None
+
+
+class ParsedClient(ethrpc.Client):
+    '''Client whose responses are parsed on receipt, as over IPC.'''
+
+    def call(self, payload):
+        return rpc_response(handler, payload)
+
+    def parse(self, response):
+        return response
+
+
+class RawAsyncioClient(MockAsyncioClient or object):
+    '''Asynchronous client returning raw response bodies, as over HTTP.'''
+
+    async def call(self, payload):
+        response = await super(RawAsyncioClient, self).call(payload)
+        return self.codec.dumps(response)
+
+    async def parse(self, response):
+        return self.codec.loads(response)
+
+    async def content(self, response):
+        return response
+
+
+class UnusedExecutor(concurrent.futures.Executor):
+    '''Executor which fails if a task is submitted.'''
+
+    def submit(self, fn, *args, **kwds):
+        raise AssertionError("Unexpected task submitted to the executor.")
+
+
+def number(block):
+    '''Compact record for a block, run in the worker processes.'''
+
+    return block['number']
+
+
+class TestIterBlocks(TestBase):
+
+    def test_iter_blocks(self):
+        with self.mock_rpc(handler) as mockery:
+            blocks = list(self.client.iter_blocks(5, 29, prefetch=10))
+            self.assertEqual(mockery.call_count, 3)
+        self.assertEqual([int(i['number'], 16) for i in blocks], list(range(5, 30)))
+
+    def test_decode(self):
+        client = ethrpc.Client(self.endpoint, decode=True)
+        with self.mock_rpc(handler):
+            blocks = list(client.iter_blocks(0, 3, full_transactions=True))
+        self.assertEqual([i['number'] for i in blocks], [0, 1, 2, 3])
+        self.assertEqual(blocks[0]['transactions'], [])
+
+    def test_error(self):
+        with self.mock_rpc(handler):
+            blocks = self.client.iter_blocks(40, 45, prefetch=2)
+            self.assertEqual(next(blocks)['number'], '0x28')
+            self.assertEqual(next(blocks)['number'], '0x29')
+            with self.assertRaises(ethrpc.RPCError):
+                next(blocks)
+
+
+    def test_executor(self):
+        client = ethrpc.Client(self.endpoint, decode=True)
+        with self.mock_rpc(handler) as mockery, concurrent.futures.ProcessPoolExecutor(2) as executor:
+            blocks = list(client.iter_blocks(100, 349, prefetch=20, executor=executor))
+            self.assertEqual(mockery.call_count, 13)
+            self.assertEqual([i['number'] for i in blocks], list(range(100, 350)))
+
+            # records are converted by the workers
+            numbers = list(client.iter_blocks(0, 9, executor=executor, record=number))
+            self.assertEqual(numbers, list(range(10)))
+
+            # custom decoders are run by the workers
+            client = ethrpc.Client(self.endpoint, decode=ethrpc.MODEL_DECODERS)
+            blocks = list(client.iter_blocks(0, 2, executor=executor))
+            self.assertEqual([i.number for i in blocks], [0, 1, 2])
+
+            # without decoding, results are returned unchanged
+            numbers = list(self.client.iter_blocks(0, 2, executor=executor, record=number))
+            self.assertEqual(numbers, ['0x0', '0x1', '0x2'])
+
+            blocks = self.client.iter_blocks(40, 45, prefetch=2, executor=executor)
+            self.assertEqual(next(blocks)['number'], '0x28')
+            self.assertEqual(next(blocks)['number'], '0x29')
+            with self.assertRaises(ethrpc.RPCError):
+                next(blocks)
+
+    def test_iter_block_traces(self):
+        client = ethrpc.Client(self.endpoint, decode=True)
+        with self.mock_rpc(handler):
+            traces = list(client.iter_block_traces(1, 3))
+        self.assertEqual([i[0]['result']['gasUsed'] for i in traces], [1, 2, 3])
+        self.assertEqual(traces[0][0]['action'], {'gas': 16, 'value': 0})
+
+    def test_executor_models(self):
+        # model decoders for lists are picklable, and sent to the workers
+        client = ethrpc.Client(self.endpoint, decode=ethrpc.MODEL_DECODERS)
+        with self.mock_rpc(handler), concurrent.futures.ProcessPoolExecutor(2) as executor:
+            traces = list(client.iter_block_traces(1, 3, executor=executor))
+        self.assertEqual([i[0].result for i in traces], [{'gasUsed': hex(i)} for i in range(1, 4)])
+        self.assertIsInstance(traces[0][0], ethrpc.Trace)
+
+    def test_executor_parsed(self):
+        # responses parsed on receipt are decoded without the executor
+        client = ParsedClient(decode=ethrpc.MODEL_DECODERS)
+        traces = list(client.iter_block_traces(1, 3, executor=UnusedExecutor()))
+        self.assertEqual([i[0].result for i in traces], [{'gasUsed': hex(i)} for i in range(1, 4)])
+
+
+@unittest.skipIf(MockAsyncioClient is None, 'Requires aiohttp.')
+class TestAsyncioIterBlocks(unittest.TestCase):
+
+    def test_iter_blocks(self):
+        client = MockAsyncioClient(handler)
+
+        async def run():
+            blocks = []
+            async for block in client.iter_blocks(0, 24, prefetch=4):
+                # requests are only made as the consumer takes blocks
+                self.assertLessEqual(len(client.payloads), len(blocks) + 5)
+                blocks.append(block)
+            return blocks
+
+        blocks = ethrpc.run(run())
+        self.assertEqual([int(i['number'], 16) for i in blocks], list(range(25)))
+
+    def test_error(self):
+        client = MockAsyncioClient(handler)
+
+        async def run():
+            return [i async for i in client.iter_blocks(40, 45)]
+
+        with self.assertRaises(ethrpc.RPCError):
+            ethrpc.run(run())
+
+    def test_executor(self):
+        client = RawAsyncioClient(handler, decode=True)
+
+        async def run():
+            with concurrent.futures.ProcessPoolExecutor(2) as executor:
+                blocks = [i async for i in client.iter_blocks(0, 24, prefetch=4, executor=executor)]
+                numbers = [i async for i in client.iter_blocks(0, 4, executor=executor, record=number)]
+                traces = [i async for i in client.iter_block_traces(0, 2, executor=executor)]
+            return blocks, numbers, traces
+
+        blocks, numbers, traces = ethrpc.run(run())
+        self.assertEqual([i['number'] for i in blocks], list(range(25)))
+        self.assertEqual(numbers, list(range(5)))
+        self.assertEqual([i[0]['result']['gasUsed'] for i in traces], [0, 1, 2])
+
+    def test_executor_parsed(self):
+        # responses parsed on receipt are decoded without the executor
+        client = MockAsyncioClient(handler, decode=ethrpc.MODEL_DECODERS)
+
+        async def run():
+            return [i async for i in client.iter_block_traces(0, 2, executor=UnusedExecutor())]
+
+        traces = ethrpc.run(run())
+        self.assertEqual([i[0].result for i in traces], [{'gasUsed': hex(i)} for i in range(3)])
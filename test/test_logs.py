@@ -0,0 +1,158 @@
+import asyncio
+import unittest
+import ethrpc
+from ethrpc.logs import LogRange, LogWindow, is_range_error
+from test_base import MockAsyncioClient, MockError, TestBase
+
+
+def handler(method, params):
+    '''Two logs per block, rejecting queries over more than 50 results.'''
+
+    if method == 'eth_getLogs':
+        first = int(params[0]['fromBlock'], 16)
+        last = int(params[0]['toBlock'], 16)
+        if 2 * (last - first + 1) > 50:
+            raise MockError(-32005, "query returned more than 50 results")
+        if first <= 77 <= last:
+            raise MockError(-32000, "unknown block")
+        return [{"blockNumber": hex(i), "logIndex": hex(j)}
+                for i in range(first, last + 1) for j in range(2)]
+    return None
+
+
+def blocks(logs):
+    return [int(i['blockNumber'], 16) for i in logs]
+
+
+class TestLogWindow(unittest.TestCase):
+
+    def test_is_range_error(self):
+        self.assertTrue(is_range_error(ethrpc.RPCError(-32005, "limit exceeded")))
+        self.assertTrue(is_range_error(ethrpc.RPCError(-32000, "query timeout exceeded")))
+        self.assertTrue(is_range_error(ethrpc.RPCError(-32602, "block range is too wide")))
+        self.assertTrue(is_range_error(ethrpc.RPCError(-32000, "Log response size exceeded.")))
+        self.assertTrue(is_range_error(ethrpc.RPCError(-32000, "exceed maximum block range: 5000")))
+        self.assertFalse(is_range_error(ethrpc.RPCError(-32000, "unknown block")))
+        self.assertFalse(is_range_error(ValueError()))
+
+        # rate limits are not range errors, even with the EIP-1474 code
+        self.assertFalse(is_range_error(ethrpc.RPCError(-32005, "daily request count exceeded, request rate limited")))
+        self.assertFalse(is_range_error(ethrpc.RPCError(-32000, "rate limit exceeded")))
+        self.assertFalse(is_range_error(ethrpc.RPCError(-32000, "daily request limit reached")))
+        self.assertFalse(is_range_error(ethrpc.RPCError(429, "Too Many Requests")))
+
+    def test_rate_limit(self):
+        # the range is not bisected when the node asks for less load
+        planner = LogWindow(0, 99, window=10)
+        ranges = planner.pending(2)
+        with self.assertRaises(ethrpc.RPCError):
+            planner.fail(ranges[0], ethrpc.RPCError(-32005, "rate limit exceeded"))
+        self.assertEqual(planner.window, 10)
+        self.assertEqual([(i.start, i.end) for i in planner.ranges], [(0, 9), (10, 19)])
+
+    def test_split(self):
+        self.assertEqual([(i.start, i.end) for i in LogRange(10, 20).split()], [(10, 14), (15, 20)])
+        self.assertEqual([(i.start, i.end) for i in LogRange(10, 11).split()], [(10, 10), (11, 11)])
+
+    def test_window(self):
+        planner = LogWindow(0, 99, window=10, target=20)
+        ranges = planner.pending(2)
+        self.assertEqual([(i.start, i.end) for i in ranges], [(0, 9), (10, 19)])
+
+        # bisect failed ranges in place, and shrink the window
+        planner.fail(ranges[0], ethrpc.RPCError(-32005, "limit exceeded"))
+        self.assertEqual(planner.window, 5)
+        self.assertEqual([(i.start, i.end) for i in planner.pending(2)], [(0, 4), (5, 9)])
+
+        # grow the window while results are sparse, but only consume
+        # logs in block order
+        planner.complete(ranges[1], [10])
+        self.assertEqual(planner.window, 10)
+        self.assertEqual(planner.consume(), [])
+
+        self.assertEqual([(i.start, i.end) for i in planner.pending(3)], [(0, 4), (5, 9), (20, 29)])
+        planner.complete(planner.ranges[0], [0])
+        planner.complete(planner.ranges[1], [5])
+        self.assertEqual(planner.window, 10)
+        self.assertEqual(planner.consume(), [0, 5, 10])
+
+        with self.assertRaises(ValueError):
+            planner.fail(planner.ranges[0], ValueError())
+
+    def test_max_ranges(self):
+        # ranges past a slow range are not planned until it is consumed
+        planner = LogWindow(0, 99, window=10, max_ranges=4)
+        ranges = planner.pending(4)
+        for log_range in ranges[1:]:
+            planner.complete(log_range, [log_range.start])
+        self.assertEqual(planner.consume(), [])
+        self.assertEqual(planner.pending(4), ranges[:1])
+
+        # bisected ranges are still fetched
+        planner.fail(ranges[0], ethrpc.RPCError(-32005, "limit exceeded"))
+        self.assertEqual([(i.start, i.end) for i in planner.pending(4)], [(0, 4), (5, 9)])
+        planner.complete(planner.ranges[0], [0])
+        planner.complete(planner.ranges[1], [5])
+        self.assertEqual(planner.consume(), [0, 5, 10, 20, 30])
+        self.assertEqual([(i.start, i.end) for i in planner.pending(4)], [(40, 49), (50, 59), (60, 69), (70, 79)])
+
+
+class TestGetLogsRange(TestBase):
+
+    def test_get_logs_range(self):
+        with self.mock_rpc(handler):
+            logs = list(self.client.get_logs_range(0, 60, window=100, concurrency=2))
+        self.assertEqual(blocks(logs), [i for i in range(61) for _ in range(2)])
+
+    def test_decode(self):
+        client = ethrpc.Client(self.endpoint, decode=True)
+        with self.mock_rpc(handler):
+            logs = list(client.get_logs_range(10, 14))
+        self.assertEqual([i['blockNumber'] for i in logs], [10, 10, 11, 11, 12, 12, 13, 13, 14, 14])
+
+    def test_error(self):
+        with self.mock_rpc(handler):
+            logs = self.client.get_logs_range(70, 80, window=4, concurrency=1)
+            self.assertEqual(blocks([next(logs)]), [70])
+            with self.assertRaises(ethrpc.RPCError):
+                list(logs)
+
+
+@unittest.skipIf(MockAsyncioClient is None, 'Requires aiohttp.')
+class TestAsyncioGetLogsRange(unittest.TestCase):
+
+    def test_get_logs_range(self):
+        client = MockAsyncioClient(handler)
+
+        async def run():
+            return [i async for i in client.get_logs_range(100, 300, window=64, concurrency=4)]
+
+        logs = ethrpc.run(run())
+        self.assertEqual(blocks(logs), [i for i in range(100, 301) for _ in range(2)])
+
+    def test_max_ranges(self):
+        class SlowClient(MockAsyncioClient):
+            async def call(self, payload):
+                if payload['params'][0]['fromBlock'] == '0x0':
+                    count = len(self.payloads)
+                    await asyncio.sleep(0.05)
+                    self.ahead = len(self.payloads) - count
+                return await super(SlowClient, self).call(payload)
+
+        # a slow first range stops the queries past twice `concurrency`
+        client = SlowClient(lambda method, params: [])
+
+        async def run():
+            return [i async for i in client.get_logs_range(0, 10**6, window=10, concurrency=4)]
+
+        self.assertEqual(ethrpc.run(run()), [])
+        self.assertEqual(client.ahead, 7)
+
+    def test_error(self):
+        client = MockAsyncioClient(handler)
+
+        async def run():
+            return [i async for i in client.get_logs_range(60, 90)]
+
+        with self.assertRaises(ethrpc.RPCError):
+            ethrpc.run(run())
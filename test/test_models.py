@@ -0,0 +1,93 @@
+import pickle
+import unittest
+import ethrpc
+from test_base import TestBase
+
+TRANSACTION = {
+    "blockHash": "0x1d59ff54b1eb26b013ce3cb5fc9dab3705b415a67127a003c3e61eb445bb8df2",
+    "blockNumber": "0x5daf3b",
+    "from": "0xa7d9ddbe1f17865597fbd27ec712455208b6b76d",
+    "gas": "0xc350",
+    "gasPrice": "0x4a817c800",
+    "hash": "0x88df016429689c079f3b2f6ad39fa052532c56795b733da78a91ebe6a713944b",
+    "input": "0x68656c6c6f21",
+    "nonce": "0x15",
+    "to": "0xf02c1c8e6114b1dbe8937a39260b5b0a374432bb",
+    "transactionIndex": "0x41",
+    "value": "0xf3dbb76162000",
+    "v": "0x25",
+    "r": "0x1b5e176d927f8e9ab405058b2d2457392da3e20f328b16ddabcebc33eaac5fea",
+    "s": "0x4ba69724e8f69de52f0125ad8b3c5c2cef33019bac3249e2c0a2192766d1721c",
+}
+
+BLOCK = {
+    "number": "0x5daf3b",
+    "hash": TRANSACTION["blockHash"],
+    "miner": "0x829bd824b016326a401d083b33d092293333a830",
+    "gasUsed": "0x9f759",
+    "timestamp": "0x5a8e6f21",
+    "transactions": [TRANSACTION],
+    "uncles": [],
+}
+
+
+def handler(method, params):
+    if method == 'eth_getBlockByNumber':
+        return BLOCK
+    elif method == 'eth_getTransactionReceipt':
+        return {
+            "status": "0x1",
+            "gasUsed": "0x5208",
+            "contractAddress": None,
+            "logs": [{
+                "address": TRANSACTION["to"],
+                "logIndex": "0x0",
+                "topics": ["0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"],
+                "data": "0x",
+            }],
+        }
+
+
+class TestModels(TestBase):
+
+    def test_block(self):
+        block = ethrpc.Block.from_json(BLOCK)
+        self.assertEqual(block.number, 0x5daf3b)
+        self.assertEqual(block.hash, bytes.fromhex(BLOCK['hash'][2:]))
+        self.assertEqual(len(block.miner), 20)
+        self.assertIsNone(block.difficulty)
+        self.assertFalse(hasattr(block, '__dict__'))
+
+        transaction = block.transactions[0]
+        self.assertIsInstance(transaction, ethrpc.Transaction)
+        self.assertEqual(transaction.from_, bytes.fromhex(TRANSACTION['from'][2:]))
+        self.assertEqual(transaction.value, 4290000000000000)
+        self.assertEqual(transaction.input, b'hello!')
+
+    def test_block_hashes(self):
+        block = ethrpc.Block.from_json(dict(BLOCK, transactions=[TRANSACTION['hash']]))
+        self.assertEqual(block.transactions, [bytes.fromhex(TRANSACTION['hash'][2:])])
+
+    def test_pickle(self):
+        block = ethrpc.Block.from_json(BLOCK)
+        self.assertEqual(pickle.loads(pickle.dumps(block)), block)
+
+    def test_init(self):
+        log = ethrpc.Log(log_index=1, removed=False)
+        self.assertEqual(log.log_index, 1)
+        self.assertIsNone(log.address)
+        with self.assertRaises(TypeError):
+            ethrpc.Log(index=1)
+
+    def test_client(self):
+        client = ethrpc.Client(self.endpoint, decode=ethrpc.MODEL_DECODERS)
+        with self.mock_rpc(handler):
+            block = client.eth_get_block_by_number(0x5daf3b, True)
+            receipt = client.eth_get_transaction_receipt(TRANSACTION['hash'])
+        self.assertIsInstance(block, ethrpc.Block)
+        self.assertEqual(block.gas_used, 653145)
+        self.assertIsInstance(receipt, ethrpc.Receipt)
+        self.assertEqual(receipt.status, 1)
+        self.assertIsNone(receipt.contract_address)
+        self.assertEqual(receipt.logs[0].data, b'')
+        self.assertEqual(len(receipt.logs[0].topics[0]), 32)
@@ -0,0 +1,181 @@
+import asyncio
+import unittest
+import ethrpc
+import requests
+import requests_mock
+from ethrpc.pool import NodePool
+from test_base import MockAsyncioClient, MockError, TestBase, rpc_response
+
+
+class MockNode(object):
+    '''Node state, with responses from `handler`.'''
+
+    def __init__(self, number, syncing=False, listening=True):
+        self.number = number
+        self.syncing = syncing
+        self.listening = listening
+
+    def handler(self, method, params):
+        if method == 'net_listening':
+            return self.listening
+        elif method == 'eth_syncing':
+            return {'currentBlock': hex(self.number)} if self.syncing else False
+        elif method == 'eth_blockNumber':
+            return hex(self.number)
+        raise MockError(-32601, "method not found")
+
+
+class MockClient(object):
+    '''Placeholder client for routing tests.'''
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+
+
+class ParsedClient(ethrpc.AbstractClient):
+    '''Client parsing responses when received, like `IPCClient`.'''
+
+    def __init__(self, handler, **kwds):
+        super(ParsedClient, self).__init__('ipc', **kwds)
+        self.handler = handler
+
+    def call(self, payload):
+        return rpc_response(self.handler, payload)
+
+    def parse(self, response):
+        return response
+
+    def content(self, response):
+        return self.codec.dumps(response)
+
+
+class TestNodePool(unittest.TestCase):
+
+    def test_acquire(self):
+        pool = NodePool([MockClient('a'), MockClient('b')])
+        a, b = pool.nodes
+        a.latency = 0.01
+        b.latency = 0.1
+
+        # lowest latency, weighted by in-flight requests
+        nodes = [pool.acquire() for _ in range(10)]
+        self.assertEqual(nodes.count(a), 9)
+        self.assertEqual(a.inflight, 9)
+        for node in nodes:
+            pool.release(node, 0.01)
+        self.assertEqual(a.inflight, 0)
+        self.assertEqual(b.inflight, 0)
+
+        # latency is a moving average
+        pool.release(pool.acquire(), 0.11)
+        self.assertAlmostEqual(a.latency, 0.04)
+
+    def test_eject(self):
+        pool = NodePool([MockClient('a'), MockClient('b'), MockClient('c')], max_lag=5)
+        a, b, c = pool.nodes
+        a.head, b.head, c.head = 100, 95, 94
+        self.assertEqual(pool.available(), [a, b])
+
+        node = pool.acquire()
+        pool.release(node, 0.01, ConnectionError())
+        self.assertFalse(node.healthy)
+        self.assertNotIn(node, pool.available())
+
+        # with every node ejected, requests are sent to any node
+        for node in pool.nodes:
+            node.healthy = False
+        self.assertEqual(pool.available(), pool.nodes)
+
+
+class TestPooledClient(TestBase):
+
+    def setUp(self):
+        super(TestPooledClient, self).setUp()
+        if not self.use_mock:
+            self.skipTest('Requires mock requests.')
+        self.endpoints = ['mock://node{}:8545'.format(i) for i in range(3)]
+        self.nodes = [MockNode(100), MockNode(97), MockNode(100, syncing=True)]
+
+    def mock_nodes(self):
+        mockery = requests_mock.Mocker()
+        for endpoint, node in zip(self.endpoints, self.nodes):
+            callback = lambda request, context, node=node: rpc_response(node.handler, request.json())
+            mockery.post(endpoint, json=callback)
+        return mockery
+
+    def test_probe(self):
+        with self.mock_nodes() as mockery, ethrpc.PooledClient(self.endpoints, decode=True,
+                                                               max_lag=2, probe_interval=None) as client:
+            client.probe()
+            self.assertEqual([i.head for i in client.nodes], [100, 97, 100])
+            self.assertEqual([i.healthy for i in client.nodes], [True, True, False])
+            self.assertEqual(client.pool.available(), client.nodes[:1])
+
+            for _ in range(5):
+                self.assertEqual(client.eth_block_number(), 100)
+            urls = [i.url.rstrip('/') for i in mockery.request_history[3:]]
+            self.assertEqual(urls, [self.endpoints[0]] * 5)
+
+            # nodes recover once they catch up and finish syncing
+            self.nodes[1].number = 100
+            self.nodes[2].syncing = False
+            client.probe()
+            self.assertEqual(client.pool.available(), client.nodes)
+
+    def test_failure(self):
+        with self.mock_nodes() as mockery, ethrpc.PooledClient(self.endpoints, probe_interval=None) as client:
+            mockery.post(self.endpoints[0], exc=requests.exceptions.ConnectTimeout)
+            with self.assertRaises(requests.exceptions.ConnectTimeout):
+                client.eth_block_number()
+            self.assertFalse(client.nodes[0].healthy)
+            self.assertEqual(client.nodes[0].inflight, 0)
+            self.assertEqual(client.eth_block_number().json()['result'], '0x61')
+
+            client.probe()
+            self.assertFalse(client.nodes[0].healthy)
+
+    def test_mixed(self):
+        # each response is parsed by the client which returned it
+        endpoints = [ParsedClient(self.nodes[0].handler), self.endpoints[1]]
+        with self.mock_nodes(), ethrpc.PooledClient(endpoints, probe_interval=None) as client:
+            results = set()
+            for node, number in zip(client.nodes, (100, 97)):
+                response = client.send_node(node, client.payload('eth_blockNumber', []))
+                results.add(client.parse(response)['result'])
+                self.assertEqual(client.codec.loads(client.content(response))['result'], hex(number))
+            self.assertEqual(results, {'0x64', '0x61'})
+
+    def test_close(self):
+        client = ethrpc.PooledClient(self.endpoints[:2] + [ParsedClient(self.nodes[2].handler)],
+                                     probe_interval=None)
+        closed = []
+        for owned in client.owned:
+            owned.close = lambda owned=owned: closed.append(owned)
+        client.close()
+        # only the clients created for addresses are closed
+        self.assertEqual(closed, client.owned)
+        self.assertEqual(len(closed), 2)
+
+
+@unittest.skipIf(MockAsyncioClient is None, 'Requires aiohttp.')
+class TestAsyncioPooledClient(unittest.TestCase):
+
+    def test_probe(self):
+        nodes = [MockNode(100), MockNode(90), MockNode(100, listening=False)]
+        clients = [MockAsyncioClient(i.handler) for i in nodes]
+
+        async def run():
+            async with ethrpc.AsyncioPooledClient(clients, decode=True, probe_interval=0.01) as client:
+                self.assertEqual(await client.eth_block_number(), 100)
+                while client.nodes[0].head is None:
+                    await asyncio.sleep(0.01)
+                self.assertEqual([i.healthy for i in client.nodes], [True, True, False])
+                self.assertEqual(client.pool.available(), client.nodes[:1])
+                for _ in range(5):
+                    await client.eth_block_number()
+            self.assertIsNone(client.prober)
+
+        ethrpc.run(run())
+        # ejected nodes only receive the batched probes
+        for client in clients[1:]:
+            self.assertTrue(all(isinstance(i, list) for i in client.payloads))
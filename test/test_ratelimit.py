@@ -0,0 +1,199 @@
+import asyncio
+import time
+import unittest
+import ethrpc
+from ethrpc.ratelimit import TokenBucket
+from test_base import MockAsyncioClient, TestBase
+
+
+def handler(method, params):
+    return '0x64'
+
+
+def payload(method):
+    return {'jsonrpc': '2.0', 'method': method, 'params': [], 'id': 1}
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_reserve(self):
+        bucket = TokenBucket(10, burst=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(bucket.reserve(2), 0.3, places=2)
+
+    def test_aimd(self):
+        bucket = TokenBucket(10, min_rate=2)
+        bucket.decrease(0.5)
+        self.assertEqual(bucket.rate, 5)
+
+        # repeated congestion within the cooldown only backs off once
+        bucket.decrease(0.5)
+        self.assertEqual(bucket.rate, 5)
+        bucket.decrease(0.1, cooldown=0)
+        self.assertEqual(bucket.rate, 2)
+
+        bucket.increase(3)
+        self.assertEqual(bucket.rate, 5)
+        bucket.increase(100)
+        self.assertEqual(bucket.rate, 10)
+
+
+class TestRateLimiter(TestBase):
+
+    def test_buckets(self):
+        limiter = ethrpc.RateLimiter(rate=100, classes={'trace': 2, 'eth_get_logs': (1, 5)})
+        self.assertEqual(limiter.buckets('eth_block_number'), [limiter.bucket])
+        self.assertEqual(limiter.buckets('trace_block'), [limiter.bucket, limiter.classes['trace']])
+        self.assertEqual(limiter.classes['eth_get_logs'].burst, 5)
+
+        counts = limiter.payload_buckets(self.client, [payload('trace_block'), payload('trace_get'), payload('eth_getLogs')])
+        self.assertEqual(counts, {limiter.bucket: 3, limiter.classes['trace']: 2, limiter.classes['eth_get_logs']: 1})
+        self.assertEqual(ethrpc.RateLimiter().reserve(self.client, payload('eth_blockNumber')), 0)
+
+    def test_client(self):
+        limiter = ethrpc.RateLimiter(rate=1000, classes={'debug': (20, 1)})
+        client = ethrpc.Client(self.endpoint, decode=True, limiter=limiter)
+        with self.mock_rpc(handler) as mockery:
+            start = time.time()
+            for _ in range(5):
+                client.eth_block_number()
+            self.assertLess(time.time() - start, 0.1)
+
+            start = time.time()
+            for _ in range(5):
+                client.debug_trace_transaction('0x1')
+            self.assertGreaterEqual(time.time() - start, 0.18)
+            self.assertEqual(mockery.call_count, 10)
+
+    def test_copy(self):
+        shared = TokenBucket(5)
+        limiter = ethrpc.RateLimiter(rate=10, classes={'trace': shared, 'debug': shared, 'eth_get_logs': 2})
+        copy = limiter.copy()
+        self.assertIsNot(copy.bucket, limiter.bucket)
+        self.assertEqual(copy.bucket.max_rate, 10)
+        self.assertIs(copy.classes['trace'], copy.classes['debug'])
+        self.assertIsNot(copy.classes['trace'], shared)
+        self.assertEqual(copy.classes['eth_get_logs'].max_rate, 2)
+
+    def test_pool(self):
+        # each node has its own buckets
+        limiter = ethrpc.RateLimiter(rate=20, burst=1)
+        client = ethrpc.PooledClient([self.endpoint, self.endpoint], decode=True,
+                                     probe_interval=None, limiter=limiter)
+        a, b = [i.limiter for i in client.nodes]
+        self.assertIsNot(a.bucket, b.bucket)
+
+        client = ethrpc.PooledClient([self.endpoint], decode=True, probe_interval=None, limiter=limiter)
+        with self.mock_rpc(handler) as mockery:
+            start = time.time()
+            for _ in range(5):
+                client.eth_block_number()
+            self.assertGreaterEqual(time.time() - start, 0.18)
+            self.assertEqual(mockery.call_count, 5)
+
+    def test_adaptive(self):
+        limiter = ethrpc.RateLimiter(rate=100, adaptive=True)
+        client = ethrpc.Client(self.endpoint, limiter=limiter)
+        with self.mock_rpc(handler) as mockery:
+            mockery.post(self.endpoint, status_code=429)
+            client.eth_block_number()
+            self.assertEqual(limiter.bucket.rate, 50)
+
+            mockery.post(self.endpoint, json={'jsonrpc': '2.0', 'id': 1, 'result': '0x1'})
+            client.eth_block_number()
+            self.assertAlmostEqual(limiter.bucket.rate, 50.02)
+
+        # rising latency is congestion
+        limiter.update(client, payload('eth_blockNumber'), 0.01)
+        limiter.bucket.decreased = None
+        limiter.update(client, payload('eth_blockNumber'), 1.0)
+        self.assertAlmostEqual(limiter.bucket.rate, 25, delta=0.1)
+
+    def test_latency_classes(self):
+        # slow traces mixed with fast reads are not congestion
+        limiter = ethrpc.RateLimiter(rate=100, adaptive=True)
+        limiter.bucket.decrease = lambda *args: self.fail('decreased')
+        for _ in range(50):
+            limiter.update(self.client, payload('eth_blockNumber'), 0.01)
+            limiter.update(self.client, payload('trace_block'), 2.0)
+            limiter.update(self.client, [payload('eth_blockNumber')] * 10, 0.1)
+
+    def test_latency_recovery(self):
+        # the baseline rises after a move to a slower node
+        limiter = ethrpc.RateLimiter(rate=100, adaptive=True)
+        limiter.update(self.client, payload('eth_blockNumber'), 0.01)
+        slow = []
+        for _ in range(1000):
+            limiter.bucket.decreased = None
+            rate = limiter.bucket.rate
+            limiter.update(self.client, payload('eth_blockNumber'), 0.1)
+            slow.append(limiter.bucket.rate < rate)
+        self.assertTrue(any(slow[:100]))
+        self.assertFalse(any(slow[-100:]))
+
+
+class MockResponse(object):
+    '''Response with a status code.'''
+
+    def __init__(self, status):
+        self.status = status
+
+
+class MockSession(object):
+    '''Session returning responses with `statuses`, in order.'''
+
+    closed = False
+
+    def __init__(self, *statuses, delay=0):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.times = []
+
+    async def post(self, endpoint, **kwds):
+        self.times.append(time.time())
+        await asyncio.sleep(self.delay)
+        return MockResponse(self.statuses.pop(0))
+
+
+@unittest.skipIf(MockAsyncioClient is None, 'Requires aiohttp.')
+class TestAsyncioRateLimiter(unittest.TestCase):
+
+    def test_client(self):
+        limiter = ethrpc.RateLimiter(rate=50, burst=1, adaptive=True)
+        client = ethrpc.AsyncioClient('mock://127.0.0.1:8545', limiter=limiter)
+        client.session = MockSession(200, 200, 429, 200)
+
+        async def run():
+            return await asyncio.gather(*[client.eth_block_number() for _ in range(4)])
+
+        start = time.time()
+        responses = ethrpc.run(run())
+        self.assertEqual([i.status for i in responses], [200, 200, 429, 200])
+        self.assertGreaterEqual(client.session.times[-1] - start, 0.05)
+        self.assertLess(limiter.bucket.rate, 50)
+
+    def test_queueing(self):
+        # time queued for the client's own concurrency limit is not latency
+        limiter = ethrpc.RateLimiter(rate=1000, adaptive=True)
+        limiter.bucket.decrease = lambda *args: self.fail('decreased')
+        client = ethrpc.AsyncioClient('mock://127.0.0.1:8545', max_concurrency=1, limiter=limiter)
+        client.session = MockSession(*[200] * 20, delay=0.005)
+
+        async def run():
+            return await asyncio.gather(*[client.eth_block_number() for _ in range(20)])
+
+        self.assertEqual([i.status for i in ethrpc.run(run())], [200] * 20)
+
+    def test_pool(self):
+        limiter = ethrpc.RateLimiter(rate=20, burst=1)
+
+        async def run():
+            async with ethrpc.AsyncioPooledClient([MockAsyncioClient(handler)], probe_interval=None,
+                                                  limiter=limiter) as client:
+                start = time.time()
+                await asyncio.gather(*[client.eth_block_number() for _ in range(5)])
+                return time.time() - start
+
+        self.assertGreaterEqual(ethrpc.run(run()), 0.18)
@@ -0,0 +1,223 @@
+import asyncio
+import threading
+import time
+import unittest
+import aiohttp
+import ethrpc
+import requests
+from ethrpc.retry import is_idempotent
+from test_base import MockAsyncioClient, TestBase, rpc_response
+
+
+def handler(method, params):
+    return '0x64'
+
+
+def response(status=200):
+    return {'status_code': status, 'json': {'jsonrpc': '2.0', 'id': 1, 'result': '0x64'}}
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_idempotent(self):
+        client = ethrpc.Client()
+        payload = lambda method: {'method': method, 'params': [], 'id': 1}
+        self.assertTrue(is_idempotent(client, payload('eth_getBalance')))
+        self.assertFalse(is_idempotent(client, payload('eth_sendTransaction')))
+        self.assertFalse(is_idempotent(client, payload('personal_listAccounts')))
+        self.assertFalse(is_idempotent(client, payload('unknown_method')))
+        self.assertFalse(is_idempotent(client, [payload('eth_getBalance'), payload('eth_sendRawTransaction')]))
+
+    def test_delay(self):
+        policy = ethrpc.RetryPolicy(backoff=0.1, max_backoff=1.0)
+        for attempt in range(1, 10):
+            self.assertLessEqual(policy.delay(attempt), min(1.0, 0.1 * 2 ** (attempt - 1)))
+
+        failed = requests.Response()
+        failed.headers['Retry-After'] = '0.5'
+        self.assertGreaterEqual(policy.delay(1, failed), 0.5)
+        failed.headers['Retry-After'] = '60'
+        self.assertLessEqual(policy.delay(1, failed), 1.0)
+
+        # the deadline stops retries which would start too late
+        policy = ethrpc.RetryPolicy(backoff=10, max_backoff=10, deadline=0.01)
+        self.assertIsNone(policy.next_delay(1, policy.expires()))
+        self.assertIsNone(ethrpc.RetryPolicy(attempts=2).next_delay(2, None))
+
+
+class TestClientRetry(TestBase):
+
+    def setUp(self):
+        super(TestClientRetry, self).setUp()
+        if not self.use_mock:
+            self.skipTest('Requires mock requests.')
+        policy = ethrpc.RetryPolicy(attempts=3, backoff=0.001)
+        self.client = ethrpc.Client(self.endpoint, decode=True, retry=policy)
+
+    def test_status(self):
+        with self.mock_rpc(handler) as mockery:
+            mockery.post(self.endpoint, [response(503), response(429), response()])
+            self.assertEqual(self.client.eth_block_number(), 100)
+            self.assertEqual(mockery.call_count, 3)
+
+            # the last failed response is returned
+            mockery.post(self.endpoint, [response(503)] * 3 + [response()])
+            client = ethrpc.Client(self.endpoint, retry=self.client.retry)
+            self.assertEqual(client.eth_block_number().status_code, 503)
+            self.assertEqual(mockery.call_count, 6)
+
+    def test_errors(self):
+        with self.mock_rpc(handler) as mockery:
+            mockery.post(self.endpoint, [{'exc': requests.exceptions.ConnectionError}, response()])
+            self.assertEqual(self.client.eth_get_balance('0x1'), 100)
+            self.assertEqual(mockery.call_count, 2)
+
+            mockery.post(self.endpoint, exc=requests.exceptions.ConnectTimeout)
+            with self.assertRaises(requests.exceptions.ConnectTimeout):
+                self.client.eth_block_number()
+            self.assertEqual(mockery.call_count, 5)
+
+    def test_side_effects(self):
+        with self.mock_rpc(handler) as mockery:
+            mockery.post(self.endpoint, exc=requests.exceptions.ConnectionError)
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self.client.eth_send_raw_transaction('0x1')
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self.client.personal_list_accounts()
+            self.assertEqual(mockery.call_count, 2)
+
+
+class SlowClient(ethrpc.Client):
+    '''Synchronous client with a fixed latency, returning `result`.'''
+
+    def __init__(self, delay, result):
+        super(SlowClient, self).__init__('mock://127.0.0.1:8545')
+        self.delay = delay
+        self.result = result
+        self.error = None
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def call(self, payload):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return rpc_response(lambda method, params: self.result, payload)
+
+    def parse(self, response):
+        return response
+
+
+class TestPooledClientHedge(unittest.TestCase):
+
+    def test_hedge(self):
+        clients = [SlowClient(0.5, '0x1'), SlowClient(0, '0x2')]
+        with ethrpc.PooledClient(clients, decode=True, probe_interval=None, hedge=0.95) as client:
+            client.nodes[1].latency = 0.01
+            client.pool.latencies.extend([0.01] * 20)
+
+            # the request is sent on the calling thread, and the hedge
+            # is sent once the request is slower than the quantile
+            self.assertEqual(client.eth_block_number(), 1)
+            self.assertEqual([i.calls for i in clients], [1, 1])
+
+            # the hedge is used if the request fails
+            clients[0].error = ConnectionError()
+            client.nodes[0].latency = 0.001
+            self.assertEqual(client.eth_block_number(), 2)
+            self.assertEqual([i.calls for i in clients], [2, 2])
+            clients[0].error = None
+            client.nodes[0].healthy = True
+            client.nodes[0].latency = 0.001
+
+            # methods with side effects are never hedged
+            self.assertEqual(client.eth_send_raw_transaction('0x1'), '0x1')
+            self.assertEqual([i.calls for i in clients], [3, 2])
+            self.assertEqual([i.inflight for i in client.nodes], [0, 0])
+
+    def test_hedge_concurrency(self):
+        # requests are not queued behind the hedge workers
+        clients = [SlowClient(0.1, '0x1'), SlowClient(0.1, '0x2')]
+        with ethrpc.PooledClient(clients, decode=True, probe_interval=None, hedge=0.95) as client:
+            client.pool.latencies.extend([1.0] * 20)
+            threads = [threading.Thread(target=client.eth_block_number) for _ in range(32)]
+            start = time.time()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertLess(time.time() - start, 0.5)
+            self.assertEqual(sum(i.calls for i in clients), 32)
+
+
+class FlakyAsyncioClient(ethrpc.AsyncioClient):
+    '''Asynchronous client failing the first `failures` sends.'''
+
+    def __init__(self, failures, delay=0, **kwds):
+        super(FlakyAsyncioClient, self).__init__('mock://127.0.0.1:8545', **kwds)
+        self.failures = failures
+        self.delay = delay
+        self.sends = 0
+
+    async def send(self, payload):
+        self.sends += 1
+        await asyncio.sleep(self.delay)
+        if self.sends <= self.failures:
+            raise aiohttp.ClientConnectionError()
+        return rpc_response(handler, payload)
+
+    async def parse(self, response):
+        return response
+
+
+class SlowAsyncioClient(MockAsyncioClient):
+    '''Asynchronous client with a fixed latency.'''
+
+    def __init__(self, delay, result):
+        super(SlowAsyncioClient, self).__init__(lambda method, params: result)
+        self.delay = delay
+
+    async def call(self, payload):
+        await asyncio.sleep(self.delay)
+        return await super(SlowAsyncioClient, self).call(payload)
+
+
+class TestAsyncioRetry(unittest.TestCase):
+
+    def test_retry(self):
+        policy = ethrpc.RetryPolicy(attempts=3, backoff=0.001)
+        client = FlakyAsyncioClient(2, decode=True, retry=policy)
+        self.assertEqual(ethrpc.run(client.eth_block_number()), 100)
+        self.assertEqual(client.sends, 3)
+
+        client = FlakyAsyncioClient(2, decode=True, retry=policy)
+        with self.assertRaises(aiohttp.ClientConnectionError):
+            ethrpc.run(client.eth_send_raw_transaction('0x1'))
+        self.assertEqual(client.sends, 1)
+
+    def test_deadline(self):
+        policy = ethrpc.RetryPolicy(attempts=3, deadline=0.05)
+        client = FlakyAsyncioClient(0, delay=1, decode=True, retry=policy)
+        start = time.time()
+        with self.assertRaises(asyncio.TimeoutError):
+            ethrpc.run(client.eth_block_number())
+        self.assertLess(time.time() - start, 0.5)
+
+    def test_hedge(self):
+        clients = [SlowAsyncioClient(1, '0x1'), SlowAsyncioClient(0, '0x2')]
+
+        async def run():
+            async with ethrpc.AsyncioPooledClient(clients, decode=True, probe_interval=None, hedge=0.5) as client:
+                client.nodes[1].latency = 0.01
+                client.pool.latencies.extend([0.01] * 20)
+                result = await client.eth_block_number()
+                await asyncio.sleep(0)
+                self.assertEqual([i.inflight for i in client.nodes], [0, 0])
+                return result
+
+        start = time.time()
+        self.assertEqual(ethrpc.run(run()), 2)
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual(clients[0].payloads, [])
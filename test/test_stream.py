@@ -0,0 +1,121 @@
+import json
+import unittest
+import ethrpc
+from test_base import MockAsyncioClient, TestBase
+
+TRACE = {
+    "gas": 85301,
+    "failed": False,
+    "returnValue": "",
+    "structLogs": [
+        {"pc": i, "op": "PUSH1", "gas": 162106 - i, "depth": 1, "stack": ["é" * i], "storage": {}}
+        for i in range(50)
+    ],
+}
+
+TXPOOL = {
+    "pending": {
+        "0x0216d5032f356960cd3749c31ab34eeff21b3395": {
+            "806": {"nonce": "0x326"},
+            "807": {"nonce": "0x327"},
+        },
+    },
+    "queued": {
+        "0x976a3fc5d6f7d259ebfb4cc2ae75115475e9867c": {
+            "3": {"nonce": "0x3"},
+        },
+    },
+}
+
+
+def body(result):
+    return json.dumps({"jsonrpc": "2.0", "id": 1, "result": result}).encode('utf-8')
+
+
+def chunked(data, size):
+    return [data[i:i+size] for i in range(0, len(data), size)]
+
+
+def handler(method, params):
+    if method == 'debug_traceTransaction':
+        return TRACE
+    return TXPOOL
+
+
+class TestStream(TestBase):
+
+    def test_struct_logs(self):
+        for size in (1, 7, 1 << 16):
+            chunks = chunked(body(TRACE), size)
+            items = list(ethrpc.iter_stream(chunks, ('structLogs', '*')))
+            self.assertEqual(items, TRACE['structLogs'])
+
+    def test_paths(self):
+        nonces = list(ethrpc.iter_stream([body(TXPOOL)], ('*', '*', '*')))
+        self.assertEqual([i['nonce'] for i in nonces], ['0x326', '0x327', '0x3'])
+        pending = list(ethrpc.iter_stream([body(TXPOOL)], ('pending', '*', '806')))
+        self.assertEqual(pending, [{"nonce": "0x326"}])
+        self.assertEqual(list(ethrpc.iter_stream([body(None)], ('*',))), [])
+        self.assertEqual(list(ethrpc.iter_stream([body([1, 23])], (1,))), [23])
+
+    def test_numbers(self):
+        chunks = [b'{"id": 1, "result": [12', b'34, 5', b'6]}']
+        self.assertEqual(list(ethrpc.iter_stream(chunks, ('*',))), [1234, 56])
+
+    def test_error(self):
+        data = b'{"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "missing trie node"}}'
+        with self.assertRaises(ethrpc.RPCError):
+            list(ethrpc.iter_stream(chunked(data, 5), ('*',)))
+
+    def test_skip(self):
+        # values outside the path are skipped with bounded memory
+        replay = {
+            "output": "0x",
+            "stateDiff": {"0x{:040x}".format(i): {"balance": {"*": {"from": "0x0", "to": "0x1"}}} for i in range(200)},
+            "trace": [{"action": {"input": '\\"]}'}, "result": None}],
+            "vmTrace": {"code": "0x" + "60" * 5000, "ops": [{"pc": i, "ex": {"push": ["0x1"]}} for i in range(2000)]},
+        }
+        data = body(replay)
+        for path in ethrpc.STREAM_TRACE_PATHS.values():
+            parser = ethrpc.StreamParser(path)
+            items = []
+            largest = 0
+            for chunk in chunked(data, 256):
+                parser.feed(chunk)
+                items.extend(parser.items())
+                largest = max(largest, len(parser.buffer))
+            parser.close()
+            items.extend(parser.items())
+            self.assertLess(largest, 1024)
+            self.assertTrue(parser.done)
+        self.assertEqual(items, list(replay['stateDiff'].values()))
+        trace = list(ethrpc.iter_stream(chunked(data, 3), ethrpc.STREAM_TRACE_PATHS['trace']))
+        self.assertEqual(trace, replay['trace'])
+
+    def test_incomplete(self):
+        with self.assertRaises(ValueError):
+            list(ethrpc.iter_stream([body(TRACE)[:-40]], ('structLogs', '*')))
+        with self.assertRaises(ValueError):
+            list(ethrpc.iter_stream([body({"skipped": ["a"]})[:-10]], ('other',)))
+
+    def test_client(self):
+        hash_ = '0x88df016429689c079f3b2f6ad39fa052532c56795b733da78a91ebe6a713944b'
+        with self.mock_rpc(handler):
+            items = list(self.client.stream('debug_trace_transaction', hash_))
+            txs = list(self.client.stream('txpool_content'))
+        self.assertEqual(items, TRACE['structLogs'])
+        self.assertEqual(len(txs), 3)
+
+    @unittest.skipIf(MockAsyncioClient is None, 'Requires aiohttp.')
+    def test_asyncio(self):
+        client = MockAsyncioClient(handler)
+
+        async def call_stream(payload):
+            for chunk in chunked(body(TRACE), 100):
+                yield chunk
+
+        async def run():
+            return [i async for i in client.stream('debug_traceTransaction', '0x1')]
+
+        client.call_stream = call_stream
+        self.assertEqual(ethrpc.run(run()), TRACE['structLogs'])
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import time
+import unittest
+import ethrpc
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+except ImportError:
+    web = None
+
+
+async def handle(request):
+    '''Minimal JSON-RPC WebSocket server, with a `newHeads` subscription.'''
+
+    websocket = web.WebSocketResponse()
+    await websocket.prepare(request)
+    async for message in websocket:
+        payload = json.loads(message.data)
+        if isinstance(payload, list):
+            body = [{"jsonrpc": "2.0", "id": i["id"], "result": i["params"]} for i in payload]
+            await websocket.send_str(json.dumps(body[::-1]))
+        elif payload["method"] == "eth_subscribe":
+            body = {"jsonrpc": "2.0", "id": payload["id"], "result": "0x9ce59a13"}
+            await websocket.send_str(json.dumps(body))
+            for number in range(3):
+                await websocket.send_str(json.dumps({
+                    "jsonrpc": "2.0",
+                    "method": "eth_subscription",
+                    "params": {"subscription": "0x9ce59a13", "result": {"number": hex(number)}},
+                }))
+        else:
+            body = {"jsonrpc": "2.0", "id": payload["id"], "result": payload["params"]}
+            await websocket.send_str(json.dumps(body))
+    return websocket
+
+
+async def drop(request):
+    '''Accept a subscription, then drop the connection on the next request.'''
+
+    websocket = web.WebSocketResponse()
+    await websocket.prepare(request)
+    async for message in websocket:
+        payload = json.loads(message.data)
+        if payload["method"] != "eth_subscribe":
+            break
+        body = {"jsonrpc": "2.0", "id": payload["id"], "result": "0x9ce59a13"}
+        await websocket.send_str(json.dumps(body))
+    await websocket.close()
+    return websocket
+
+
+@unittest.skipIf(web is None, 'Requires aiohttp.')
+class TestWebSocket(unittest.TestCase):
+
+    def run_server(self, callback, path='/', **kwds):
+        async def run():
+            app = web.Application()
+            app.router.add_get('/', handle)
+            app.router.add_get('/drop', drop)
+            async with TestServer(app) as server:
+                endpoint = str(server.make_url(path)).replace('http', 'ws', 1)
+                async with ethrpc.WebSocketClient(endpoint, **kwds) as client:
+                    return await callback(client)
+
+        return ethrpc.run(run())
+
+    def test_multiplexed_calls(self):
+        async def callback(client):
+            futures = [client.eth_get_balance('0x{:040x}'.format(i)) for i in range(10)]
+            return await asyncio.gather(*futures)
+
+        bodies = self.run_server(callback)
+        self.assertEqual([i['result'][0] for i in bodies], ['0x{:040x}'.format(i) for i in range(10)])
+        self.assertEqual(len(set(i['id'] for i in bodies)), 10)
+
+    def test_batch(self):
+        async def callback(client):
+            async with client.batch() as batch:
+                results = [batch.eth_get_block_by_number(i) for i in range(3)]
+            return results
+
+        results = self.run_server(callback)
+        self.assertEqual([i.result()['result'][0] for i in results], ['0x0', '0x1', '0x2'])
+
+    def test_subscribe(self):
+        async def callback(client):
+            subscription = await client.subscribe('eth_subscribe', 'newHeads')
+            headers = []
+            async for header in subscription:
+                headers.append(header)
+                if len(headers) == 3:
+                    await subscription.unsubscribe()
+            return headers
+
+        headers = self.run_server(callback)
+        self.assertEqual([i['number'] for i in headers], ['0x0', '0x1', '0x2'])
+
+    def test_stream(self):
+        async def callback(client):
+            return [i async for i in client.stream('eth_get_logs', 1, 2)]
+
+        logs = self.run_server(callback)
+        self.assertEqual(logs[0]['fromBlock'], '0x1')
+
+    def test_limiter(self):
+        async def callback(client):
+            start = time.time()
+            await asyncio.gather(*[client.eth_get_block_by_number(i) for i in range(5)])
+            return time.time() - start
+
+        elapsed = self.run_server(callback, limiter=ethrpc.RateLimiter(rate=20, burst=1))
+        self.assertGreaterEqual(elapsed, 0.18)
+
+    def test_reconnect_error(self):
+        async def callback(client):
+            await client.close()
+            await client.connect()
+            subscription = await client.subscribe('eth_subscribe', 'newHeads')
+            # the connection drops after a reconnect, which is an error
+            with self.assertRaises(ConnectionError):
+                await client.eth_block_number()
+            with self.assertRaises(ConnectionError):
+                async for _ in subscription:
+                    pass
+
+        self.run_server(callback, '/drop')